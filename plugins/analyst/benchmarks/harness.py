@@ -6,31 +6,99 @@ Tracks: execution time, token usage, agent calls, model distribution.
 Usage:
     python harness.py --baseline    # Measure v1.0
     python harness.py --v2          # Measure v2.0
-    python harness.py --compare     # Compare both
+    python harness.py --compare     # Compare both (exit 1 on regression)
+
+Test cases from test_cases.json run on a bounded worker pool through an
+executor: `stub` (synthetic, offline), `replay` (saved transcripts) or
+`command` (live, e.g. `claude -p ... --output-format stream-json`).
+Runs are appended to results/results.db as one batch per invocation
+({version}_{timestamp}); `--history` shows trends across batches.
+`--replay DIR` reconstructs runs from a directory of recorded transcripts.
 """
 
+import argparse
+import hashlib
 import json
+import random
+import re
+import shlex
+import sqlite3
+import subprocess
 import time
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from array import array
+from itertools import repeat
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Sequence
+from datetime import datetime, timedelta, timezone
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-@dataclass
+# Transcript parsing is shared with the luc status line
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "luc" / "scripts"))
+from transcript_metrics import (  # noqa: E402
+    DECODE_ERRORS, TOOL_USE_MARKER, USAGE_MARKER, TranscriptMetrics, loads, parse_transcript_file,
+)
+
+
+PRICING_PATH = Path(__file__).resolve().parent / "pricing.json"
+PRICE_KINDS = ("input", "output", "cache_write", "cache_read")
+
+
+@dataclass(frozen=True, slots=True)
+class PricingTable:
+    """One version of pricing.json: model -> USD per 1M tokens, in PRICE_KINDS order."""
+    version: str
+    rates: Dict[str, tuple[float, float, float, float]]
+
+
+def load_pricing(path: Path = PRICING_PATH, version: Optional[str] = None) -> PricingTable:
+    """Load a pricing version (default: the table's "default")."""
+    with open(path) as f:
+        data = json.load(f)
+    version = version or data["default"]
+    if version not in data["versions"]:
+        raise ValueError(f"Unknown pricing version {version!r} (have: {', '.join(data['versions'])})")
+    return PricingTable(version, {
+        model: tuple(float(prices[kind]) for kind in PRICE_KINDS)
+        for model, prices in data["versions"][version].items()
+    })
+
+
+# Applied by BenchmarkRun.estimated_cost and RunColumns.cost(); replace to re-price
+PRICING = load_pricing()
+
+
+@dataclass(slots=True)
 class AgentCall:
     """Record of a single agent invocation."""
     agent_name: str
     model: str  # haiku, sonnet, opus
     input_tokens: int
     output_tokens: int
-    cache_tokens: int
+    cache_tokens: int  # Cache reads + writes
     duration_ms: int
     success: bool
+    cache_creation_tokens: int = 0  # Cache writes (part of cache_tokens)
+    start_offset_ms: Optional[int] = None  # Start relative to the run's start_time, when known
 
+    def cost(self, pricing: Optional[PricingTable] = None) -> float:
+        """USD for this call; unknown models cost nothing."""
+        rates = (pricing or PRICING).rates.get(self.model)
+        if rates is None:
+            return 0.0
+        return (self.input_tokens * rates[0] + self.output_tokens * rates[1]
+                + self.cache_creation_tokens * rates[2]
+                + (self.cache_tokens - self.cache_creation_tokens) * rates[3]) / 1_000_000
 
-@dataclass
+
+@dataclass(slots=True)
 class BenchmarkRun:
     """Complete record of a benchmark test run."""
     run_id: str
@@ -46,35 +114,153 @@ class BenchmarkRun:
     sequential_steps: int = 0
     final_confidence: float = 0.0
     consensus_votes: Optional[Dict[str, int]] = None
+    test_id: str = ""
+    run_index: int = 0
+    error: Optional[str] = None  # Set when the executor failed or timed out
+    classified_type: Optional[str] = None        # Consensus primaryType of the think-classifier calls
+    classifier_confidence: Optional[float] = None
+    selected_models: List[str] = field(default_factory=list)  # Mental models routed to, e.g. 5-whys
+    # (calls snapshot, pricing, total tokens, model distribution, cost), computed on
+    # first use and recomputed when calls are added, removed or replaced, or
+    # PRICING changes. Editing a call in place is not seen: call invalidate_totals()
+    _aggregates: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def _totals(self) -> tuple:
+        cached = self._aggregates
+        # List equality checks identity first, so an unchanged list compares in one C loop
+        if cached is None or cached[1] is not PRICING or cached[0] != self.agent_calls:
+            tokens = 0
+            dist = {"haiku": 0, "sonnet": 0, "opus": 0}
+            cost = 0.0
+            for call in self.agent_calls:
+                tokens += call.input_tokens + call.output_tokens + call.cache_tokens
+                if call.model in dist:
+                    dist[call.model] += 1
+                cost += call.cost(PRICING)
+            cached = self._aggregates = (list(self.agent_calls), PRICING, tokens, dist, cost)
+        return cached
+
+    def invalidate_totals(self) -> None:
+        """Drop cached aggregates after editing an AgentCall in place."""
+        self._aggregates = None
 
     @property
     def total_tokens(self) -> int:
-        return sum(
-            a.input_tokens + a.output_tokens + a.cache_tokens
-            for a in self.agent_calls
-        )
+        return self._totals()[2]
 
     @property
     def model_distribution(self) -> Dict[str, int]:
-        dist = {"haiku": 0, "sonnet": 0, "opus": 0}
-        for call in self.agent_calls:
-            if call.model in dist:
-                dist[call.model] += 1
-        return dist
+        return dict(self._totals()[3])
 
     @property
     def estimated_cost(self) -> float:
-        """Estimate cost based on model pricing (per 1M tokens)."""
-        cost = 0.0
-        for call in self.agent_calls:
-            tokens = call.input_tokens + call.output_tokens
-            if call.model == "haiku":
-                cost += tokens * 0.25 / 1_000_000
-            elif call.model == "sonnet":
-                cost += tokens * 3.00 / 1_000_000
-            elif call.model == "opus":
-                cost += tokens * 15.00 / 1_000_000
-        return cost
+        """Estimate cost from PRICING, billing cache reads and writes at their own rates."""
+        return self._totals()[4]
+
+
+def _column(values: list, typecode: str):
+    """A numeric column: a NumPy array when available, else an array.array."""
+    if np is not None:
+        return np.asarray(values, dtype=np.int64 if typecode == "q" else np.float64)
+    return array(typecode, values)
+
+
+@dataclass(slots=True)
+class RunColumns:
+    """
+    Columnar view over many runs for report generation.
+
+    Per-run and per-call fields are flattened into parallel arrays once;
+    token, cost and model aggregates are then computed with vectorised
+    sums (NumPy when installed, plain loops over array.array otherwise).
+    """
+    count: int
+    models: tuple[str, ...]       # Model codes; len(models) = not in the pricing table
+    duration_ms: Sequence[int]
+    call_run: Sequence[int]       # Index of the owning run for each call
+    call_model: Sequence[int]     # Index into models
+    call_input: Sequence[int]
+    call_output: Sequence[int]
+    call_cache_write: Sequence[int]
+    call_cache_read: Sequence[int]
+
+    @classmethod
+    def from_runs(cls, runs: Sequence[BenchmarkRun]) -> "RunColumns":
+        models = tuple(dict.fromkeys(("haiku", "sonnet", "opus", *PRICING.rates)))
+        model_index = {model: i for i, model in enumerate(models)}
+        other = len(models)
+        columns = call_run, call_model, call_input, call_output, call_write, call_read = [], [], [], [], [], []
+        for i, run in enumerate(runs):
+            for call in run.agent_calls:
+                call_run.append(i)
+                call_model.append(model_index.get(call.model, other))
+                call_input.append(call.input_tokens)
+                call_output.append(call.output_tokens)
+                call_write.append(call.cache_creation_tokens)
+                call_read.append(call.cache_tokens - call.cache_creation_tokens)
+        return cls(len(runs), models, _column([run.total_duration_ms for run in runs], "q"),
+                   *(_column(column, "q") for column in columns))
+
+    def _per_run(self, weights) -> List[float]:
+        if np is not None:
+            return np.bincount(self.call_run, weights=weights, minlength=self.count).tolist()
+        totals = [0] * self.count
+        for run, weight in zip(self.call_run, weights):
+            totals[run] += weight
+        return totals
+
+    def _rates(self, pricing: PricingTable) -> List[tuple[float, ...]]:
+        """Per-token rates for each model code (zero for unpriced models)."""
+        zero = (0.0,) * len(PRICE_KINDS)
+        return [tuple(rate / 1_000_000 for rate in pricing.rates.get(model, zero))
+                for model in self.models] + [zero]
+
+    def _call_cost(self, rates: List[tuple[float, ...]]):
+        """Cost of every call under the given per-model rates."""
+        kinds = (self.call_input, self.call_output, self.call_cache_write, self.call_cache_read)
+        if np is not None:
+            table = np.asarray(rates)[self.call_model]
+            return sum(column * table[:, k] for k, column in enumerate(kinds))
+        return [sum(tokens * rate for tokens, rate in zip(call, rates[model]))
+                for model, *call in zip(self.call_model, *kinds)]
+
+    def tokens(self) -> List[int]:
+        """Total tokens of each run."""
+        if np is not None:
+            weights = self.call_input + self.call_output + self.call_cache_write + self.call_cache_read
+        else:
+            weights = [sum(call) for call in zip(self.call_input, self.call_output,
+                                                 self.call_cache_write, self.call_cache_read)]
+        return [int(total) for total in self._per_run(weights)]
+
+    def cost(self, pricing: Optional[PricingTable] = None) -> List[float]:
+        """Estimated cost of each run."""
+        return self._per_run(self._call_cost(self._rates(pricing or PRICING)))
+
+    def cache_savings(self, pricing: Optional[PricingTable] = None) -> float:
+        """USD saved by prompt caching versus billing every cached token as plain input."""
+        rates = self._rates(pricing or PRICING)
+        uncached = [(rate[0], rate[1], rate[0], rate[0]) for rate in rates]
+        if np is not None:
+            return float((self._call_cost(uncached) - self._call_cost(rates)).sum())
+        return sum(self._call_cost(uncached)) - sum(self._call_cost(rates))
+
+    def prompt_tokens(self) -> tuple[int, int, int]:
+        """(uncached input, cache writes, cache reads) across all calls."""
+        return int(sum(self.call_input)), int(sum(self.call_cache_write)), int(sum(self.call_cache_read))
+
+    def durations(self) -> List[int]:
+        return list(self.duration_ms) if np is None else self.duration_ms.tolist()
+
+    def model_counts(self) -> Dict[str, int]:
+        """Calls per model across all runs."""
+        if np is not None:
+            counts = np.bincount(self.call_model, minlength=len(self.models) + 1).tolist()
+        else:
+            counts = [0] * (len(self.models) + 1)
+            for model in self.call_model:
+                counts[model] += 1
+        return dict(zip(self.models, counts))
 
 
 def parse_transcript(transcript_path: str) -> Dict:
@@ -95,58 +281,25 @@ def parse_transcript(transcript_path: str) -> Dict:
         "isSidechain": bool,
         "isApiErrorMessage": bool
     }
-    """
-    metrics = {
-        "input_tokens": 0,
-        "output_tokens": 0,
-        "cache_tokens": 0,
-        "agent_calls": 0,
-        "models_used": {"haiku": 0, "sonnet": 0, "opus": 0},
-        "start_time": None,
-        "end_time": None,
-    }
 
+    Only lines mentioning usage or tool_use are decoded (see
+    luc/scripts/transcript_metrics.py).
+    """
     try:
-        with open(transcript_path, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    usage = data.get("message", {}).get("usage", {})
-
-                    if usage:
-                        metrics["input_tokens"] += usage.get("input_tokens", 0)
-                        metrics["output_tokens"] += usage.get("output_tokens", 0)
-                        metrics["cache_tokens"] += (
-                            usage.get("cache_read_input_tokens", 0) +
-                            usage.get("cache_creation_input_tokens", 0)
-                        )
-
-                    # Track timestamps
-                    timestamp = data.get("timestamp")
-                    if timestamp:
-                        if metrics["start_time"] is None:
-                            metrics["start_time"] = timestamp
-                        metrics["end_time"] = timestamp
-
-                    # Count Task tool calls (agent invocations)
-                    content = data.get("message", {}).get("content", [])
-                    if isinstance(content, list):
-                        for block in content:
-                            if block.get("type") == "tool_use":
-                                if block.get("name") == "Task":
-                                    metrics["agent_calls"] += 1
-                                    # Try to extract model from params
-                                    params = block.get("input", {})
-                                    model = params.get("model", "sonnet")
-                                    if model in metrics["models_used"]:
-                                        metrics["models_used"][model] += 1
-
-                except json.JSONDecodeError:
-                    continue
+        totals = parse_transcript_file(transcript_path)
     except FileNotFoundError:
         print(f"Transcript not found: {transcript_path}")
+        totals = TranscriptMetrics()
 
-    return metrics
+    return {
+        "input_tokens": totals.input_tokens,
+        "output_tokens": totals.output_tokens,
+        "cache_tokens": totals.cache_tokens,
+        "agent_calls": totals.agent_calls,
+        "models_used": totals.models_used,
+        "start_time": totals.start_time,
+        "end_time": totals.end_time,
+    }
 
 
 def calculate_duration_ms(start: str, end: str) -> int:
@@ -159,40 +312,1092 @@ def calculate_duration_ms(start: str, end: str) -> int:
         return 0
 
 
+def save_results(runs: List[BenchmarkRun], output_path: str):
+    """Save benchmark results to JSON."""
+    with open(output_path, 'w') as f:
+        json.dump([{k: v for k, v in asdict(r).items() if not k.startswith("_")} for r in runs],
+                  f, indent=2, default=str)
+
+
+def load_results(path: str) -> List[BenchmarkRun]:
+    """Load benchmark results written by save_results()."""
+    with open(path) as f:
+        data = json.load(f)
+    runs = []
+    for record in data:
+        calls = [AgentCall(**call) for call in record.pop("agent_calls", [])]
+        runs.append(BenchmarkRun(**record, agent_calls=calls))
+    return runs
+
+
+# === Results store ===
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,            -- One harness invocation, e.g. v2.0_20250101-120000-000000
+    recorded_at TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    run_index INTEGER NOT NULL,
+    command TEXT NOT NULL,
+    problem_type TEXT NOT NULL,
+    problem_text TEXT NOT NULL,
+    version TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    total_duration_ms INTEGER NOT NULL,
+    parallel_batches INTEGER NOT NULL,
+    sequential_steps INTEGER NOT NULL,
+    final_confidence REAL NOT NULL,
+    consensus_votes TEXT,           -- JSON
+    error TEXT,
+    classified_type TEXT,
+    classifier_confidence REAL,
+    selected_models TEXT,           -- JSON
+    total_tokens INTEGER NOT NULL,  -- Denormalised so trends need no join
+    estimated_cost REAL NOT NULL    -- At the pricing in effect when recorded
+);
+CREATE INDEX IF NOT EXISTS runs_filter ON runs (version, command, problem_type);
+CREATE INDEX IF NOT EXISTS runs_batch ON runs (batch);
+CREATE TABLE IF NOT EXISTS agent_calls (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    agent_name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cache_tokens INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    cache_creation_tokens INTEGER NOT NULL DEFAULT 0,
+    start_offset_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS agent_calls_run ON agent_calls (run);
+"""
+
+# Columns added since the store was introduced: table -> column -> definition
+RESULTS_MIGRATIONS = {
+    "agent_calls": {"cache_creation_tokens": "INTEGER NOT NULL DEFAULT 0", "start_offset_ms": "INTEGER"},
+    "runs": {"classified_type": "TEXT", "classifier_confidence": "REAL", "selected_models": "TEXT"},
+}
+
+RUN_COLUMNS = (
+    "run_id", "test_id", "run_index", "command", "problem_type", "problem_text", "version",
+    "start_time", "end_time", "total_duration_ms", "parallel_batches", "sequential_steps",
+    "final_confidence", "consensus_votes", "error", "classified_type", "classifier_confidence", "selected_models",
+)
+JSON_COLUMNS = {"consensus_votes": None, "selected_models": []}  # Column -> value when NULL
+CALL_COLUMNS = ("agent_name", "model", "input_tokens", "output_tokens", "cache_tokens", "duration_ms", "success",
+                "cache_creation_tokens", "start_offset_ms")
+
+
+class ResultsStore:
+    """
+    Append-only SQLite history of benchmark runs.
+
+    Each harness invocation appends its runs as one batch. Runs are indexed
+    by version, command and problem type, and agent calls live in their
+    own table, so filters and trends never load the whole history.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(RESULTS_SCHEMA)
+        for table, columns in RESULTS_MIGRATIONS.items():
+            existing = {row[1] for row in self.db.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns.items():
+                if column not in existing:
+                    self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, runs: List[BenchmarkRun], batch: str) -> None:
+        """Record runs as one batch in a single transaction."""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        placeholders = ", ".join("?" * (len(RUN_COLUMNS) + 4))
+        with self.db:
+            for run in runs:
+                values = [getattr(run, column) for column in RUN_COLUMNS]
+                for column in JSON_COLUMNS:
+                    index = RUN_COLUMNS.index(column)
+                    values[index] = json.dumps(values[index]) if values[index] is not None else None
+                cursor = self.db.execute(
+                    f"INSERT INTO runs (batch, recorded_at, {', '.join(RUN_COLUMNS)}, total_tokens, estimated_cost) "
+                    f"VALUES ({placeholders})",
+                    [batch, recorded_at, *values, run.total_tokens, run.estimated_cost],
+                )
+                self.db.executemany(
+                    f"INSERT INTO agent_calls (run, {', '.join(CALL_COLUMNS)}) VALUES (?{', ?' * len(CALL_COLUMNS)})",
+                    [(cursor.lastrowid, *(getattr(call, column) for column in CALL_COLUMNS))
+                     for call in run.agent_calls],
+                )
+
+    @staticmethod
+    def _where(filters: Dict[str, Optional[str]]) -> tuple[str, list]:
+        """WHERE clause over runs columns; None filters are ignored, lists match any value."""
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, version=None, command=None, problem_type=None, test_id=None,
+              batch=None) -> List[BenchmarkRun]:
+        """Matching runs with their agent calls, in insertion order."""
+        where, params = self._where({"version": version, "command": command, "problem_type": problem_type,
+                                     "test_id": test_id, "batch": batch})
+        rows = self.db.execute(f"SELECT id, {', '.join(RUN_COLUMNS)} FROM runs{where} ORDER BY id", params).fetchall()
+        calls: Dict[int, List[AgentCall]] = {}
+        for run_pk, *values in self.db.execute(
+                f"SELECT run, {', '.join(CALL_COLUMNS)} FROM agent_calls "
+                f"WHERE run IN (SELECT id FROM runs{where}) ORDER BY rowid", params):
+            call = AgentCall(**dict(zip(CALL_COLUMNS, values)))
+            call.success = bool(call.success)
+            calls.setdefault(run_pk, []).append(call)
+
+        runs = []
+        for run_pk, *values in rows:
+            record = dict(zip(RUN_COLUMNS, values))
+            for column, default in JSON_COLUMNS.items():
+                record[column] = json.loads(record[column]) if record[column] is not None else default
+            runs.append(BenchmarkRun(**record, agent_calls=calls.get(run_pk, [])))
+        return runs
+
+    def latest_batch(self, version: str) -> Optional[str]:
+        """Most recently appended batch of a version."""
+        row = self.db.execute("SELECT batch FROM runs WHERE version = ? ORDER BY id DESC LIMIT 1",
+                              (version,)).fetchone()
+        return row[0] if row else None
+
+    def has_batch(self, batch: str) -> bool:
+        return self.db.execute("SELECT 1 FROM runs WHERE batch = ? LIMIT 1", (batch,)).fetchone() is not None
+
+    def trend(self, command=None, problem_type=None, test_id=None) -> List[Dict]:
+        """Per-batch aggregates in the order batches were recorded (one row per release measurement)."""
+        where, params = self._where({"command": command, "problem_type": problem_type, "test_id": test_id})
+        rows = self.db.execute(f"""
+            SELECT batch, version, MIN(recorded_at), COUNT(*), SUM(error IS NOT NULL),
+                   AVG(CASE WHEN error IS NULL THEN total_duration_ms END),
+                   AVG(CASE WHEN error IS NULL THEN total_tokens END),
+                   AVG(CASE WHEN error IS NULL THEN estimated_cost END),
+                   AVG(CASE WHEN error IS NULL THEN parallel_batches END)
+            FROM runs{where} GROUP BY batch ORDER BY MIN(id)""", params).fetchall()
+        keys = ("batch", "version", "recorded_at", "runs", "failed", "avg_duration_ms", "avg_tokens",
+                "avg_cost", "avg_parallel_batches")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+def create_trend_report(trend: List[Dict]) -> str:
+    """Markdown table of per-batch averages, oldest first, with change vs the previous batch."""
+    report = ["# Benchmark History\n"]
+    report.append("| Batch | Version | Runs | Failed | Avg Duration | Change | Avg Tokens | Avg Cost | Parallel Batches |")
+    report.append("|-------|---------|------|--------|--------------|--------|------------|----------|------------------|")
+    previous = None
+    for row in trend:
+        duration = row["avg_duration_ms"] or 0
+        change = f"{(duration - previous) / previous * 100:+.1f}%" if previous else "-"
+        report.append(
+            f"| {row['batch']} | {row['version']} | {row['runs']} | {row['failed']} | {duration:.0f}ms | {change} "
+            f"| {row['avg_tokens'] or 0:.0f} | ${row['avg_cost'] or 0:.4f} | {row['avg_parallel_batches'] or 0:.1f} |"
+        )
+        previous = duration or previous
+    return "\n".join(report)
+
+
+def load_runs(ref: str, store_path: Path) -> List[BenchmarkRun]:
+    """
+    Runs of a JSON file written by save_results(), or of a stored batch id.
+
+    The store is only opened when ref is not a file, and never created, so
+    reading results files leaves no results.db behind.
+    """
+    if Path(ref).is_file():
+        return load_results(ref)
+    if store_path.exists():
+        with ResultsStore(store_path) as store:
+            if store.has_batch(ref):
+                return store.query(batch=ref)
+    raise FileNotFoundError(f"{ref} is neither a batch in {store_path} nor a results file")
+
+
+# === Batch runner ===
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+TEST_CASES_PATH = BENCHMARK_DIR / "test_cases.json"
+RESULTS_DIR = BENCHMARK_DIR / "results"
+RESULTS_DB_NAME = "results.db"
+
+VERSIONS = {"baseline": "v1.0", "v2": "v2.0"}
+
+# Split shell-style once, then {command} and {problem} are substituted into each
+# argument per test case (no shell runs, so no quoting is needed); write literal
+# braces as {{ and }}
+DEFAULT_COMMAND = 'claude -p "/think:{command} {problem}" --output-format stream-json --verbose'
+
+# primaryType values think-classifier can emit
+PROBLEM_TYPES = ("DIAGNOSIS", "DECISION", "PRIORITIZATION", "INNOVATION", "RISK", "FOCUS",
+                 "OPTIMIZATION", "STRATEGY", "DELIBERATION", "SYSTEMIC")
+
+# Share of stub runs whose classifier picks the wrong type
+STUB_MISROUTE_RATE = 0.05
+
+# Model tier of the mental model agents the stub executor simulates
+STUB_MODEL_TIERS = {
+    "5-whys": "haiku", "occams-razor": "haiku", "pareto": "haiku", "eisenhower": "haiku",
+    "one-thing": "haiku", "10-10-10": "haiku", "swot": "sonnet", "first-principles": "sonnet",
+    "second-order": "sonnet", "inversion": "sonnet", "opportunity-cost": "sonnet",
+}
+
+
+@dataclass
+class TestCase:
+    """One entry of test_cases.json."""
+    id: str
+    problem_type: str  # Category key: diagnosis, decision, ...
+    problem: str
+    expected_primary_type: str
+    expected_models: List[str]
+    complexity: str
+    expected_confidence_min: float
+
+
+def load_test_cases(path: Path = TEST_CASES_PATH) -> tuple[List[TestCase], Dict]:
+    """Load test cases and the benchmark protocol from test_cases.json."""
+    with open(path) as f:
+        data = json.load(f)
+    cases = [
+        TestCase(problem_type=problem_type, **case)
+        for problem_type, group in data.get("test_cases", {}).items()
+        for case in group
+    ]
+    return cases, data.get("benchmark_protocol", {})
+
+
+# === Transcript replay ===
+
+# Lines worth decoding when reconstructing a run (see transcript_metrics);
+# sidechain lines are all kept so their prompts and parent links survive
+SIDECHAIN_MARKERS = (b'"isSidechain":true', b'"isSidechain": true')
+REPLAY_MARKERS = (USAGE_MARKER, TOOL_USE_MARKER, b'"tool_result"') + SIDECHAIN_MARKERS
+
+# Pseudo-calls carrying the main chain's own usage and unattributed sidechain
+# usage; every other AgentCall is a real Task call
+PSEUDO_AGENTS = ("main", "sidechain")
+
+# {test_id}-{version}-{run_index}.jsonl, as written by CommandExecutor
+TRANSCRIPT_NAME = re.compile(r'^(?P<test_id>.+)-(?P<version>v\d+(?:\.\d+)*)-(?P<run_index>-?\d+)$')
+THINK_COMMAND = re.compile(r'/think:(\w+)')
+
+MODEL_TIERS = ("haiku", "sonnet", "opus")
+
+
+def model_tier(model: Optional[str], default: str = "sonnet") -> str:
+    """Map a model id (claude-3-5-haiku-..., opus, ...) to its tier."""
+    if model:
+        for tier in MODEL_TIERS:
+            if tier in model:
+                return tier
+    return default
+
+
+def iso_to_ms(timestamp: Optional[str]) -> Optional[int]:
+    """ISO-8601 timestamp to epoch milliseconds (None if unparseable)."""
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp() * 1000)
+    except (AttributeError, ValueError):
+        return None
+
+
+@dataclass
+class TaskSpan:
+    """A Task tool_use on the main chain, from invocation to its tool_result."""
+    tool_use_id: str
+    agent_name: str
+    requested_model: Optional[str]
+    start_ms: Optional[int]
+    prompt: str = ""
+    end_ms: Optional[int] = None
+    success: bool = True
+    agent_id: Optional[str] = None             # toolUseResult.agentId, when recorded
+    reported_duration_ms: Optional[int] = None  # toolUseResult.totalDurationMs
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_tokens: int = 0
+    cache_creation_tokens: int = 0
+    model: Optional[str] = None  # Model reported by the sidechain's replies
+    output: str = ""             # Text of the tool_result
+    matched_by: str = ""         # agent_id, prompt or window
+
+
+@dataclass
+class Sidechain:
+    """One subagent conversation: sidechain entries sharing a root or agentId."""
+    key: str
+    prompt: str = ""
+    start_ms: Optional[int] = None
+    usages: List[tuple] = field(default_factory=list)  # (usage dict, model)
+
+    def add(self, entry: Dict, ms: Optional[int]) -> None:
+        if ms is not None and (self.start_ms is None or ms < self.start_ms):
+            self.start_ms = ms
+        message = entry.get("message")
+        if not isinstance(message, dict):
+            return
+        if message.get("role") == "user" and not self.prompt:
+            self.prompt = _message_text(message.get("content"))
+        if isinstance(message.get("usage"), dict):
+            self.usages.append((message["usage"], message.get("model")))
+
+
+def _message_text(content) -> str:
+    """Plain text of a message's content (string or text blocks)."""
+    if isinstance(content, str):
+        return content.strip()
+    if isinstance(content, list):
+        return "\n".join(block.get("text", "") for block in content
+                         if isinstance(block, dict) and block.get("type") == "text").strip()
+    return ""
+
+
+def iter_replay_entries(path: Path):
+    """Decoded transcript entries that carry usage, tool calls or tool results.
+
+    The first user prompt is also decoded so the problem text can be
+    recovered; everything else is skipped by byte scan.
+    """
+    seen_prompt = False
+    with open(path, "rb") as f:
+        for line in f:
+            wanted = any(marker in line for marker in REPLAY_MARKERS)
+            if not wanted and (seen_prompt or b'"user"' not in line):
+                continue
+            try:
+                entry = loads(line)
+            except DECODE_ERRORS:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            if not wanted:
+                seen_prompt = True
+            yield entry
+
+
+def _usage_tokens(usage: Dict) -> tuple[int, int, int, int]:
+    """(input, output, cache reads + writes, cache writes) of one reply."""
+    cache_creation = usage.get("cache_creation_input_tokens", 0)
+    return (
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        usage.get("cache_read_input_tokens", 0) + cache_creation,
+        cache_creation,
+    )
+
+
+# TOON fields of the think agents' outputs (see agents/think-*.md)
+PRIMARY_TYPE_FIELD = re.compile(r'^\s*primaryType:\s*([A-Z_]+)', re.M)
+CONFIDENCE_FIELD = re.compile(r'^\s*confidence:\s*([01](?:\.\d+)?)', re.M)
+SELECTED_MODEL_FIELD = re.compile(r'^\s*(?:primary|supporting|adversarial):\s*([\w-]+)', re.M)
+MODEL_AGENT_PREFIX = "model-"
+
+
+@dataclass
+class Routing:
+    """What the classifier/orchestrator decided for one run."""
+    classified_type: Optional[str] = None
+    classifier_confidence: Optional[float] = None
+    selected_models: List[str] = field(default_factory=list)
+    final_confidence: Optional[float] = None  # think-synthesizer's aggregate confidence
+
+
+def parse_routing(outputs: List[tuple[str, str]]) -> Routing:
+    """
+    Routing decisions from (agent name, output text) of a run's Task calls.
+
+    The classified type is the majority primaryType of the think-classifier
+    votes (first vote wins ties) and its confidence the mean over agreeing
+    votes. Selected models are the model-* agents actually launched, or
+    the orchestrator's primary/supporting/adversarial picks if none were.
+    """
+    routing = Routing()
+    votes: List[tuple[str, Optional[float]]] = []
+    planned: List[str] = []
+    for agent, text in outputs:
+        if agent == "think-classifier":
+            primary = PRIMARY_TYPE_FIELD.search(text)
+            if primary:
+                confidence = CONFIDENCE_FIELD.findall(text)
+                votes.append((primary.group(1), float(confidence[-1]) if confidence else None))
+        elif agent == "think-orchestrator":
+            planned.extend(model for model in SELECTED_MODEL_FIELD.findall(text) if model != "none")
+        elif agent.startswith(MODEL_AGENT_PREFIX):
+            routing.selected_models.append(agent[len(MODEL_AGENT_PREFIX):])
+        elif agent == "think-synthesizer":
+            confidence = CONFIDENCE_FIELD.findall(text)
+            if confidence:
+                routing.final_confidence = float(confidence[-1])
+
+    if votes:
+        routing.classified_type = Counter(vote for vote, _ in votes).most_common(1)[0][0]
+        agreeing = [confidence for vote, confidence in votes
+                    if vote == routing.classified_type and confidence is not None]
+        routing.classifier_confidence = sum(agreeing) / len(agreeing) if agreeing else None
+    routing.selected_models = list(dict.fromkeys(routing.selected_models or planned))
+    return routing
+
+
+def overlap_groups(spans: List[TaskSpan]) -> List[List[TaskSpan]]:
+    """Group Task spans whose [start, end] intervals overlap (transitively)."""
+    timed = sorted((s for s in spans if s.start_ms is not None), key=lambda s: s.start_ms)
+    groups = []
+    group_end = None
+    for span in timed:
+        end = span.end_ms if span.end_ms is not None else span.start_ms
+        if groups and span.start_ms <= group_end:
+            groups[-1].append(span)
+            group_end = max(group_end, end)
+        else:
+            groups.append([span])
+            group_end = end
+    return groups
+
+
+def _group_sidechains(entries: List[Dict], sidechains: Dict[str, Sidechain]) -> None:
+    """Group sidechain entries by agentId, or by the root of their parentUuid chain."""
+    parents = {e["uuid"]: e.get("parentUuid") for e in entries if e.get("uuid")}
+    roots = {}
+
+    def root_of(uuid):
+        path = []
+        while uuid in parents and parents[uuid] in parents and uuid not in roots:
+            path.append(uuid)
+            uuid = parents[uuid]
+        root = roots.get(uuid, uuid)
+        for node in path:
+            roots[node] = root
+        return root
+
+    for index, entry in enumerate(entries):
+        if entry.get("agentId"):
+            key = f"agent:{entry['agentId']}"
+        elif entry.get("uuid"):
+            key = f"root:{root_of(entry['uuid'])}"
+        else:
+            key = f"entry:{index}"  # Unlinked entry: placed by timestamp alone
+        chain = sidechains.setdefault(key, Sidechain(key))
+        chain.add(entry, iso_to_ms(entry.get("timestamp")))
+
+
+def _load_agent_transcript(path: Path, agent_id: str, sidechains: Dict[str, Sidechain]) -> None:
+    """Add a subagent transcript stored in its own file (agent-<id>.jsonl)."""
+    for candidate in (path.parent / f"agent-{agent_id}.jsonl",
+                      path.parent / path.stem / "subagents" / f"agent-{agent_id}.jsonl"):
+        if candidate.exists():
+            entries = [dict(entry, agentId=agent_id) for entry in iter_replay_entries(candidate)]
+            _group_sidechains(entries, sidechains)
+            return
+
+
+def attribute_sidechains(spans: List[TaskSpan], sidechains: Dict[str, Sidechain]) -> List[Sidechain]:
+    """
+    Match each subagent conversation to the Task call that spawned it.
+
+    In order of reliability: the agentId recorded on the Task's
+    tool_result, the Task prompt equalling the sidechain's first user
+    message, and finally the innermost Task span containing the
+    sidechain's start. Returns the sidechains nothing matched.
+    """
+    owners: Dict[str, TaskSpan] = {}
+    for span in spans:
+        key = f"agent:{span.agent_id}" if span.agent_id else None
+        if key in sidechains:
+            owners[key] = span
+            span.matched_by = "agent_id"
+
+    by_prompt: Dict[str, List[TaskSpan]] = {}
+    for span in sorted((s for s in spans if not s.matched_by and s.prompt), key=lambda s: s.start_ms or 0):
+        by_prompt.setdefault(span.prompt.strip(), []).append(span)
+    for chain in sorted(sidechains.values(), key=lambda c: c.start_ms or 0):
+        if chain.key not in owners and by_prompt.get(chain.prompt):
+            span = by_prompt[chain.prompt].pop(0)
+            owners[chain.key] = span
+            span.matched_by = "prompt"
+
+    latest_first = sorted((s for s in spans if s.start_ms is not None), key=lambda s: s.start_ms, reverse=True)
+    for chain in sidechains.values():
+        if chain.key in owners or chain.start_ms is None:
+            continue
+        containing = [s for s in latest_first
+                      if s.start_ms <= chain.start_ms and (s.end_ms is None or chain.start_ms <= s.end_ms)]
+        span = next((s for s in containing if not s.matched_by), containing[0] if containing else None)
+        if span is not None:
+            owners[chain.key] = span
+            span.matched_by = span.matched_by or "window"
+
+    for key, span in owners.items():
+        for usage, model in sidechains[key].usages:
+            tokens = _usage_tokens(usage)
+            span.input_tokens += tokens[0]
+            span.output_tokens += tokens[1]
+            span.cache_tokens += tokens[2]
+            span.cache_creation_tokens += tokens[3]
+            span.model = span.model or model
+    return [chain for key, chain in sidechains.items() if key not in owners]
+
+
+def reconstruct_run(path: Path, cases: Optional[Dict[str, TestCase]] = None,
+                    version: Optional[str] = None, case: Optional[TestCase] = None) -> BenchmarkRun:
+    """
+    Rebuild a BenchmarkRun from a recorded session transcript.
+
+    One AgentCall per Task tool_use, plus one "main" call for the main
+    chain's own usage. Each Task call gets the tokens and model of its own
+    subagent conversation (see attribute_sidechains), its tool_use ->
+    tool_result duration (or the reported totalDurationMs) and is_error.
+    Overlapping Task spans form parallel batches.
+
+    The test case comes from `case`, or is looked up in `cases` by the
+    {test_id}-{version}-{run_index} file name.
+    """
+    path = Path(path)
+    cases = cases or {}
+    spans: Dict[str, TaskSpan] = {}
+    sidechain_entries = []
+    main_tokens = [0, 0, 0, 0]
+    main_model = None
+    first_ts = last_ts = None
+    prompt = ""
+
+    for entry in iter_replay_entries(path):
+        timestamp = entry.get("timestamp")
+        if timestamp:
+            first_ts = first_ts or timestamp
+            last_ts = timestamp
+        if entry.get("isSidechain"):
+            sidechain_entries.append(entry)
+            continue
+        message = entry.get("message")
+        if not isinstance(message, dict):
+            continue
+
+        usage = message.get("usage")
+        if isinstance(usage, dict):
+            main_tokens = [a + b for a, b in zip(main_tokens, _usage_tokens(usage))]
+            main_model = message.get("model") or main_model
+
+        content = message.get("content")
+        if message.get("role") == "user" and not prompt:
+            prompt = _message_text(content)
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "tool_use" and block.get("name") == "Task":
+                params = block.get("input") if isinstance(block.get("input"), dict) else {}
+                span_id = block.get("id") or f"task-{len(spans)}"
+                spans[span_id] = TaskSpan(
+                    tool_use_id=span_id,
+                    agent_name=params.get("subagent_type") or params.get("description") or "Task",
+                    requested_model=params.get("model"),
+                    start_ms=iso_to_ms(timestamp),
+                    prompt=str(params.get("prompt", "")).strip(),
+                )
+            elif block.get("type") == "tool_result" and block.get("tool_use_id") in spans:
+                span = spans[block["tool_use_id"]]
+                span.end_ms = iso_to_ms(timestamp)
+                span.success = not block.get("is_error", False)
+                span.output = _message_text(block.get("content"))
+                result = entry.get("toolUseResult")
+                if isinstance(result, dict):
+                    span.agent_id = result.get("agentId") or span.agent_id
+                    span.reported_duration_ms = result.get("totalDurationMs", span.reported_duration_ms)
+
+    sidechains: Dict[str, Sidechain] = {}
+    _group_sidechains(sidechain_entries, sidechains)
+    for span in spans.values():
+        if span.agent_id and f"agent:{span.agent_id}" not in sidechains:
+            _load_agent_transcript(path, span.agent_id, sidechains)
+    unmatched = attribute_sidechains(list(spans.values()), sidechains)
+
+    start_ms, end_ms = iso_to_ms(first_ts), iso_to_ms(last_ts)
+    duration_ms = end_ms - start_ms if start_ms is not None and end_ms is not None else 0
+    calls = [AgentCall("main", model_tier(main_model), *main_tokens[:3], duration_ms, True,
+                       cache_creation_tokens=main_tokens[3], start_offset_ms=0 if start_ms is not None else None)]
+    for span in spans.values():
+        if span.reported_duration_ms is not None:
+            span_ms = int(span.reported_duration_ms)
+        elif span.start_ms is not None and span.end_ms is not None:
+            span_ms = span.end_ms - span.start_ms
+        else:
+            span_ms = 0
+        calls.append(AgentCall(
+            agent_name=span.agent_name,
+            model=model_tier(span.model or span.requested_model),
+            input_tokens=span.input_tokens,
+            output_tokens=span.output_tokens,
+            cache_tokens=span.cache_tokens,
+            duration_ms=span_ms,
+            success=span.success,
+            cache_creation_tokens=span.cache_creation_tokens,
+            start_offset_ms=span.start_ms - start_ms if span.start_ms is not None and start_ms is not None else None,
+        ))
+    unattributed = [0, 0, 0, 0]
+    for chain in unmatched:
+        for usage, _ in chain.usages:
+            unattributed = [a + b for a, b in zip(unattributed, _usage_tokens(usage))]
+    if any(unattributed):
+        calls.append(AgentCall("sidechain", "unknown", *unattributed[:3], 0, True,
+                               cache_creation_tokens=unattributed[3]))
+
+    groups = overlap_groups(list(spans.values()))
+    routing = parse_routing([(span.agent_name, span.output) for span in spans.values()])
+    name = TRANSCRIPT_NAME.match(path.stem)
+    case = case or cases.get(name.group("test_id") if name else "")
+    test_id = case.id if case else (name.group("test_id") if name else "")
+    command = THINK_COMMAND.search(prompt)
+    return BenchmarkRun(
+        run_id=path.stem,
+        command=command.group(1) if command else "",
+        problem_type=case.problem_type if case else "",
+        problem_text=case.problem if case else prompt,
+        version=version or (name.group("version") if name else "replay"),
+        start_time=first_ts or "",
+        end_time=last_ts or "",
+        total_duration_ms=duration_ms,
+        agent_calls=calls,
+        parallel_batches=sum(1 for group in groups if len(group) > 1),
+        sequential_steps=len(groups),
+        final_confidence=routing.final_confidence or 0.0,
+        test_id=test_id,
+        run_index=int(name.group("run_index")) if name else 0,
+        classified_type=routing.classified_type,
+        classifier_confidence=routing.classifier_confidence,
+        selected_models=routing.selected_models,
+    )
+
+
+def replay_directory(replay_dir: Path, cases: Optional[Dict[str, TestCase]] = None,
+                     version: Optional[str] = None, workers: Optional[int] = None) -> List[BenchmarkRun]:
+    """Reconstruct a BenchmarkRun from every *.jsonl under replay_dir on a process pool."""
+    # Subagent transcripts (agent-<id>.jsonl) are read with their session
+    paths = sorted(p for p in replay_dir.rglob("*.jsonl") if not p.name.startswith("agent-"))
+    if len(paths) < 2 or workers == 1:
+        return [reconstruct_run(path, cases, version) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(reconstruct_run, paths, repeat(cases), repeat(version), chunksize=16))
+
+
+class StubExecutor:
+    """
+    Offline executor producing deterministic synthetic runs.
+
+    Exercises the runner, persistence and reporting without invoking
+    Claude: a classifier call, one call per expected model (in parallel for
+    v2.0, sequential otherwise) and a synthesizer call. The classifier
+    picks the wrong type STUB_MISROUTE_RATE of the time.
+    """
+    name = "stub"
+
+    def run(self, case: TestCase, version: str, command: str, run_id: str, run_index: int,
+            timeout_s: float) -> BenchmarkRun:
+        rng = random.Random(hashlib.sha1(f"{case.id}:{version}:{run_index}".encode()).hexdigest())
+        parallel = version != "v1.0"
+
+        calls = [AgentCall("think-classifier", "haiku", rng.randint(800, 1500), rng.randint(100, 300),
+                           rng.randint(0, 4000), rng.randint(2000, 5000), True)]
+        model_calls = [
+            AgentCall(f"model-{name}", STUB_MODEL_TIERS.get(name, "sonnet"), rng.randint(2000, 6000),
+                      rng.randint(800, 2500), rng.randint(0, 8000), rng.randint(15000, 60000), True)
+            for name in case.expected_models
+        ]
+        calls.extend(model_calls)
+        calls.append(AgentCall("think-synthesizer", "sonnet", rng.randint(4000, 9000), rng.randint(1000, 3000),
+                               rng.randint(0, 8000), rng.randint(10000, 30000), True))
+
+        model_ms = (max if parallel else sum)(call.duration_ms for call in model_calls)
+        duration_ms = calls[0].duration_ms + model_ms + calls[-1].duration_ms
+        calls[0].start_offset_ms = 0
+        offset = calls[0].duration_ms
+        for call in model_calls:
+            call.start_offset_ms = offset
+            offset += 0 if parallel else call.duration_ms
+        calls[-1].start_offset_ms = calls[0].duration_ms + model_ms
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=run_index)
+        run = BenchmarkRun(
+            run_id=run_id,
+            command=command,
+            problem_type=case.problem_type,
+            problem_text=case.problem,
+            version=version,
+            start_time=start.isoformat(),
+            end_time=(start + timedelta(milliseconds=duration_ms)).isoformat(),
+            total_duration_ms=duration_ms,
+            agent_calls=calls,
+            parallel_batches=1 if parallel else 0,
+            sequential_steps=3 if parallel else len(calls),
+            final_confidence=round(rng.uniform(case.expected_confidence_min - 0.1, 0.95), 2),
+            test_id=case.id,
+            run_index=run_index,
+            selected_models=list(case.expected_models),
+        )
+        if rng.random() < STUB_MISROUTE_RATE:
+            run.classified_type = rng.choice([t for t in PROBLEM_TYPES if t != case.expected_primary_type])
+            run.classifier_confidence = round(rng.uniform(0.4, 0.7), 2)
+        else:
+            run.classified_type = case.expected_primary_type
+            run.classifier_confidence = round(rng.uniform(case.expected_confidence_min - 0.02, 0.95), 2)
+        return run
+
+
+class ReplayExecutor:
+    """
+    Offline executor re-parsing saved transcripts.
+
+    Looks for `{test_id}-{version}-{run_index}.jsonl` in the replay
+    directory (as written by CommandExecutor), falling back to
+    `{test_id}.jsonl`.
+    """
+    name = "replay"
+
+    def __init__(self, replay_dir: Path):
+        self.replay_dir = replay_dir
+
+    def run(self, case: TestCase, version: str, command: str, run_id: str, run_index: int,
+            timeout_s: float) -> BenchmarkRun:
+        for name in (f"{case.id}-{version}-{run_index}.jsonl", f"{case.id}.jsonl"):
+            path = self.replay_dir / name
+            if path.exists():
+                run = reconstruct_run(path, version=version, case=case)
+                run.run_id, run.run_index = run_id, run_index
+                run.command = run.command or command
+                return run
+        raise FileNotFoundError(f"No transcript for {case.id} in {self.replay_dir}")
+
+
+class CommandExecutor:
+    """
+    Live executor running a command per test case.
+
+    The command's stdout is expected to be a stream-json transcript; it is
+    saved next to the results so the run can be replayed later.
+    """
+    name = "command"
+
+    def __init__(self, template: str, transcript_dir: Path):
+        """Raises ValueError when the template can't be split or formatted."""
+        self.template = template
+        self.transcript_dir = transcript_dir
+        try:
+            self.argv_template = shlex.split(template)
+            for part in self.argv_template:
+                part.format(command='', problem='')
+        except (ValueError, KeyError, IndexError) as e:
+            raise ValueError(f"Invalid --command template {template!r}: {type(e).__name__}: {e} "
+                             f"(only {{command}} and {{problem}} are substituted; "
+                             f"write literal braces as {{{{ and }}}})") from None
+
+    def run(self, case: TestCase, version: str, command: str, run_id: str, run_index: int,
+            timeout_s: float) -> BenchmarkRun:
+        argv = [part.format(command=command, problem=case.problem) for part in self.argv_template]
+        self.transcript_dir.mkdir(parents=True, exist_ok=True)
+        transcript = self.transcript_dir / f"{case.id}-{version}-{run_index}.jsonl"
+
+        start = time.monotonic()
+        with open(transcript, "wb") as out:
+            completed = subprocess.run(argv, stdout=out, stderr=subprocess.PIPE, timeout=timeout_s)
+        duration_ms = int((time.monotonic() - start) * 1000)
+
+        run = reconstruct_run(transcript, version=version, case=case)
+        run.run_id, run.command, run.total_duration_ms = run_id, command, duration_ms
+        if completed.returncode != 0:
+            run.error = f"exit {completed.returncode}: {completed.stderr.decode(errors='replace').strip()[-500:]}"
+        return run
+
+
+def run_case(executor, case: TestCase, version: str, command: str, run_index: int,
+             timeout_s: float) -> BenchmarkRun:
+    """Run one case, recording executor failures on the run instead of raising."""
+    run_id = f"{version}-{case.id}-{run_index}"
+    try:
+        return executor.run(case, version, command, run_id, run_index, timeout_s)
+    except Exception as e:
+        now = datetime.now(timezone.utc).isoformat()
+        return BenchmarkRun(
+            run_id=run_id, command=command, problem_type=case.problem_type, problem_text=case.problem,
+            version=version, start_time=now, end_time=now, total_duration_ms=0,
+            test_id=case.id, run_index=run_index, error=f"{type(e).__name__}: {e}",
+        )
+
+
+def run_suite(cases: List[TestCase], executor, version: str, command: str = "consider",
+              runs_per_test: int = 1, warmup_runs: int = 0, workers: int = 4,
+              timeout_s: float = 300.0) -> List[BenchmarkRun]:
+    """
+    Run every case runs_per_test times on a bounded worker pool.
+
+    Warmup runs execute first (in parallel too) and are discarded. Results
+    come back in (case, run_index) order regardless of completion order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if warmup_runs:
+            list(pool.map(lambda job: run_case(executor, job[0], version, command, -1 - job[1], timeout_s),
+                          [(case, i) for case in cases for i in range(warmup_runs)]))
+        jobs = [(case, i) for case in cases for i in range(runs_per_test)]
+        return list(pool.map(lambda job: run_case(executor, job[0], version, command, job[1], timeout_s), jobs))
+
+
+# === Statistical comparison ===
+
+# name -> (label, per-run values from a RunColumns view); lower is better for all of them
+COMPARISON_METRICS = {
+    "duration_ms": ("Duration", RunColumns.durations),
+    "tokens": ("Tokens", RunColumns.tokens),
+    "cost": ("Cost", RunColumns.cost),
+}
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE = 0.95
+REGRESSION_THRESHOLD_PCT = 10.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def bootstrap_ci(values: List[float], resamples: int = BOOTSTRAP_RESAMPLES,
+                 confidence: float = CONFIDENCE, seed: int = 0) -> tuple[float, float]:
+    """Percentile bootstrap confidence interval of the mean."""
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value
+    rng = random.Random(seed)
+    n = len(values)
+    means = sorted(sum(rng.choices(values, k=n)) / n for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(means, tail), percentile(means, 100 - tail)
+
+
+@dataclass
+class MetricSummary:
+    """Distribution of one metric over a set of runs."""
+    n: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    ci_low: float   # Bootstrap CI of the mean
+    ci_high: float
+
+
+def summarize(values: List[float], resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) -> MetricSummary:
+    ci_low, ci_high = bootstrap_ci(values, resamples, seed=seed)
+    return MetricSummary(
+        n=len(values),
+        mean=sum(values) / len(values) if values else 0.0,
+        p50=percentile(values, 50),
+        p90=percentile(values, 90),
+        p99=percentile(values, 99),
+        ci_low=ci_low,
+        ci_high=ci_high,
+    )
+
+
+@dataclass
+class CaseDelta:
+    """Paired v1 -> v2 change of one metric on one test case (medians of its runs)."""
+    test_id: str
+    problem_type: str
+    complexity: str
+    v1: float
+    v2: float
+
+    @property
+    def change_pct(self) -> float:
+        return (self.v2 - self.v1) / self.v1 * 100 if self.v1 else 0.0
+
+
+@dataclass
+class Comparison:
+    """Everything create_comparison_report() prints, plus the regressions that gate a release."""
+    v1: Dict[str, MetricSummary]
+    v2: Dict[str, MetricSummary]
+    deltas: Dict[str, List[CaseDelta]]
+    # metric -> group label ("all", "diagnosis", "complexity=high") -> (mean change %, CI low, CI high, cases)
+    groups: Dict[str, Dict[str, tuple[float, float, float, int]]]
+    regressions: List[str]
+    threshold_pct: float
+    v1_failed: int = 0
+    v2_failed: int = 0
+
+
+def paired_deltas(v1_runs: List[BenchmarkRun], v1_values: Sequence[float],
+                  v2_runs: List[BenchmarkRun], v2_values: Sequence[float],
+                  cases: Optional[Dict[str, TestCase]] = None) -> List[CaseDelta]:
+    """Pair runs by test case; each side is the median of that case's values (aligned with its runs)."""
+    def by_case(runs, values):
+        grouped: Dict[str, List[float]] = {}
+        for run, value in zip(runs, values):
+            grouped.setdefault(run.test_id or run.problem_text, []).append(value)
+        return grouped
+
+    v1_cases, v2_cases = by_case(v1_runs, v1_values), by_case(v2_runs, v2_values)
+    problem_types = {run.test_id or run.problem_text: run.problem_type for run in v1_runs}
+    deltas = []
+    for test_id in sorted(v1_cases.keys() & v2_cases.keys()):
+        case = (cases or {}).get(test_id)
+        deltas.append(CaseDelta(
+            test_id=test_id,
+            problem_type=case.problem_type if case else problem_types[test_id],
+            complexity=case.complexity if case else "unknown",
+            v1=percentile(v1_cases[test_id], 50),
+            v2=percentile(v2_cases[test_id], 50),
+        ))
+    return deltas
+
+
+def compare_runs(v1_runs: List[BenchmarkRun], v2_runs: List[BenchmarkRun],
+                 cases: Optional[Dict[str, TestCase]] = None,
+                 threshold_pct: float = REGRESSION_THRESHOLD_PCT,
+                 resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) -> Comparison:
+    """
+    Compare two result sets metric by metric.
+
+    Failed runs are left out. A metric regresses when v2's mean paired
+    change exceeds threshold_pct and its confidence interval excludes
+    zero, so a single slow run cannot fail the gate on its own.
+    """
+    v1_ok = [run for run in v1_runs if not run.error]
+    v2_ok = [run for run in v2_runs if not run.error]
+    comparison = Comparison(v1={}, v2={}, deltas={}, groups={}, regressions=[], threshold_pct=threshold_pct,
+                            v1_failed=len(v1_runs) - len(v1_ok), v2_failed=len(v2_runs) - len(v2_ok))
+
+    v1_columns, v2_columns = RunColumns.from_runs(v1_ok), RunColumns.from_runs(v2_ok)
+    for metric, (label, values) in COMPARISON_METRICS.items():
+        v1_values, v2_values = values(v1_columns), values(v2_columns)
+        comparison.v1[metric] = summarize(v1_values, resamples, seed)
+        comparison.v2[metric] = summarize(v2_values, resamples, seed)
+        deltas = paired_deltas(v1_ok, v1_values, v2_ok, v2_values, cases)
+        comparison.deltas[metric] = deltas
+
+        buckets: Dict[str, List[float]] = {"all": []}
+        for delta in deltas:
+            for group in ("all", delta.problem_type, f"complexity={delta.complexity}"):
+                buckets.setdefault(group, []).append(delta.change_pct)
+        groups = {}
+        for group in sorted(buckets, key=lambda g: (g != "all", g.startswith("complexity="), g)):
+            changes = buckets[group]
+            if changes:
+                low, high = bootstrap_ci(changes, resamples, seed=seed)
+                groups[group] = (sum(changes) / len(changes), low, high, len(changes))
+        comparison.groups[metric] = groups
+
+        overall = groups.get("all")
+        if overall and overall[0] > threshold_pct and overall[1] > 0:
+            comparison.regressions.append(
+                f"{label}: {overall[0]:+.1f}% (95% CI {overall[1]:+.1f}% to {overall[2]:+.1f}%) "
+                f"exceeds +{threshold_pct:g}%"
+            )
+    return comparison
+
+
+def _format_metric(metric: str, value: float) -> str:
+    if metric == "duration_ms":
+        return f"{value:.0f}ms"
+    if metric == "cost":
+        return f"${value:.4f}"
+    return f"{value:.0f}"
+
+
 def create_comparison_report(v1_runs: List[BenchmarkRun],
-                             v2_runs: List[BenchmarkRun]) -> str:
+                             v2_runs: List[BenchmarkRun],
+                             cases: Optional[Dict[str, TestCase]] = None,
+                             comparison: Optional[Comparison] = None) -> str:
     """Generate comparison report between v1 and v2."""
+    comparison = comparison or compare_runs(v1_runs, v2_runs, cases)
     report = []
     report.append("# Think Plugin Performance Comparison\n")
     report.append(f"Generated: {datetime.now().isoformat()}\n")
+    report.append(f"Runs: v1.0 {len(v1_runs)} ({comparison.v1_failed} failed), "
+                  f"v2.0 {len(v2_runs)} ({comparison.v2_failed} failed); "
+                  f"{len(comparison.deltas['duration_ms'])} paired test cases\n")
 
-    # Aggregate metrics
-    v1_avg_duration = sum(r.total_duration_ms for r in v1_runs) / len(v1_runs) if v1_runs else 0
-    v2_avg_duration = sum(r.total_duration_ms for r in v2_runs) / len(v2_runs) if v2_runs else 0
+    # Headline from the paired per-case changes, not the pooled means
+    duration = comparison.groups["duration_ms"].get("all")
+    report.append("\n## Summary\n")
+    if duration:
+        mean, low, high, _ = duration
+        # Same reading as the regression gate: a CI spanning zero is not a change
+        if low <= 0 <= high:
+            verdict = "no significant change"
+        elif mean < 0:
+            verdict = f"{100 / (100 + mean):.1f}x faster" if mean > -100 else "faster"
+        else:
+            verdict = f"{(100 + mean) / 100:.1f}x slower"
+        report.append(f"Duration changed {mean:+.1f}% per test case (95% CI {low:+.1f}% to {high:+.1f}%), "
+                      f"{verdict}.\n")
+    report.append(f"| Metric | Version | Mean (95% CI) | p50 | p90 | p99 |")
+    report.append(f"|--------|---------|---------------|-----|-----|-----|")
+    for metric, (label, _) in COMPARISON_METRICS.items():
+        for version, summary in (("v1.0", comparison.v1[metric]), ("v2.0", comparison.v2[metric])):
+            mean, low, high, p50, p90, p99 = (_format_metric(metric, value) for value in (
+                summary.mean, summary.ci_low, summary.ci_high, summary.p50, summary.p90, summary.p99))
+            report.append(f"| {label} | {version} | {mean} ({low}-{high}) | {p50} | {p90} | {p99} |")
 
-    v1_avg_tokens = sum(r.total_tokens for r in v1_runs) / len(v1_runs) if v1_runs else 0
-    v2_avg_tokens = sum(r.total_tokens for r in v2_runs) / len(v2_runs) if v2_runs else 0
+    report.append("\n## Paired Change by Group\n")
+    report.append("Mean of per-test-case changes from v1.0 to v2.0 (negative is better).\n")
+    report.append(f"| Group | Cases | " + " | ".join(label for label, _ in COMPARISON_METRICS.values()) + " |")
+    report.append(f"|-------|-------|" + "|".join("---" for _ in COMPARISON_METRICS) + "|")
+    for group, (_, _, _, count) in comparison.groups["duration_ms"].items():
+        cells = []
+        for metric in COMPARISON_METRICS:
+            mean, low, high, _ = comparison.groups[metric][group]
+            cells.append(f"{mean:+.1f}% ({low:+.1f}% to {high:+.1f}%)")
+        report.append(f"| {group} | {count} | " + " | ".join(cells) + " |")
 
-    v1_avg_cost = sum(r.estimated_cost for r in v1_runs) / len(v1_runs) if v1_runs else 0
-    v2_avg_cost = sum(r.estimated_cost for r in v2_runs) / len(v2_runs) if v2_runs else 0
+    report.append("\n## Per Test Case\n")
+    report.append("| Test | Type | Complexity | v1.0 Duration | v2.0 Duration | Change | Tokens Change |")
+    report.append("|------|------|------------|---------------|---------------|--------|---------------|")
+    token_changes = {delta.test_id: delta.change_pct for delta in comparison.deltas["tokens"]}
+    for delta in comparison.deltas["duration_ms"]:
+        report.append(f"| {delta.test_id} | {delta.problem_type} | {delta.complexity} | {delta.v1:.0f}ms "
+                      f"| {delta.v2:.0f}ms | {delta.change_pct:+.1f}% | {token_changes[delta.test_id]:+.1f}% |")
 
-    # Calculate improvements
-    speedup = v1_avg_duration / v2_avg_duration if v2_avg_duration > 0 else 0
-    token_change = ((v2_avg_tokens - v1_avg_tokens) / v1_avg_tokens * 100) if v1_avg_tokens > 0 else 0
-    cost_change = ((v2_avg_cost - v1_avg_cost) / v1_avg_cost * 100) if v1_avg_cost > 0 else 0
-
-    report.append("\n## Summary\n")
-    report.append(f"| Metric | v1.0 | v2.0 | Change |")
-    report.append(f"|--------|------|------|--------|")
-    report.append(f"| Avg Duration | {v1_avg_duration:.0f}ms | {v2_avg_duration:.0f}ms | {speedup:.1f}x faster |")
-    report.append(f"| Avg Tokens | {v1_avg_tokens:.0f} | {v2_avg_tokens:.0f} | {token_change:+.1f}% |")
-    report.append(f"| Avg Cost | ${v1_avg_cost:.4f} | ${v2_avg_cost:.4f} | {cost_change:+.1f}% |")
+    report.append(f"\n## Prompt Caching\n")
+    report.append(f"Costs use pricing version {PRICING.version} (benchmarks/pricing.json).\n")
+    report.append(f"| Version | Cache Reads | Cache Writes | Cached Share of Input | Saved vs Uncached |")
+    report.append(f"|---------|-------------|--------------|-----------------------|-------------------|")
+    columns = {"v1.0": RunColumns.from_runs(v1_runs), "v2.0": RunColumns.from_runs(v2_runs)}
+    for version, view in columns.items():
+        uncached, writes, reads = view.prompt_tokens()
+        share = reads / (uncached + writes + reads) * 100 if uncached + writes + reads else 0.0
+        report.append(f"| {version} | {reads} | {writes} | {share:.1f}% | ${view.cache_savings():.4f} |")
 
     # Model distribution for v2
     if v2_runs:
-        total_haiku = sum(r.model_distribution.get("haiku", 0) for r in v2_runs)
-        total_sonnet = sum(r.model_distribution.get("sonnet", 0) for r in v2_runs)
-        total_opus = sum(r.model_distribution.get("opus", 0) for r in v2_runs)
+        models = columns["v2.0"].model_counts()
+        total_haiku, total_sonnet, total_opus = models["haiku"], models["sonnet"], models["opus"]
         total_calls = total_haiku + total_sonnet + total_opus
 
         report.append("\n## v2.0 Model Distribution\n")
@@ -203,17 +1408,614 @@ def create_comparison_report(v1_runs: List[BenchmarkRun],
             report.append(f"| Sonnet | {total_sonnet} | {total_sonnet/total_calls*100:.1f}% |")
             report.append(f"| Opus | {total_opus} | {total_opus/total_calls*100:.1f}% |")
 
+    report.append("\n## Regressions\n")
+    if comparison.regressions:
+        report.extend(f"- {regression}" for regression in comparison.regressions)
+    else:
+        report.append(f"None past +{comparison.threshold_pct:g}%.")
+
     return "\n".join(report)
 
 
-def save_results(runs: List[BenchmarkRun], output_path: str):
-    """Save benchmark results to JSON."""
-    with open(output_path, 'w') as f:
-        json.dump([asdict(r) for r in runs], f, indent=2, default=str)
+def agent_breakdown(runs: List[BenchmarkRun]) -> Dict[str, Dict]:
+    """Per-agent totals across runs (the main chain itself is excluded)."""
+    stats: Dict[str, Dict] = {}
+    for run in runs:
+        for call in run.agent_calls:
+            if call.agent_name in PSEUDO_AGENTS:
+                continue
+            agent = stats.setdefault(call.agent_name, {
+                "calls": 0, "failures": 0, "duration_ms": 0, "tokens": 0, "models": {},
+            })
+            agent["calls"] += 1
+            agent["failures"] += 0 if call.success else 1
+            agent["duration_ms"] += call.duration_ms
+            agent["tokens"] += call.input_tokens + call.output_tokens + call.cache_tokens
+            agent["models"][call.model] = agent["models"].get(call.model, 0) + 1
+    return stats
+
+
+def create_agent_report(runs: List[BenchmarkRun]) -> str:
+    """Markdown table of agents ranked by total latency."""
+    stats = agent_breakdown(runs)
+    total_ms = sum(agent["duration_ms"] for agent in stats.values()) or 1
+    report = ["# Agent Breakdown\n", f"Runs: {len(runs)}\n"]
+    report.append("| Agent | Calls | Avg Duration | Share of Agent Time | Avg Tokens | Models | Failures |")
+    report.append("|-------|-------|--------------|---------------------|------------|--------|----------|")
+    for name, agent in sorted(stats.items(), key=lambda item: item[1]["duration_ms"], reverse=True):
+        models = ", ".join(f"{model} {count}" for model, count in sorted(agent["models"].items()))
+        report.append(
+            f"| {name} | {agent['calls']} | {agent['duration_ms'] / agent['calls']:.0f}ms "
+            f"| {agent['duration_ms'] / total_ms * 100:.1f}% | {agent['tokens'] / agent['calls']:.0f} "
+            f"| {models} | {agent['failures']} |"
+        )
+    return "\n".join(report)
+
+
+# === Routing score ===
+
+# Agent name -> phase of a think run, for the latency split
+ROUTING_PHASES = {
+    "think-classifier": "classification",
+    "think-orchestrator": "orchestration",
+    "think-synthesizer": "synthesis",
+    "think-validator": "validation",
+    "think-clr-validator": "validation",
+}
+CALIBRATION_BINS = (0.0, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def agent_phase(agent_name: str) -> Optional[str]:
+    """Phase an agent call belongs to; None for the main chain."""
+    if agent_name in PSEUDO_AGENTS:
+        return None
+    if agent_name.startswith(MODEL_AGENT_PREFIX):
+        return "model execution"
+    return ROUTING_PHASES.get(agent_name, "other")
+
+
+@dataclass
+class RoutingScore:
+    """How well runs were routed compared with test_cases.json expectations."""
+    runs: int
+    classification_accuracy: float
+    format_valid: float           # Runs whose classifier output could be parsed
+    # expected type -> {"precision", "recall", "support"}
+    per_type: Dict[str, Dict[str, float]]
+    model_precision: float        # Mean share of selected models that were expected
+    model_recall: float           # Mean share of expected models that were selected
+    confidence_met: float         # Runs whose classifier confidence >= expected_confidence_min
+    # (bin label, runs, mean confidence, accuracy)
+    calibration: List[tuple[str, int, float, float]]
+    expected_calibration_error: float
+    brier: float
+    phase_ms: Dict[str, float]    # Mean agent time per run by phase
+    # classifier model tier -> {"runs", "accuracy", "classification_ms"}
+    by_classifier_tier: Dict[str, Dict[str, float]]
+
+
+def score_routing(runs: List[BenchmarkRun], cases: Dict[str, TestCase]) -> RoutingScore:
+    """Score successful runs of known test cases against their expectations."""
+    scored = [(run, cases[run.test_id]) for run in runs if not run.error and run.test_id in cases]
+    n = len(scored) or 1
+
+    correct = [run.classified_type == case.expected_primary_type for run, case in scored]
+    per_type = {}
+    for expected in sorted({case.expected_primary_type for _, case in scored}
+                           | {run.classified_type for run, _ in scored if run.classified_type}):
+        tp = sum(1 for run, case in scored if run.classified_type == expected == case.expected_primary_type)
+        predicted = sum(1 for run, _ in scored if run.classified_type == expected)
+        support = sum(1 for _, case in scored if case.expected_primary_type == expected)
+        per_type[expected] = {
+            "precision": tp / predicted if predicted else 0.0,
+            "recall": tp / support if support else 0.0,
+            "support": support,
+        }
+
+    precisions, recalls = [], []
+    for run, case in scored:
+        hits = len(set(run.selected_models) & set(case.expected_models))
+        precisions.append(hits / len(run.selected_models) if run.selected_models else 0.0)
+        recalls.append(hits / len(case.expected_models) if case.expected_models else 1.0)
+
+    confident = [(run.classifier_confidence, ok) for (run, _), ok in zip(scored, correct)
+                 if run.classifier_confidence is not None]
+    calibration = []
+    ece = 0.0
+    for low, high in zip(CALIBRATION_BINS, CALIBRATION_BINS[1:]):
+        members = [(conf, ok) for conf, ok in confident if low <= conf < high or (high == 1.0 and conf == 1.0)]
+        if members:
+            mean_conf = sum(conf for conf, _ in members) / len(members)
+            accuracy = sum(ok for _, ok in members) / len(members)
+            calibration.append((f"{low:.1f}-{high:.1f}", len(members), mean_conf, accuracy))
+            ece += len(members) / len(confident) * abs(accuracy - mean_conf)
+
+    phase_ms: Dict[str, float] = {}
+    tiers: Dict[str, Dict[str, float]] = {}
+    for (run, _), ok in zip(scored, correct):
+        classifier_ms = 0
+        tier = None
+        for call in run.agent_calls:
+            phase = agent_phase(call.agent_name)
+            if phase is not None:
+                phase_ms[phase] = phase_ms.get(phase, 0) + call.duration_ms / n
+            if phase == "classification":
+                classifier_ms += call.duration_ms
+                tier = tier or call.model
+        if tier is not None:
+            bucket = tiers.setdefault(tier, {"runs": 0, "accuracy": 0.0, "classification_ms": 0.0})
+            bucket["runs"] += 1
+            bucket["accuracy"] += ok
+            bucket["classification_ms"] += classifier_ms
+    for bucket in tiers.values():
+        bucket["accuracy"] /= bucket["runs"]
+        bucket["classification_ms"] /= bucket["runs"]
+
+    return RoutingScore(
+        runs=len(scored),
+        classification_accuracy=sum(correct) / n,
+        format_valid=sum(1 for run, _ in scored if run.classified_type) / n,
+        per_type=per_type,
+        model_precision=sum(precisions) / n,
+        model_recall=sum(recalls) / n,
+        confidence_met=sum(1 for run, case in scored if run.classifier_confidence is not None
+                           and run.classifier_confidence >= case.expected_confidence_min) / n,
+        calibration=calibration,
+        expected_calibration_error=ece,
+        brier=sum((conf - ok) ** 2 for conf, ok in confident) / len(confident) if confident else 0.0,
+        phase_ms=dict(sorted(phase_ms.items(), key=lambda item: item[1], reverse=True)),
+        by_classifier_tier=tiers,
+    )
+
+
+def success_criteria(score: RoutingScore, protocol: Dict) -> List[tuple[str, float, float, bool]]:
+    """(criterion, target, actual, passed) for benchmark_protocol.success_criteria."""
+    actuals = {
+        "classification_accuracy": score.classification_accuracy,
+        "model_selection_accuracy": score.model_recall,
+        "confidence_threshold_met": score.confidence_met,
+        "output_format_valid": score.format_valid,
+    }
+    return [(name, target, actuals[name], actuals[name] >= target)
+            for name, target in protocol.get("success_criteria", {}).items() if name in actuals]
+
+
+def create_routing_report(score: RoutingScore, criteria: List[tuple[str, float, float, bool]]) -> str:
+    """Markdown report of routing accuracy, calibration and latency."""
+    report = ["# Routing Score\n", f"Scored runs: {score.runs}\n"]
+
+    report.append("\n## Success Criteria\n")
+    report.append("| Criterion | Target | Actual | Status |")
+    report.append("|-----------|--------|--------|--------|")
+    for name, target, actual, passed in criteria:
+        report.append(f"| {name} | {target * 100:.0f}% | {actual * 100:.1f}% | {'PASS' if passed else 'FAIL'} |")
+
+    report.append("\n## Classification by Problem Type\n")
+    report.append("| Type | Support | Precision | Recall |")
+    report.append("|------|---------|-----------|--------|")
+    for problem_type, stats in score.per_type.items():
+        report.append(f"| {problem_type} | {stats['support']} | {stats['precision'] * 100:.1f}% "
+                      f"| {stats['recall'] * 100:.1f}% |")
+    report.append(f"\nModel selection: precision {score.model_precision * 100:.1f}%, "
+                  f"recall {score.model_recall * 100:.1f}%")
+
+    report.append("\n## Confidence Calibration\n")
+    report.append("| Confidence | Runs | Mean Confidence | Accuracy |")
+    report.append("|------------|------|-----------------|----------|")
+    for label, count, mean_conf, accuracy in score.calibration:
+        report.append(f"| {label} | {count} | {mean_conf:.2f} | {accuracy * 100:.1f}% |")
+    report.append(f"\nExpected calibration error {score.expected_calibration_error:.3f}, Brier score {score.brier:.3f}")
+
+    report.append("\n## Latency by Phase\n")
+    total_ms = sum(score.phase_ms.values()) or 1
+    report.append("| Phase | Avg per Run | Share of Agent Time |")
+    report.append("|-------|-------------|---------------------|")
+    for phase, ms in score.phase_ms.items():
+        report.append(f"| {phase} | {ms:.0f}ms | {ms / total_ms * 100:.1f}% |")
+
+    report.append("\n## Classifier Tier\n")
+    report.append("| Tier | Runs | Accuracy | Avg Classification Time |")
+    report.append("|------|------|----------|-------------------------|")
+    for tier, stats in sorted(score.by_classifier_tier.items()):
+        report.append(f"| {tier} | {stats['runs']} | {stats['accuracy'] * 100:.1f}% "
+                      f"| {stats['classification_ms']:.0f}ms |")
+    return "\n".join(report)
+
+
+# === Timeline ===
+
+@dataclass
+class PhaseTiming:
+    """Agent calls of one phase within a run."""
+    calls: int = 0
+    serial_ms: int = 0   # Sum of call durations
+    wall_ms: int = 0     # Union of call intervals
+    longest_ms: int = 0  # Longest single call: the phase's wall time if fully fanned out
+
+
+@dataclass
+class Timeline:
+    """When each agent call of a run started and ended, and how much overlapped."""
+    run: BenchmarkRun
+    intervals: List[tuple[AgentCall, int, int]]  # (call, start, end) in ms from run start
+    serial_ms: int                  # Sum of call durations
+    wall_ms: int                    # Time with at least one call running
+    max_concurrency: int
+    critical_path: List[AgentCall]  # Longest chain of calls that ran one after another
+    critical_path_ms: int
+    phases: Dict[str, PhaseTiming]
+
+    @property
+    def achieved_speedup(self) -> float:
+        """Serial agent time over the wall time it actually took."""
+        return self.serial_ms / self.wall_ms if self.wall_ms else 1.0
+
+    @property
+    def theoretical_speedup(self) -> float:
+        """Speedup if every phase fanned out fully while phases stayed in order."""
+        bound = sum(phase.longest_ms for phase in self.phases.values())
+        return self.serial_ms / bound if bound else 1.0
+
+
+def _union_ms(intervals: List[tuple[int, int]]) -> int:
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def build_timeline(run: BenchmarkRun) -> Timeline:
+    """Timeline of a run's agent calls that have a recorded start (main chain excluded)."""
+    intervals = sorted(
+        ((call, call.start_offset_ms, call.start_offset_ms + call.duration_ms) for call in run.agent_calls
+         if call.start_offset_ms is not None and agent_phase(call.agent_name) is not None),
+        key=lambda interval: (interval[1], interval[2]),
+    )
+
+    # Longest chain where each call starts after the previous one ended
+    by_end = sorted(range(len(intervals)), key=lambda i: intervals[i][2])
+    chain_ms = [0] * len(intervals)
+    previous: List[Optional[int]] = [None] * len(intervals)
+    for i in by_end:
+        _, start, end = intervals[i]
+        for j in by_end:
+            if intervals[j][2] > start:
+                break
+            if chain_ms[j] > chain_ms[i]:
+                chain_ms[i], previous[i] = chain_ms[j], j
+        chain_ms[i] += end - start
+    path = []
+    index = max(range(len(intervals)), key=chain_ms.__getitem__) if intervals else None
+    while index is not None:
+        path.append(intervals[index][0])
+        index = previous[index]
+
+    events = sorted([(start, 1) for _, start, _ in intervals] + [(end, -1) for _, _, end in intervals])
+    running = max_concurrency = 0
+    for _, step in events:
+        running += step
+        max_concurrency = max(max_concurrency, running)
+
+    phases: Dict[str, PhaseTiming] = {}
+    spans: Dict[str, List[tuple[int, int]]] = {}
+    for call, start, end in intervals:
+        phase = phases.setdefault(agent_phase(call.agent_name), PhaseTiming())
+        phase.calls += 1
+        phase.serial_ms += end - start
+        phase.longest_ms = max(phase.longest_ms, end - start)
+        spans.setdefault(agent_phase(call.agent_name), []).append((start, end))
+    for name, phase in phases.items():
+        phase.wall_ms = _union_ms(spans[name])
+
+    return Timeline(
+        run=run,
+        intervals=intervals,
+        serial_ms=sum(end - start for _, start, end in intervals),
+        wall_ms=_union_ms([(start, end) for _, start, end in intervals]),
+        max_concurrency=max_concurrency,
+        critical_path=path[::-1],
+        critical_path_ms=max(chain_ms, default=0),
+        phases=phases,
+    )
+
+
+def chrome_trace(timelines: List[Timeline]) -> Dict:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto): one process per run, one thread per lane."""
+    events = []
+    for pid, timeline in enumerate(timelines, 1):
+        events.append({"name": "process_name", "ph": "M", "pid": pid,
+                       "args": {"name": f"{timeline.run.run_id} ({timeline.run.command or 'run'})"}})
+        lane_ends: List[int] = []
+        for call, start, end in timeline.intervals:
+            lane = next((i for i, lane_end in enumerate(lane_ends) if lane_end <= start), len(lane_ends))
+            if lane == len(lane_ends):
+                lane_ends.append(end)
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": lane,
+                               "args": {"name": f"lane {lane}"}})
+            lane_ends[lane] = end
+            events.append({
+                "name": call.agent_name, "cat": agent_phase(call.agent_name), "ph": "X",
+                "ts": start * 1000, "dur": (end - start) * 1000, "pid": pid, "tid": lane,
+                "args": {"model": call.model, "success": call.success,
+                         "tokens": call.input_tokens + call.output_tokens + call.cache_tokens},
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def create_timeline_report(timelines: List[Timeline]) -> str:
+    """Markdown summary of achieved vs theoretical parallelism, worst runs first."""
+    report = ["# Execution Timeline\n", f"Runs with call timings: {len(timelines)}\n"]
+    report.append("| Run | Command | Calls | Serial | Wall | Max Concurrency | Critical Path | Achieved | Theoretical |")
+    report.append("|-----|---------|-------|--------|------|-----------------|---------------|----------|-------------|")
+    ranked = sorted(timelines, key=lambda t: t.theoretical_speedup - t.achieved_speedup, reverse=True)
+    for timeline in ranked:
+        report.append(
+            f"| {timeline.run.run_id} | {timeline.run.command} | {len(timeline.intervals)} "
+            f"| {timeline.serial_ms}ms | {timeline.wall_ms}ms | {timeline.max_concurrency} "
+            f"| {timeline.critical_path_ms}ms ({len(timeline.critical_path)} calls) "
+            f"| {timeline.achieved_speedup:.2f}x | {timeline.theoretical_speedup:.2f}x |"
+        )
+
+    # Phases that ran several calls but got little overlap out of them
+    totals: Dict[tuple[str, str], PhaseTiming] = {}
+    for timeline in timelines:
+        for name, phase in timeline.phases.items():
+            total = totals.setdefault((timeline.run.command, name), PhaseTiming())
+            total.calls += phase.calls
+            total.serial_ms += phase.serial_ms
+            total.wall_ms += phase.wall_ms
+            total.longest_ms += phase.longest_ms
+    report.append("\n## Fan-out by Phase\n")
+    report.append("Achieved is serial time over wall time; possible assumes every call of the phase ran at once.\n")
+    report.append("| Command | Phase | Calls | Serial | Wall | Achieved | Possible |")
+    report.append("|---------|-------|-------|--------|------|----------|----------|")
+    for (command, name), total in sorted(totals.items(), key=lambda item: item[1].wall_ms - item[1].longest_ms,
+                                         reverse=True):
+        report.append(
+            f"| {command} | {name} | {total.calls} | {total.serial_ms}ms | {total.wall_ms}ms "
+            f"| {total.serial_ms / total.wall_ms if total.wall_ms else 1:.2f}x "
+            f"| {total.serial_ms / total.longest_ms if total.longest_ms else 1:.2f}x |"
+        )
+    return "\n".join(report)
+
+
+def main():
+    global PRICING
+    parser = argparse.ArgumentParser(
+        description='Think plugin benchmark harness',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Executors:
+    stub     Deterministic synthetic runs (offline, no Claude calls)
+    replay   Re-parse transcripts from --replay-dir ({test_id}-{version}-{n}.jsonl or {test_id}.jsonl)
+    command  Run --command per case; stdout (stream-json) is saved as the transcript
+
+Examples:
+    %(prog)s --baseline --executor stub
+    %(prog)s --v2 --executor command --workers 4
+    %(prog)s --v2 --executor replay --replay-dir results/transcripts
+    %(prog)s --replay ~/.claude/projects/my-project --workers 8
+    %(prog)s --agents replay_20250101-120000-000000
+    %(prog)s --compare
+    %(prog)s --compare v1.0_20250101-120000-000000 v2.0_20250101-130000-000000
+    %(prog)s --compare results/v1.0.json results/v2.0.json
+    %(prog)s --history --problem-type diagnosis
+    %(prog)s --score v2.0_20250101-130000-000000
+    %(prog)s --timeline v2.0_20250101-130000-000000 --think-command swarm
+    %(prog)s --import results/v1.0_20250101-120000.json
+    %(prog)s --compare --threshold 5    # Exit 1 if v2.0 regresses by more than 5%
+        """
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--baseline', action='store_true', help='Measure v1.0')
+    mode.add_argument('--v2', action='store_true', help='Measure v2.0')
+    mode.add_argument('--compare', nargs='*', metavar='RESULTS',
+                      help='Compare v1.0 and v2.0 results: two batch ids or JSON files (default: latest batch of each)')
+    mode.add_argument('--agents', metavar='RESULTS',
+                      help='Per-agent latency/token breakdown of a batch id or JSON results file')
+    mode.add_argument('--score', metavar='RESULTS',
+                      help='Routing accuracy, calibration and phase latency of a batch id or JSON results file')
+    mode.add_argument('--timeline', metavar='RESULTS',
+                      help='Agent call timeline and parallelism of a batch id or JSON results file, '
+                           'exported as a Chrome trace')
+    mode.add_argument('--history', action='store_true',
+                      help='Per-batch averages across releases (narrow with --think-command, --problem-type, --only)')
+    mode.add_argument('--import', nargs='+', type=Path, dest='import_files', metavar='RESULTS',
+                      help='Append JSON results files to the store, one batch per file')
+    mode.add_argument('--replay', type=Path, metavar='DIR',
+                      help='Reconstruct runs from every recorded *.jsonl transcript under DIR')
+    parser.add_argument('--executor', choices=['stub', 'replay', 'command'], default='stub')
+    parser.add_argument('--command', default=DEFAULT_COMMAND, dest='command_template',
+                        help='Command template for the command executor (default: %(default)s)')
+    parser.add_argument('--think-command',
+                        help='Think command under test (consider, assess, debate, swarm; default: consider)')
+    parser.add_argument('--replay-dir', type=Path, default=RESULTS_DIR / 'transcripts',
+                        help='Transcript directory for the replay executor')
+    parser.add_argument('--cases', type=Path, default=TEST_CASES_PATH, help='Test cases file')
+    parser.add_argument('--only', help='Comma-separated test ids to run')
+    parser.add_argument('--problem-type', help='Problem type filter for --history')
+    parser.add_argument('--runs', type=int, help='Runs per test (default: benchmark_protocol.runs_per_test)')
+    parser.add_argument('--warmup', type=int, help='Warmup runs per test (default: benchmark_protocol.warmup_runs)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent runs (processes for --replay)')
+    parser.add_argument('--version-label',
+                        help='Version for --replay runs whose file name has none (default: replay)')
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR, help='Where results are saved')
+    parser.add_argument('--db', type=Path, help=f'Results store (default: RESULTS_DIR/{RESULTS_DB_NAME})')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD_PCT,
+                        help='--compare fails (exit 1) when v2.0 is slower/costlier by more than this %% (default: %(default)s)')
+    parser.add_argument('--bootstrap', type=int, default=BOOTSTRAP_RESAMPLES,
+                        help='Bootstrap resamples for confidence intervals')
+    parser.add_argument('--seed', type=int, default=0, help='Bootstrap random seed')
+    parser.add_argument('--trace-out', type=Path,
+                        help='Chrome trace file for --timeline (default: RESULTS_DIR/trace_<RESULTS>.json)')
+    parser.add_argument('--pricing-version', help=f'Version from {PRICING_PATH.name} used for cost (default: {PRICING.version})')
+    args = parser.parse_args()
+    if args.pricing_version:
+        try:
+            PRICING = load_pricing(version=args.pricing_version)
+        except ValueError as e:
+            parser.error(str(e))
+    # Opened only by the modes that read or append batches
+    store_path = args.db or args.results_dir / RESULTS_DB_NAME
+
+    if args.compare is not None:
+        if len(args.compare) not in (0, 2):
+            parser.error('--compare takes no results or exactly two (v1.0 and v2.0)')
+        refs = args.compare
+        if not refs:
+            refs = [None, None]
+            if store_path.exists():
+                with ResultsStore(store_path) as store:
+                    refs = [store.latest_batch(v) for v in ("v1.0", "v2.0")]
+        if not all(refs):
+            print(f"ERROR: Need v1.0 and v2.0 results in {store_path}", file=sys.stderr)
+            sys.exit(2)
+        try:
+            v1_runs, v2_runs = load_runs(refs[0], store_path), load_runs(refs[1], store_path)
+        except FileNotFoundError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(2)
+        cases = {case.id: case for case in load_test_cases(args.cases)[0]}
+        comparison = compare_runs(v1_runs, v2_runs, cases, args.threshold, args.bootstrap, args.seed)
+        report = create_comparison_report(v1_runs, v2_runs, cases, comparison)
+        args.results_dir.mkdir(parents=True, exist_ok=True)
+        report_path = args.results_dir / f"benchmark_report_{datetime.now():%Y%m%d-%H%M%S}.md"
+        report_path.write_text(report + "\n")
+        print(report)
+        print(f"\nReport written to {report_path}", file=sys.stderr)
+        for regression in comparison.regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if comparison.regressions else 0)
+
+    if args.agents is not None:
+        try:
+            print(create_agent_report(load_runs(args.agents, store_path)))
+        except FileNotFoundError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(2)
+        return
+
+    if args.score is not None:
+        try:
+            runs = load_runs(args.score, store_path)
+        except FileNotFoundError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(2)
+        cases, protocol = load_test_cases(args.cases)
+        score = score_routing(runs, {case.id: case for case in cases})
+        criteria = success_criteria(score, protocol)
+        print(create_routing_report(score, criteria))
+        sys.exit(0 if score.runs and all(passed for *_, passed in criteria) else 1)
+
+    if args.timeline is not None:
+        try:
+            runs = load_runs(args.timeline, store_path)
+        except FileNotFoundError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(2)
+        if args.think_command:
+            runs = [run for run in runs if run.command == args.think_command]
+        timelines = [timeline for timeline in map(build_timeline, runs) if timeline.intervals]
+        if not timelines:
+            print("ERROR: No runs with agent call start times (replay or re-run to record them)", file=sys.stderr)
+            sys.exit(2)
+        print(create_timeline_report(timelines))
+        ref = Path(args.timeline)
+        trace_path = args.trace_out or args.results_dir / f"trace_{ref.stem if ref.suffix == '.json' else ref.name}.json"
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace_path.write_text(json.dumps(chrome_trace(timelines)))
+        print(f"\nChrome trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)", file=sys.stderr)
+        return
+
+    if args.history:
+        trend = None
+        if store_path.exists():
+            with ResultsStore(store_path) as store:
+                trend = store.trend(args.think_command, args.problem_type,
+                                    args.only.split(',') if args.only else None)
+        if not trend:
+            print(f"No matching runs in {store_path}", file=sys.stderr)
+            sys.exit(2)
+        print(create_trend_report(trend))
+        return
+
+    if args.import_files:
+        with ResultsStore(store_path) as store:
+            for path in args.import_files:
+                runs = load_results(path)
+                store.append(runs, path.stem)
+                print(f"Imported {len(runs)} runs from {path} as batch {path.stem}")
+        return
+
+    cases, protocol = load_test_cases(args.cases)
+
+    if args.replay is not None:
+        if not args.replay.is_dir():
+            print(f"ERROR: Not a directory: {args.replay}", file=sys.stderr)
+            sys.exit(2)
+        started = time.monotonic()
+        runs = replay_directory(args.replay, {case.id: case for case in cases}, args.version_label, args.workers)
+        elapsed = time.monotonic() - started
+        if not runs:
+            print(f"ERROR: No transcripts found in {args.replay}", file=sys.stderr)
+            sys.exit(2)
+
+        batch = f"{args.version_label or 'replay'}_{datetime.now():%Y%m%d-%H%M%S-%f}"
+        with ResultsStore(store_path) as store:
+            store.append(runs, batch)
+        calls = sum(call.agent_name not in PSEUDO_AGENTS for run in runs for call in run.agent_calls)
+        print(f"Replayed {len(runs)} transcripts ({calls} agent calls, "
+              f"{sum(run.parallel_batches for run in runs)} parallel batches) in {elapsed:.1f}s")
+        print(f"Results appended to {store_path} as batch {batch}")
+        return
+
+    version = VERSIONS["baseline" if args.baseline else "v2"]
+    if args.only:
+        wanted = set(args.only.split(','))
+        cases = [case for case in cases if case.id in wanted]
+    if not cases:
+        print("ERROR: No test cases selected", file=sys.stderr)
+        sys.exit(2)
+
+    if args.executor == 'stub':
+        executor = StubExecutor()
+    elif args.executor == 'replay':
+        executor = ReplayExecutor(args.replay_dir)
+    else:
+        try:
+            executor = CommandExecutor(args.command_template, args.results_dir / 'transcripts')
+        except ValueError as e:
+            parser.error(str(e))
+
+    runs_per_test = args.runs if args.runs is not None else protocol.get("runs_per_test", 1)
+    warmup_runs = args.warmup if args.warmup is not None else protocol.get("warmup_runs", 0)
+    timeout_s = protocol.get("timeout_ms", 300000) / 1000
+
+    started = time.monotonic()
+    runs = run_suite(cases, executor, version, args.think_command or "consider", runs_per_test, warmup_runs,
+                     args.workers, timeout_s)
+    elapsed = time.monotonic() - started
+
+    batch = f"{version}_{datetime.now():%Y%m%d-%H%M%S-%f}"
+    with ResultsStore(store_path) as store:
+        store.append(runs, batch)
+
+    failed = [run for run in runs if run.error]
+    print(f"{version}: {len(runs) - len(failed)}/{len(runs)} runs succeeded "
+          f"({len(cases)} cases x {runs_per_test}, {executor.name} executor, {elapsed:.1f}s)")
+    for run in failed:
+        print(f"  FAILED {run.run_id}: {run.error}", file=sys.stderr)
+    print(f"Results appended to {store_path} as batch {batch}")
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
-    print("Think Plugin Benchmark Harness")
-    print("Usage: python harness.py [--baseline|--v2|--compare]")
-    print("\nThis script provides utilities for parsing transcripts and calculating metrics.")
-    print("Run benchmark tests via the run_benchmarks.md command file.")
+    main()
@@ -8,22 +8,34 @@ Performs mechanical validation of ADR collections:
 - Template section presence
 - Review date staleness
 - README index synchronization
+- Cross-collection references across a workspace (--recursive)
 
 Outputs structured JSON for agent consumption.
 
 Usage:
     python adr-audit.py /path/to/adr/directory
-    python adr-audit.py /path/to/adr/directory --fix-dates  # Auto-update stale review dates
+    python adr-audit.py /path/to/adr/directory --fix-readme  # Regenerate README index tables
+    python adr-audit.py /path/to/workspace --recursive       # Every ADR collection under a root
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
 
 
 # === Configuration ===
@@ -50,23 +62,131 @@ OPTIONAL_SECTIONS = [
 VALID_STATUSES = ['Proposed', 'Accepted', 'Deprecated', 'Superseded']
 VALID_DOMAINS = ['Architecture', 'Data', 'Security', 'Performance', 'Testing', 'Integration', 'UI/UX', 'Infrastructure']
 
-# Cross-reference patterns
-XREF_PATTERN = re.compile(r'ADR-(\d{3})', re.IGNORECASE)
-SUPERSEDES_PATTERN = re.compile(r'[Ss]upersedes\s+ADR-(\d{3})')
-SUPERSEDED_BY_PATTERN = re.compile(r'[Ss]uperseded\s+by\s+ADR-(\d{3})')
-EXTENDS_PATTERN = re.compile(r'[Ee]xtends\s+ADR-(\d{3})')
-EXTENDED_BY_PATTERN = re.compile(r'[Ee]xtended\s+by\s+ADR-(\d{3})')
-RELATED_TO_PATTERN = re.compile(r'[Rr]elated\s+to\s+ADR-(\d{3})')
-CONFLICTS_WITH_PATTERN = re.compile(r'[Cc]onflicts\s+with\s+ADR-(\d{3})')
+# Single-pass ADR scanner: one alternation walks each document once.
+# Metadata values, headings and bold text are captured in lookaheads so the
+# scan resumes inside them and still sees the references they contain
+# (e.g. "**Status**: Superseded by ADR-003"). Every alternative starts with
+# a plain character class, which lets the engine reject most positions on
+# the first character instead of trying each branch.
+METADATA_TOKENS = (
+    r'^#[ \t]+(?=(?P<title>[^\n]*))',             # "# ADR-001: Title" (first H1)
+    r'[Ss](?i:tatus\*?\*?\s*[:\|]\s*(?=(?P<status>\w+(?:\s+by\s+ADR-\d{3})?)))',
+    # Consumes only "Review " so "Date: ..." is also scanned as the date field
+    r'[Rr](?i:eview\s*(?=date\*?\*?\s*[:\|]\s*(?P<review_date>\d{4}-\d{2}-\d{2})))',
+    r'[Dd](?i:ate\*?\*?\s*[:\|]\s*(?=(?P<date>\d{4}-\d{2}-\d{2})))',
+    r'[Dd](?i:omain\*?\*?\s*[:\|]\s*(?=(?P<domain>\w+(?:/\w+)?)))',
+)
+SECTION_TOKENS = (
+    r'^#{2,3}\s*(?=(?P<heading>[^\n]*))',       # ## Section / ### Section
+    r'\*\*(?=(?P<bold>[^*\n]+)\*\*)',            # **Section**
+)
+# Typed relations are case-sensitive apart from the first letter
+RELATION_TOKENS = (
+    r'(?P<relation>[Ss]upersedes|[Ss]uperseded\s+by|[Ee]xtends|[Ee]xtended\s+by'
+    r'|[Rr]elated\s+to|[Cc]onflicts\s+with)\s+ADR-(?P<target>\d{3})',
+    r'[Aa](?i:dr-)(?P<ref>\d{3})',
+)
+# First characters of all of the above
+SCANNER_LEAD = '[*#SsRrDdEeCcAa]'
+ADR_SCANNER = re.compile(
+    f'(?={SCANNER_LEAD})(?:' + '|'.join(METADATA_TOKENS + SECTION_TOKENS + RELATION_TOKENS) + ')',
+    re.MULTILINE,
+)
+
+METADATA_FIELDS = ('title', 'status', 'date', 'review_date', 'domain')
+TITLE_PREFIX = re.compile(r'^ADR-\d{3}\s*[:\-\u2013\u2014]?\s*', re.IGNORECASE)
+# First word of a typed relation -> xref kind
+RELATION_KINDS = {
+    'supersedes': 'supersedes',
+    'superseded': 'superseded_by',
+    'extends': 'extends',
+    'extended': 'extended_by',
+    'related': 'related_to',
+    'conflicts': 'conflicts_with',
+}
+
+# Scanner event kinds
+METADATA_EVENT = 'metadata'
+SECTION_EVENT = 'section'
+XREF_EVENT = 'xref'
+
+# README indices: key -> name used in issues and generated headings
+README_INDICES = {
+    'complete_index': 'Complete Index',
+    'quick_reference': 'Quick Reference',
+    'domain_index': 'Domain Index',
+    'keywords_index': 'Keywords Index',
+}
+# A heading containing one of these starts that index's section (first match
+# wins); tables under any other heading belong to the complete index
+README_INDEX_KEYWORDS = [
+    ('quick reference', 'quick_reference'),
+    ('domain', 'domain_index'),
+    ('keyword', 'keywords_index'),
+    ('complete', 'complete_index'),
+]
+README_HEADING = re.compile(r'^(#{1,6})\s+(.*?)[\s#]*$')
+README_SEPARATOR = re.compile(r'^\|?(?:\s*:?-+:?\s*\|)*\s*:?-+:?\s*\|?$')
+README_ADR_NUMBER = re.compile(r'(?<!\d)(\d{3})(?!\d)')
+README_ADR_COLUMNS = {'adr', 'adrs', '#', 'no', 'no.', 'number', 'id'}
+# Columns for a complete index appended by --fix-readme when the README has none
+README_DEFAULT_COLUMNS = ['ADR', 'Title', 'Status', 'Date']
+
+# Per-file extraction cache (stored in the ADR directory)
+CACHE_FILE = '.adr-audit-cache'
+CACHE_VERSION = 5
+# Below this many changed ADRs, parsing inline beats starting worker processes
+PARALLEL_THRESHOLD = 32
+
+XREF_KINDS = ['all', 'supersedes', 'superseded_by', 'extends', 'extended_by', 'related_to', 'conflicts_with',
+              'external']
+
+# "service-a/ADR-012" or "../service-a/docs/adr/adr-012-x.md": a reference
+# into another collection, kept in xrefs['external'] as "service-a/012". The
+# path in front of the ADR is read backwards past generic directory names
+# (which is also how collections are named). It stays a local reference when
+# - it is generic back to its start or to "."/".." ("docs/ADR-004", "../adr/adr-004-x.md")
+# - it names an ADR itself ("ADR-001/ADR-003")
+# - it is part of a URL ("https://host/.../docs/adr/adr-003-x.md")
+# - it is a file path (lower-case adr-NNN) that doesn't climb out with ".." ("src/adr-004.md")
+QUALIFIER_PATTERN = re.compile(r'(?:[\w.-]+/)+$')
+QUALIFIER_MAX_LENGTH = 256
+QUALIFIER_ADR_PART = re.compile(r'(?i:adr-)\d{3}')
+# "[ADR-004](../service-a/docs/adr/adr-004-x.md)": the link text defers to
+# the link target when the target itself names an ADR
+LINKED_ADR_TARGET = re.compile(r'[^\[\]\n]*\]\([^)\s]*?(?i:adr-)\d{3}')
+GENERIC_DIR_NAMES = {'adr', 'adrs', 'doc', 'docs', 'decisions', 'architecture'}
+
+# --recursive: directories never searched for ADR collections
+SKIP_DIRS = {'node_modules', '__pycache__', 'venv', 'dist', 'build'}
+
+# Graph relation -> (xref kind declared by the source, xref kind declared by the target).
+# An edge exists when either side declares it; related/conflicts are symmetric.
+RELATIONS = {
+    'supersedes': ('supersedes', 'superseded_by'),
+    'extends': ('extends', 'extended_by'),
+    'related': ('related_to', 'related_to'),
+    'conflicts': ('conflicts_with', 'conflicts_with'),
+}
+SYMMETRIC_RELATIONS = {'related', 'conflicts'}
+
+# Back-reference rules: (xref kind, kind the target must declare back, issue type, relationship, fix phrase).
+# Any mention of the source counts as reciprocating "Related to".
+BACKREF_RULES = [
+    ('supersedes', 'superseded_by', 'missing_backref', 'supersedes', 'Superseded by'),
+    ('superseded_by', 'supersedes', 'missing_backref', 'superseded_by', 'Supersedes'),
+    ('extends', 'extended_by', 'missing_backref', 'extends', 'Extended by'),
+    ('related_to', 'all', 'missing_reciprocal', 'related_to', 'Related to'),
+    ('conflicts_with', 'conflicts_with', 'missing_reciprocal', 'conflicts_with', 'Conflicts with'),
+]
 
-# Metadata patterns
-STATUS_PATTERN = re.compile(r'\*?\*?Status\*?\*?\s*[:\|]\s*(\w+(?:\s+by\s+ADR-\d{3})?)', re.IGNORECASE)
-DATE_PATTERN = re.compile(r'\*?\*?Date\*?\*?\s*[:\|]\s*(\d{4}-\d{2}-\d{2})', re.IGNORECASE)
-REVIEW_DATE_PATTERN = re.compile(r'\*?\*?Review\s*Date\*?\*?\s*[:\|]\s*(\d{4}-\d{2}-\d{2})', re.IGNORECASE)
-DOMAIN_PATTERN = re.compile(r'\*?\*?Domain\*?\*?\s*[:\|]\s*(\w+(?:/\w+)?)', re.IGNORECASE)
+QUERY_KINDS = ['neighbors', 'chain', 'effective', 'cycles']
 
-# README table patterns
-README_TABLE_ROW = re.compile(r'\|\s*(?:ADR-)?(\d{3})\s*\|')
+# --watch: AuditResult lists diffed between audits
+ISSUE_CATEGORIES = ['naming_violations', 'missing_sections', 'xref_issues',
+                    'stale_reviews', 'metadata_issues', 'readme_sync']
+WATCH_POLL_SECONDS = 1.0   # Polling fallback when inotify_simple is not installed
+WATCH_DEBOUNCE_MS = 100    # Gather an editor's burst of events into one re-audit
 
 
 # === Data Classes ===
@@ -89,8 +209,8 @@ class MissingSection:
 class XRefIssue:
     from_adr: str
     to_adr: str
-    issue_type: str  # 'missing_backref', 'broken_ref', 'missing_reciprocal'
-    relationship: str  # 'supersedes', 'extends', 'related', 'conflicts'
+    issue_type: str  # 'missing_backref', 'broken_ref', 'missing_reciprocal', 'unknown_collection'
+    relationship: str  # 'supersedes', 'extends', 'related', 'conflicts', 'cross_collection'
     suggested_fix: Optional[str] = None
 
 
@@ -121,6 +241,68 @@ class ReadmeSyncIssue:
     details: Optional[str] = None
 
 
+class AdrEvent(NamedTuple):
+    """One token from the ADR scanner."""
+    kind: str   # METADATA_EVENT, SECTION_EVENT or XREF_EVENT
+    name: str   # Metadata field, 'heading'/'bold', or xref kind ('all' for a bare reference)
+    value: str  # Field value, heading text, or referenced ADR number
+
+
+@dataclass
+class AdrSummary:
+    """Everything the audit needs from one ADR file (cached per file)."""
+    number: str
+    file: str
+    metadata: dict
+    xrefs: dict[str, set[str]]
+    missing_sections: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ReadmeTable:
+    """One Markdown table in the ADR README."""
+    index: str                  # Key of README_INDICES
+    heading: str                # Nearest heading above the table
+    start: int                  # Index of the table's first line in ReadmeDocument.lines
+    end: int                    # Index after its last line
+    columns: list[str]          # Lowercased header cells ([] without a header row)
+    rows: list[list[str]] = field(default_factory=list)
+
+    def column(self, name: str) -> Optional[int]:
+        """First column whose header contains name."""
+        return next((i for i, column in enumerate(self.columns) if name in column), None)
+
+    @property
+    def adr_column(self) -> int:
+        return next((i for i, column in enumerate(self.columns)
+                     if column in README_ADR_COLUMNS or column.startswith('adr')), 0)
+
+    def row_numbers(self, row: list[str]) -> list[str]:
+        """ADR numbers in a row's ADR cell, in order."""
+        cell = row[self.adr_column] if self.adr_column < len(row) else ''
+        return list(dict.fromkeys(README_ADR_NUMBER.findall(cell)))
+
+    def numbers(self) -> set[str]:
+        return {num for row in self.rows for num in self.row_numbers(row)}
+
+
+@dataclass
+class ReadmeDocument:
+    """The ADR README split into lines, with every table located and parsed."""
+    lines: list[str]
+    tables: list[ReadmeTable] = field(default_factory=list)
+
+    def tables_for(self, index: str) -> list[ReadmeTable]:
+        return [table for table in self.tables if table.index == index]
+
+    def indices(self) -> dict[str, set[str]]:
+        """ADR numbers listed in each index."""
+        indices = {index: set() for index in README_INDICES}
+        for table in self.tables:
+            indices[table.index] |= table.numbers()
+        return indices
+
+
 @dataclass
 class AuditResult:
     directory: str
@@ -134,6 +316,29 @@ class AuditResult:
     metadata_issues: list[MetadataIssue] = field(default_factory=list)
     readme_sync: list[ReadmeSyncIssue] = field(default_factory=list)
     number_gaps: list[str] = field(default_factory=list)  # Informational only
+    # {'from', 'to'} references into other collections; resolved only by --recursive
+    external_refs: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class CollectionReport:
+    """One collection's audit within a --recursive run (built in a worker process)."""
+    name: str                 # Directory relative to the workspace root
+    alias: Optional[str]      # Name other collections qualify references with; None if ambiguous
+    result: AuditResult
+    numbers: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)            # load_ms, check_ms, total_ms
+
+
+@dataclass
+class WorkspaceResult:
+    root: str
+    scan_date: str
+    collections: list[CollectionReport] = field(default_factory=list)
+    cross_refs: list[dict] = field(default_factory=list)  # {'from', 'to', 'resolved'}
+    cross_ref_issues: list[XRefIssue] = field(default_factory=list)
+    total_issues: int = 0
+    timings: dict[str, float] = field(default_factory=dict)           # discover_ms, audit_ms, total_ms
 
 
 # === Core Functions ===
@@ -232,45 +437,112 @@ def suggest_filename_fix(filename: str) -> Optional[str]:
     return f'adr-{num}-{title}.md'
 
 
-def extract_metadata(content: str) -> dict:
-    """Extract metadata fields from ADR content."""
-    metadata = {
-        'status': None,
-        'date': None,
-        'review_date': None,
-        'domain': None,
-    }
+def nearest_named_dir(parts: Iterable[str]) -> Optional[str]:
+    """The last path component that isn't a generic ADR directory name; "." and ".." end the search."""
+    for part in reversed(list(parts)):
+        if part in ('.', '..'):
+            return None
+        if part.lower() not in GENERIC_DIR_NAMES:
+            return part
+    return None
+
+
+def _ref_qualifier(content: str, start: int) -> Optional[str]:
+    """The collection named by the path in front of the ADR reference at start, if any."""
+    if not start or content[start - 1] != '/':
+        return None
+    window = max(0, start - QUALIFIER_MAX_LENGTH)
+    match = QUALIFIER_PATTERN.search(content, window, start)
+    if match is None:
+        return None
+    # A path running past the window, or continuing a URL ("://") or another token, is not a qualifier
+    path_start = match.start()
+    if path_start > 0 and not content[path_start - 1].isspace() and content[path_start - 1] not in '([<"\'`*_':
+        return None
+    parts = [part for part in match.group().split('/') if part]
+    if any(QUALIFIER_ADR_PART.match(part) for part in parts):
+        return None
+    if not content.startswith('ADR-', start) and '..' not in parts:
+        return None
+    return nearest_named_dir(parts)
+
+
+def scan_adr(content: str) -> Iterator[AdrEvent]:
+    """Walk ADR content once, yielding metadata, section and cross-reference events."""
+    for match in ADR_SCANNER.finditer(content):
+        # Each alternative ends in exactly one named group, so lastgroup says which matched
+        name = match.lastgroup
+        value = match.group(name)
+        if name == 'ref':
+            if LINKED_ADR_TARGET.match(content, match.end()):
+                continue
+            qualifier = _ref_qualifier(content, match.start())
+            if qualifier:
+                yield AdrEvent(XREF_EVENT, 'external', f'{qualifier}/{value}')
+            else:
+                yield AdrEvent(XREF_EVENT, 'all', value)
+        elif name == 'target':
+            yield AdrEvent(XREF_EVENT, RELATION_KINDS[match.group('relation').split(None, 1)[0].lower()], value)
+        elif name in ('heading', 'bold'):
+            yield AdrEvent(SECTION_EVENT, name, value)
+        else:
+            yield AdrEvent(METADATA_EVENT, name, value)
+
 
-    status_match = STATUS_PATTERN.search(content)
-    if status_match:
-        metadata['status'] = status_match.group(1).strip()
+def parse_adr(content: str) -> tuple[dict, dict[str, set[str]], list[str]]:
+    """
+    Fold one scan of ADR content into (metadata, xrefs, missing sections).
+
+    Metadata keeps the first value of each field (the title without its
+    "ADR-NNN:" prefix). Typed references also count towards xrefs['all'];
+    references into other collections ("service-a/ADR-012", or a path
+    such as "../service-a/docs/adr/adr-012-x.md") only go to
+    xrefs['external']. A required section is present when a ## or ###
+    heading starts with its name, or **Name** appears in bold
+    (case-insensitive), so "Context" matches "## Context and Problem Statement".
+    """
+    metadata = dict.fromkeys(METADATA_FIELDS)
+    xrefs = {kind: set() for kind in XREF_KINDS}
+    sections = [section.lower() for section in REQUIRED_SECTIONS]
+    present = set()
+
+    for kind, name, value in scan_adr(content):
+        if kind == XREF_EVENT:
+            if name == 'external':
+                xrefs['external'].add(value)
+                continue
+            xrefs['all'].add(value)
+            if name != 'all':
+                xrefs[name].add(value)
+        elif kind == SECTION_EVENT:
+            text = value.lower()
+            if name == 'heading':
+                present.update(section for section in sections if text.startswith(section))
+            elif text in sections:
+                present.add(text)
+        elif metadata[name] is None:
+            metadata[name] = value.strip()
+
+    if metadata['title']:
+        metadata['title'] = TITLE_PREFIX.sub('', metadata['title']) or None
+
+    missing = [section for section, lowered in zip(REQUIRED_SECTIONS, sections) if lowered not in present]
+    return metadata, xrefs, missing
 
-    date_match = DATE_PATTERN.search(content)
-    if date_match:
-        metadata['date'] = date_match.group(1)
 
-    review_match = REVIEW_DATE_PATTERN.search(content)
-    if review_match:
-        metadata['review_date'] = review_match.group(1)
+def extract_metadata(content: str) -> dict:
+    """Extract metadata fields from ADR content."""
+    return parse_adr(content)[0]
 
-    domain_match = DOMAIN_PATTERN.search(content)
-    if domain_match:
-        metadata['domain'] = domain_match.group(1).strip()
 
-    return metadata
+def find_missing_sections(content: str) -> list[str]:
+    """Return the required sections absent from ADR content."""
+    return parse_adr(content)[2]
 
 
 def check_sections(content: str, filename: str, adr_number: str) -> Optional[MissingSection]:
     """Check for required sections in ADR content."""
-    missing = []
-
-    for section in REQUIRED_SECTIONS:
-        # Look for ## Section, ### Section, or **Section**
-        # Also handles "Context and Problem Statement" matching "Context"
-        pattern = rf'(?:^##\s*{re.escape(section)}|^###\s*{re.escape(section)}|\*\*{re.escape(section)}\*\*)'
-        if not re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
-            missing.append(section)
-
+    missing = find_missing_sections(content)
     if missing:
         return MissingSection(file=filename, adr_number=adr_number, missing=missing)
     return None
@@ -278,54 +550,212 @@ def check_sections(content: str, filename: str, adr_number: str) -> Optional[Mis
 
 def extract_xrefs(content: str) -> dict:
     """Extract all cross-references and their types from content."""
-    xrefs = {
-        'all': set(),
-        'supersedes': set(),
-        'superseded_by': set(),
-        'extends': set(),
-        'extended_by': set(),
-        'related_to': set(),
-        'conflicts_with': set(),
-    }
-
-    # Get all ADR references
-    for match in XREF_PATTERN.finditer(content):
-        xrefs['all'].add(match.group(1))
-
-    # Get typed references
-    for match in SUPERSEDES_PATTERN.finditer(content):
-        xrefs['supersedes'].add(match.group(1))
-
-    for match in SUPERSEDED_BY_PATTERN.finditer(content):
-        xrefs['superseded_by'].add(match.group(1))
+    return parse_adr(content)[1]
 
-    for match in EXTENDS_PATTERN.finditer(content):
-        xrefs['extends'].add(match.group(1))
 
-    for match in EXTENDED_BY_PATTERN.finditer(content):
-        xrefs['extended_by'].add(match.group(1))
+# === Relationship Graph ===
 
-    for match in RELATED_TO_PATTERN.finditer(content):
-        xrefs['related_to'].add(match.group(1))
-
-    for match in CONFLICTS_WITH_PATTERN.finditer(content):
-        xrefs['conflicts_with'].add(match.group(1))
-
-    return xrefs
+@dataclass
+class AdrGraph:
+    """
+    Typed relationships between the ADRs of one collection, built once per audit.
 
+    forward[relation][a] holds the ADRs a points at (a supersedes / extends /
+    relates to / conflicts with them), reverse[relation][b] the ADRs pointing
+    at b. declared[a] is a's own xrefs, for checking which side states an edge.
+    Only edges between existing ADRs are kept.
+    """
+    nodes: set[str]
+    declared: dict[str, dict[str, set[str]]]
+    forward: dict[str, dict[str, set[str]]] = field(default_factory=dict)
+    reverse: dict[str, dict[str, set[str]]] = field(default_factory=dict)
+
+    mentioned_by: dict[str, set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_summaries(cls, summaries: dict[str, AdrSummary]) -> 'AdrGraph':
+        graph = cls(nodes=set(summaries), declared={num: summary.xrefs for num, summary in summaries.items()})
+        for relation in RELATIONS:
+            graph.forward[relation] = {}
+            graph.reverse[relation] = {}
+        for num, xrefs in graph.declared.items():
+            for ref in xrefs['all']:
+                graph.mentioned_by.setdefault(ref, set()).add(num)
+            graph._link(num)
+        return graph
+
+    def _link(self, num: str, touching: Optional[str] = None) -> None:
+        """Add the edges num declares (only those involving touching, if given)."""
+        xrefs = self.declared[num]
+        for relation, (source_kind, target_kind) in RELATIONS.items():
+            edges = [(num, ref) for ref in xrefs[source_kind]] + [(ref, num) for ref in xrefs[target_kind]]
+            if relation in SYMMETRIC_RELATIONS:
+                edges += [(b, a) for a, b in edges]
+            forward = self.forward[relation]
+            reverse = self.reverse[relation]
+            for a, b in edges:
+                if a in self.nodes and b in self.nodes and touching in (None, a, b):
+                    forward.setdefault(a, set()).add(b)
+                    reverse.setdefault(b, set()).add(a)
+
+    def update(self, num: str, xrefs: Optional[dict[str, set[str]]]) -> None:
+        """
+        Replace one ADR's declared references (None removes the ADR).
 
-def validate_xrefs(adr_contents: dict[str, tuple[str, dict]]) -> list[XRefIssue]:
+        Only edges involving num can change, so they are dropped and re-added
+        from num's new declarations and those of the ADRs that mention it.
+        """
+        old = self.declared.pop(num, None)
+        if old is not None:
+            for ref in old['all']:
+                self.mentioned_by.get(ref, set()).discard(num)
+        for relation in RELATIONS:
+            forward = self.forward[relation]
+            reverse = self.reverse[relation]
+            for b in forward.pop(num, ()):
+                reverse.get(b, set()).discard(num)
+            for a in reverse.pop(num, ()):
+                forward.get(a, set()).discard(num)
+
+        if xrefs is None:
+            self.nodes.discard(num)
+            return
+        self.nodes.add(num)
+        self.declared[num] = xrefs
+        for ref in xrefs['all']:
+            self.mentioned_by.setdefault(ref, set()).add(num)
+        self._link(num)
+        for other in self.mentioned_by.get(num, set()) - {num}:
+            self._link(other, touching=num)
+
+    def has_edge(self, relation: str, a: str, b: str) -> bool:
+        return b in self.forward[relation].get(a, ())
+
+    def declares(self, num: str, kind: str, ref: str) -> bool:
+        """Whether ADR num itself mentions ref as the given xref kind."""
+        return ref in self.declared[num][kind]
+
+    def successors(self, num: str) -> set[str]:
+        """ADRs that directly supersede num."""
+        return self.reverse['supersedes'].get(num, set())
+
+    def neighbors(self, num: str) -> dict[str, dict[str, list[str]]]:
+        """{relation: {'out': [...], 'in': [...]}} for every relation num takes part in."""
+        result = {}
+        for relation in RELATIONS:
+            out = sorted(self.forward[relation].get(num, ()))
+            incoming = sorted(self.reverse[relation].get(num, ()))
+            if out or incoming:
+                result[relation] = {'out': out, 'in': incoming}
+        return result
+
+    def supersession_chain(self, num: str) -> list[str]:
+        """num followed by each ADR that superseded the previous one (lowest number on forks)."""
+        chain = [num]
+        seen = {num}
+        while True:
+            nxt = sorted(self.successors(chain[-1]) - seen)
+            if not nxt:
+                return chain
+            chain.append(nxt[0])
+            seen.add(nxt[0])
+
+    def effective_decisions(self, num: str) -> list[str]:
+        """
+        The ADRs currently in force in place of num: the unsuperseded ends of
+        every supersession path from num (num itself if nothing supersedes it).
+        Empty when every path runs into a cycle.
+        """
+        effective = set()
+        seen = {num}
+        stack = [num]
+        while stack:
+            current = stack.pop()
+            successors = self.successors(current)
+            if not successors:
+                effective.add(current)
+            for nxt in successors - seen:
+                seen.add(nxt)
+                stack.append(nxt)
+        return sorted(effective)
+
+    def supersession_cycles(self) -> list[list[str]]:
+        """Groups of ADRs that (transitively) supersede each other, sorted."""
+        edges = self.forward['supersedes']
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        cycles = []
+        counter = 0
+
+        # Iterative Tarjan's strongly connected components
+        for root in sorted(self.nodes):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(edges.get(root, ()))))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(edges.get(child, ())))))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in edges.get(node, ()):
+                        cycles.append(sorted(component))
+
+        return sorted(cycles)
+
+
+def query_graph(graph: AdrGraph, kind: str, num: Optional[str] = None):
+    """Answer one --query against the graph; num is a bare ADR number."""
+    if kind == 'cycles':
+        return [[f'ADR-{n}' for n in cycle] for cycle in graph.supersession_cycles()]
+    if kind == 'neighbors':
+        return {relation: {side: [f'ADR-{n}' for n in refs] for side, refs in sides.items()}
+                for relation, sides in graph.neighbors(num).items()}
+    if kind == 'chain':
+        return [f'ADR-{n}' for n in graph.supersession_chain(num)]
+    if kind == 'effective':
+        return [f'ADR-{n}' for n in graph.effective_decisions(num)]
+    raise ValueError(f'Unknown query: {kind}')
+
+
+def validate_xrefs(summaries: dict[str, AdrSummary], graph: Optional[AdrGraph] = None) -> list[XRefIssue]:
     """
-    Validate cross-references are bidirectional.
-    adr_contents: {number: (content, xrefs)}
+    Validate cross-references are bidirectional and supersession is acyclic.
+    summaries: {number: AdrSummary}
     """
+    graph = graph or AdrGraph.from_summaries(summaries)
     issues = []
-    existing_numbers = set(adr_contents.keys())
 
-    for num, (content, xrefs) in adr_contents.items():
+    for num, summary in summaries.items():
+        xrefs = summary.xrefs
         # Check for broken references (to non-existent ADRs)
         for ref in xrefs['all']:
-            if ref not in existing_numbers and ref != '000':  # 000 is template
+            if ref not in graph.nodes and ref != '000':  # 000 is template
                 issues.append(XRefIssue(
                     from_adr=f'ADR-{num}',
                     to_adr=f'ADR-{ref}',
@@ -334,81 +764,42 @@ def validate_xrefs(adr_contents: dict[str, tuple[str, dict]]) -> list[XRefIssue]
                     suggested_fix=f'Remove reference to non-existent ADR-{ref}'
                 ))
 
-        # Check bidirectionality: supersedes/superseded_by
-        for ref in xrefs['supersedes']:
-            if ref in existing_numbers:
-                other_xrefs = adr_contents[ref][1]
-                if num not in other_xrefs['superseded_by']:
-                    issues.append(XRefIssue(
-                        from_adr=f'ADR-{num}',
-                        to_adr=f'ADR-{ref}',
-                        issue_type='missing_backref',
-                        relationship='supersedes',
-                        suggested_fix=f'Add "Superseded by ADR-{num}" to ADR-{ref}'
-                    ))
-
-        for ref in xrefs['superseded_by']:
-            if ref in existing_numbers:
-                other_xrefs = adr_contents[ref][1]
-                if num not in other_xrefs['supersedes']:
-                    issues.append(XRefIssue(
-                        from_adr=f'ADR-{num}',
-                        to_adr=f'ADR-{ref}',
-                        issue_type='missing_backref',
-                        relationship='superseded_by',
-                        suggested_fix=f'Add "Supersedes ADR-{num}" to ADR-{ref}'
-                    ))
-
-        # Check bidirectionality: extends/extended_by
-        for ref in xrefs['extends']:
-            if ref in existing_numbers:
-                other_xrefs = adr_contents[ref][1]
-                if num not in other_xrefs['extended_by']:
-                    issues.append(XRefIssue(
-                        from_adr=f'ADR-{num}',
-                        to_adr=f'ADR-{ref}',
-                        issue_type='missing_backref',
-                        relationship='extends',
-                        suggested_fix=f'Add "Extended by ADR-{num}" to ADR-{ref}'
-                    ))
-
-        # Check bidirectionality: related_to (symmetric)
-        for ref in xrefs['related_to']:
-            if ref in existing_numbers:
-                other_xrefs = adr_contents[ref][1]
-                if num not in other_xrefs['related_to'] and num not in other_xrefs['all']:
+        # Check bidirectionality: the target must state the reverse relation
+        for kind, back_kind, issue_type, relationship, phrase in BACKREF_RULES:
+            for ref in xrefs[kind]:
+                if ref in graph.nodes and not graph.declares(ref, back_kind, num):
                     issues.append(XRefIssue(
                         from_adr=f'ADR-{num}',
                         to_adr=f'ADR-{ref}',
-                        issue_type='missing_reciprocal',
-                        relationship='related_to',
-                        suggested_fix=f'Add "Related to ADR-{num}" to ADR-{ref}'
+                        issue_type=issue_type,
+                        relationship=relationship,
+                        suggested_fix=f'Add "{phrase} ADR-{num}" to ADR-{ref}'
                     ))
 
-        # Check bidirectionality: conflicts_with (symmetric)
-        for ref in xrefs['conflicts_with']:
-            if ref in existing_numbers:
-                other_xrefs = adr_contents[ref][1]
-                if num not in other_xrefs['conflicts_with']:
-                    issues.append(XRefIssue(
-                        from_adr=f'ADR-{num}',
-                        to_adr=f'ADR-{ref}',
-                        issue_type='missing_reciprocal',
-                        relationship='conflicts_with',
-                        suggested_fix=f'Add "Conflicts with ADR-{num}" to ADR-{ref}'
-                    ))
+    for cycle in graph.supersession_cycles():
+        names = [f'ADR-{n}' for n in cycle]
+        if len(names) == 1:
+            fix = f'Remove "Supersedes {names[0]}" from {names[0]}'
+        else:
+            fix = f'Break the supersession cycle between {", ".join(names)}'
+        issues.append(XRefIssue(
+            from_adr=names[0],
+            to_adr=names[-1],
+            issue_type='supersession_cycle',
+            relationship='supersedes',
+            suggested_fix=fix
+        ))
 
     return issues
 
 
-def check_review_dates(adr_contents: dict[str, tuple[str, dict]], adr_paths: dict[str, Path]) -> list[StaleReview]:
+def check_review_dates(summaries: dict[str, AdrSummary]) -> list[StaleReview]:
     """Check for stale review dates."""
     stale = []
     today = datetime.now().date()
 
-    for num, (content, xrefs) in adr_contents.items():
-        metadata = extract_metadata(content)
-        review_date_str = metadata.get('review_date')
+    for num, summary in summaries.items():
+        review_date_str = summary.metadata.get('review_date')
 
         if review_date_str:
             try:
@@ -417,7 +808,7 @@ def check_review_dates(adr_contents: dict[str, tuple[str, dict]], adr_paths: dic
                     days_overdue = (today - review_date).days
                     new_date = today + timedelta(days=180)  # 6 months
                     stale.append(StaleReview(
-                        file=adr_paths[num].name,
+                        file=summary.file,
                         adr_number=f'ADR-{num}',
                         review_date=review_date_str,
                         days_overdue=days_overdue,
@@ -429,13 +820,13 @@ def check_review_dates(adr_contents: dict[str, tuple[str, dict]], adr_paths: dic
     return stale
 
 
-def check_metadata(adr_contents: dict[str, tuple[str, dict]], adr_paths: dict[str, Path]) -> list[MetadataIssue]:
+def check_metadata(summaries: dict[str, AdrSummary]) -> list[MetadataIssue]:
     """Check metadata completeness and validity."""
     issues = []
 
-    for num, (content, xrefs) in adr_contents.items():
-        metadata = extract_metadata(content)
-        filename = adr_paths[num].name
+    for num, summary in summaries.items():
+        metadata = summary.metadata
+        filename = summary.file
 
         # Check status
         if not metadata['status']:
@@ -490,34 +881,92 @@ def check_metadata(adr_contents: dict[str, tuple[str, dict]], adr_paths: dict[st
     return issues
 
 
-def parse_readme_indices(readme_path: Path) -> dict[str, set[str]]:
-    """Parse README.md to extract ADR numbers from indices."""
-    indices = {
-        'complete_index': set(),
-        'quick_reference': set(),
-        'domain_index': set(),
-        'keywords_index': set(),
-    }
+def _split_row(line: str) -> list[str]:
+    """Cells of a Markdown table row (escaped pipes stay inside their cell)."""
+    cells = re.split(r'(?<!\\)\|', line.strip())
+    if cells and not cells[0].strip():
+        cells = cells[1:]
+    if cells and not cells[-1].strip():
+        cells = cells[:-1]
+    return [cell.strip() for cell in cells]
 
-    if not readme_path.exists():
-        return indices
 
-    content = readme_path.read_text()
+def _parse_table(block: list[tuple[int, str]], index: str, heading: str) -> ReadmeTable:
+    """Build a table from its (line number, text) lines; a separator on line two marks a header."""
+    texts = [text for _, text in block]
+    if len(texts) > 1 and README_SEPARATOR.match(texts[1]):
+        columns, rows = [cell.lower() for cell in _split_row(texts[0])], texts[2:]
+    else:
+        columns, rows = [], texts
+    return ReadmeTable(index=index, heading=heading, start=block[0][0], end=block[-1][0] + 1,
+                       columns=columns, rows=[_split_row(row) for row in rows])
+
 
-    # Find all ADR numbers mentioned in tables
-    for match in README_TABLE_ROW.finditer(content):
-        num = match.group(1)
-        indices['complete_index'].add(num)
+def parse_readme(lines: Iterable[str]) -> ReadmeDocument:
+    """
+    Split a README into index sections by heading and parse each table once.
+
+    A heading matching README_INDEX_KEYWORDS starts that index; a deeper
+    heading inside it (e.g. "### Security" under "## Domain Index") only
+    names the tables below it; any other heading falls back to the
+    complete index. Fenced code blocks are skipped.
+    """
+    document = ReadmeDocument(lines=list(lines))
+    section_level, index, heading = 0, 'complete_index', ''
+    block = []  # (line number, text) of the table being read
+    in_fence = False
+
+    for number, line in enumerate(document.lines):
+        stripped = line.strip()
+        if not in_fence and stripped.startswith('|'):
+            block.append((number, stripped))
+            continue
+        if block:
+            document.tables.append(_parse_table(block, index, heading))
+            block = []
+
+        if stripped.startswith(('```', '~~~')):
+            in_fence = not in_fence
+        match = README_HEADING.match(stripped) if not in_fence else None
+        if not match:
+            continue
+        level, text = len(match.group(1)), match.group(2)
+        matched = next((key for keyword, key in README_INDEX_KEYWORDS if keyword in text.lower()), None)
+        if matched:
+            section_level, index = level, matched
+        elif level <= section_level or index == 'complete_index':
+            section_level, index = level, 'complete_index'
+        heading = text
+
+    if block:
+        document.tables.append(_parse_table(block, index, heading))
+    return document
+
+
+def parse_readme_indices(readme_path: Path) -> dict[str, set[str]]:
+    """Parse README.md to extract the ADR numbers listed in each index."""
+    if not readme_path.exists():
+        return ReadmeDocument(lines=[]).indices()
+    with open(readme_path, encoding='utf-8') as f:
+        return parse_readme(f).indices()
 
-    # For simplicity, we just collect all mentioned ADR numbers
-    # A more sophisticated parser would identify specific sections
 
-    return indices
+def _first_word(value: str) -> str:
+    """'Superseded by ADR-010' and '**Superseded**' compare equal."""
+    match = re.search(r'[A-Za-z]+', value)
+    return match.group(0).lower() if match else ''
 
 
 def check_readme_sync(readme_path: Path, valid_adrs: dict[str, Path],
-                      adr_contents: dict[str, tuple[str, dict]]) -> list[ReadmeSyncIssue]:
-    """Check README indices are synchronized with actual ADR files."""
+                      summaries: dict[str, AdrSummary],
+                      readme: Optional[ReadmeDocument] = None) -> list[ReadmeSyncIssue]:
+    """
+    Check each README index against the ADR files (readme: pre-parsed README).
+
+    The complete index must list every ADR; the domain index (when present)
+    every ADR that has a domain, under that domain. No index may list a
+    missing ADR, and Status/Domain columns must agree with the ADR itself.
+    """
     issues = []
 
     if not readme_path.exists():
@@ -529,12 +978,14 @@ def check_readme_sync(readme_path: Path, valid_adrs: dict[str, Path],
         ))
         return issues
 
-    indices = parse_readme_indices(readme_path)
-    indexed_numbers = indices['complete_index']
+    if readme is None:
+        with open(readme_path, encoding='utf-8') as f:
+            readme = parse_readme(f)
+    indices = readme.indices()
     actual_numbers = set(valid_adrs.keys())
 
-    # Check for ADRs missing from index
-    missing_from_index = actual_numbers - indexed_numbers
+    # Check for ADRs missing from the complete index
+    missing_from_index = actual_numbers - indices['complete_index']
     for num in sorted(missing_from_index):
         issues.append(ReadmeSyncIssue(
             index_name='Complete Index',
@@ -543,19 +994,186 @@ def check_readme_sync(readme_path: Path, valid_adrs: dict[str, Path],
             details=f'{valid_adrs[num].name} not in README index'
         ))
 
-    # Check for extra entries in index (ADRs that don't exist)
-    extra_in_index = indexed_numbers - actual_numbers - {'000'}  # 000 is template
-    for num in sorted(extra_in_index):
-        issues.append(ReadmeSyncIssue(
-            index_name='Complete Index',
-            issue_type='extra_in_index',
-            adr_number=f'ADR-{num}',
-            details=f'ADR-{num} in README but file not found'
-        ))
+    # Check for extra entries in any index (ADRs that don't exist)
+    for index, name in README_INDICES.items():
+        extra_in_index = indices[index] - actual_numbers - {'000'}  # 000 is template
+        for num in sorted(extra_in_index):
+            issues.append(ReadmeSyncIssue(
+                index_name=name,
+                issue_type='extra_in_index',
+                adr_number=f'ADR-{num}',
+                details=f'ADR-{num} in README but file not found' if index == 'complete_index'
+                else f'ADR-{num} in {name} but file not found'
+            ))
+
+    # Domain index: every ADR with a domain, listed under it (by column or sub-heading)
+    domain_tables = readme.tables_for('domain_index')
+    if domain_tables:
+        listed = {}  # number -> domains it is listed under
+        for table in domain_tables:
+            column = table.column('domain')
+            for row in table.rows:
+                domain = row[column] if column is not None and column < len(row) else table.heading
+                for num in table.row_numbers(row):
+                    listed.setdefault(num, set()).add(domain.lower())
+        for num in sorted(actual_numbers):
+            domain = summaries[num].metadata['domain'] if num in summaries else None
+            if not domain:
+                continue
+            if num not in listed:
+                issues.append(ReadmeSyncIssue(
+                    index_name='Domain Index',
+                    issue_type='missing_from_index',
+                    adr_number=f'ADR-{num}',
+                    details=f'{valid_adrs[num].name} ({domain}) not in Domain Index'
+                ))
+            elif domain.lower() not in listed[num]:
+                issues.append(ReadmeSyncIssue(
+                    index_name='Domain Index',
+                    issue_type='domain_mismatch',
+                    adr_number=f'ADR-{num}',
+                    details=f'Listed under {", ".join(sorted(listed[num]))}; ADR domain is {domain}'
+                ))
+
+    # Status columns in any index
+    for table in readme.tables:
+        column = table.column('status')
+        if column is None:
+            continue
+        for row in table.rows:
+            cell = row[column] if column < len(row) else ''
+            for num in table.row_numbers(row):
+                status = summaries[num].metadata['status'] if num in summaries else None
+                if cell and status and _first_word(cell) != _first_word(status):
+                    issues.append(ReadmeSyncIssue(
+                        index_name=README_INDICES[table.index],
+                        issue_type='status_mismatch',
+                        adr_number=f'ADR-{num}',
+                        details=f'README says "{cell}"; ADR status is "{status}"'
+                    ))
 
     return issues
 
 
+def _adr_cell(template: str, num: str, filename: str) -> str:
+    """Render an ADR cell in the style of an existing one ("[001](adr-001-x.md)", "ADR-001", ...)."""
+    label = f'ADR-{num}' if template.lstrip('[').upper().startswith('ADR-') else num
+    return f'[{label}]({filename})' if '](' in template else label
+
+
+def _render_row(table: ReadmeTable, num: str, summary: AdrSummary, template: str,
+                previous: Optional[list[str]] = None) -> str:
+    """One index row for an ADR: known columns from its metadata, others kept from its previous row."""
+    metadata = summary.metadata
+    cells = []
+    for i, column in enumerate(table.columns):
+        old = previous[i] if previous and i < len(previous) else ''
+        if i == table.adr_column:
+            cells.append(_adr_cell(template, num, summary.file))
+        elif 'title' in column:
+            cells.append(metadata.get('title') or old)
+        elif 'status' in column:
+            cells.append(metadata['status'] or old)
+        elif 'review' in column:
+            cells.append(metadata['review_date'] or old)
+        elif 'date' in column:
+            cells.append(metadata['date'] or old)
+        elif 'domain' in column:
+            cells.append(metadata['domain'] or old)
+        else:
+            cells.append(old)
+    return '| ' + ' | '.join(cells) + ' |\n'
+
+
+def regenerate_readme(readme: ReadmeDocument, summaries: dict[str, AdrSummary]) -> str:
+    """
+    Rewrite the README's index tables in place from the ADRs.
+
+    The first complete index table and domain tables are rebuilt (every
+    ADR, or every ADR of the table's domain); other index tables keep
+    their rows minus missing ADRs. Known columns (ADR, title, status,
+    dates, domain) are refreshed and other cells kept. Header rows and
+    all text outside tables are left untouched. A complete index is
+    appended when the README has none.
+    """
+    lines = list(readme.lines)
+    domains = {(summary.metadata['domain'] or '').lower() for summary in summaries.values()} - {''}
+    complete_done = False
+    # ADR cell style for tables without rows: borrowed from the first populated index table
+    default_template = next((t.rows[0][t.adr_column] for t in readme.tables
+                             if t.columns and t.rows and t.adr_column < len(t.rows[0]) and t.row_numbers(t.rows[0])),
+                            '[0](x)')
+
+    # Replace from the bottom so earlier line numbers stay valid
+    for table in sorted(readme.tables, key=lambda t: t.start, reverse=True):
+        if not table.columns or not (table.numbers() or table.column('adr') is not None):
+            continue
+        previous = {}
+        for row in table.rows:
+            for num in table.row_numbers(row):
+                previous.setdefault(num, row)
+        template = (table.rows[0][table.adr_column] if table.rows and table.adr_column < len(table.rows[0])
+                    else default_template)
+        domain_column = table.column('domain')
+
+        if table.index == 'complete_index' and table is readme.tables_for('complete_index')[0]:
+            numbers = sorted(summaries)
+            complete_done = True
+        elif table.index == 'domain_index' and domain_column is not None:
+            numbers = sorted(num for num, summary in summaries.items() if summary.metadata['domain'])
+        elif table.index == 'domain_index' and table.heading.lower() in domains:
+            numbers = sorted(num for num, summary in summaries.items()
+                             if (summary.metadata['domain'] or '').lower() == table.heading.lower())
+        else:
+            numbers = None
+
+        body = []
+        if numbers is not None:
+            body = [_render_row(table, num, summaries[num], template, previous.get(num)) for num in numbers]
+        else:
+            for row in table.rows:
+                row_numbers = table.row_numbers(row)
+                if any(num not in summaries for num in row_numbers):
+                    kept = [part for part in row[table.adr_column].split(',')
+                            if all(num in summaries for num in README_ADR_NUMBER.findall(part))]
+                    if not any(README_ADR_NUMBER.search(part) for part in kept):
+                        continue
+                    row = row[:table.adr_column] + [','.join(kept).strip()] + row[table.adr_column + 1:]
+                    body.append('| ' + ' | '.join(row) + ' |\n')
+                elif len(row_numbers) == 1:
+                    body.append(_render_row(table, row_numbers[0], summaries[row_numbers[0]], template, row))
+                else:
+                    body.append('| ' + ' | '.join(row) + ' |\n')
+
+        header = [line if line.endswith('\n') else line + '\n' for line in lines[table.start:table.start + 2]]
+        lines[table.start:table.end] = header + body
+
+    if not complete_done:
+        table = ReadmeTable(index='complete_index', heading=README_INDICES['complete_index'], start=0, end=0,
+                            columns=[column.lower() for column in README_DEFAULT_COLUMNS])
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'
+        if not lines:
+            lines = ['# Architecture Decision Records\n']
+        lines += [
+            '\n', f'## {README_INDICES["complete_index"]}\n', '\n',
+            '| ' + ' | '.join(README_DEFAULT_COLUMNS) + ' |\n',
+            '|' + '|'.join('-' * (len(column) + 2) for column in README_DEFAULT_COLUMNS) + '|\n',
+        ]
+        lines += [_render_row(table, num, summaries[num], default_template) for num in sorted(summaries)]
+
+    return ''.join(lines)
+
+
+def write_readme(readme_path: Path, content: str) -> None:
+    """Atomically replace the README."""
+    fd, tmp = tempfile.mkstemp(dir=readme_path.parent, prefix=readme_path.name, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, readme_path)
+
+
 def find_number_gaps(valid_adrs: dict[str, Path]) -> list[str]:
     """Find gaps in ADR numbering (informational only)."""
     if not valid_adrs:
@@ -573,62 +1191,443 @@ def find_number_gaps(valid_adrs: dict[str, Path]) -> list[str]:
     return gaps
 
 
-def run_audit(adr_dir: Path) -> AuditResult:
-    """Run full audit on ADR directory."""
-    # Find all markdown files
-    all_files = list(adr_dir.glob('*.md'))
-    adr_files = [f for f in all_files if f.name.startswith('adr-')]
+def summarize_adr(path: Path, number: str, known_hash: Optional[str] = None) -> tuple[str, Optional[AdrSummary]]:
+    """
+    Read and extract one ADR. Returns (content hash, summary).
+
+    The summary is None when the content hash equals known_hash, i.e. the
+    file was touched but not changed and the cached summary still holds.
+    Module-level so it can run in a worker process.
+    """
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == known_hash:
+        return digest, None
+
+    metadata, xrefs, missing_sections = parse_adr(data.decode('utf-8'))
+    return digest, AdrSummary(
+        number=number,
+        file=path.name,
+        metadata=metadata,
+        xrefs=xrefs,
+        missing_sections=missing_sections,
+    )
+
+
+def _cache_key() -> list:
+    """Anything that changes what extraction produces invalidates the cache."""
+    return [CACHE_VERSION, REQUIRED_SECTIONS]
+
 
-    # Validate naming
-    naming_violations, valid_adrs = validate_naming(adr_files)
+def load_cache(adr_dir: Path) -> dict:
+    """Load cached per-file entries ({filename: entry}); empty if absent or stale."""
+    try:
+        data = json.loads((adr_dir / CACHE_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('key') != _cache_key():
+        return {}
+    return data.get('files', {})
+
+
+def save_cache(adr_dir: Path, entries: dict) -> None:
+    """Atomically write the cache; an unwritable directory just means no cache."""
+    try:
+        fd, tmp = tempfile.mkstemp(dir=adr_dir, prefix=CACHE_FILE, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': _cache_key(), 'files': entries}, f)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, adr_dir / CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _summary_to_entry(summary: AdrSummary) -> dict:
+    entry = asdict(summary)
+    entry['xrefs'] = {kind: sorted(refs) for kind, refs in summary.xrefs.items()}
+    return entry
+
+
+def _summary_from_entry(entry: dict) -> AdrSummary:
+    return AdrSummary(
+        number=entry['number'],
+        file=entry['file'],
+        metadata=entry['metadata'],
+        xrefs={kind: set(entry['xrefs'].get(kind, ())) for kind in XREF_KINDS},
+        missing_sections=entry['missing_sections'],
+    )
+
+
+def load_summaries(adr_dir: Path, valid_adrs: dict[str, Path], use_cache: bool = True,
+                   workers: Optional[int] = None) -> tuple[dict[str, AdrSummary], int]:
+    """
+    Summarize every valid ADR, re-parsing only files that changed.
+
+    A file is reused from the cache when its mtime and size match; when
+    they don't, its content hash is compared before re-parsing. Changed
+    files are parsed on a process pool once there are enough of them.
+    Returns ({number: AdrSummary}, number of files re-parsed).
+    """
+    cached = load_cache(adr_dir) if use_cache else {}
+    entries = {}
+    summaries = {}
+    pending = []  # (number, path, stat, known hash)
 
-    # Read valid ADR contents and extract cross-refs
-    adr_contents = {}  # {number: (content, xrefs)}
     for num, path in valid_adrs.items():
-        content = path.read_text()
-        xrefs = extract_xrefs(content)
-        adr_contents[num] = (content, xrefs)
+        stat = path.stat()
+        entry = cached.get(path.name)
+        if entry and entry['number'] == num and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            entries[path.name] = entry
+            summaries[num] = _summary_from_entry(entry['summary'])
+        else:
+            pending.append((num, path, stat, entry['sha256'] if entry and entry['number'] == num else None))
+
+    if len(pending) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(summarize_adr, *zip(*[(path, num, known) for num, path, _, known in pending]),
+                                    chunksize=8))
+    else:
+        results = [summarize_adr(path, num, known) for num, path, _, known in pending]
+
+    reparsed = 0
+    for (num, path, stat, _), (digest, summary) in zip(pending, results):
+        if summary is None:
+            summary = _summary_from_entry(cached[path.name]['summary'])
+        else:
+            reparsed += 1
+        summaries[num] = summary
+        entries[path.name] = {
+            'number': num,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'summary': _summary_to_entry(summary),
+        }
+
+    if use_cache and (pending or len(entries) != len(cached)):
+        save_cache(adr_dir, entries)
+
+    # Report in directory order regardless of which files came from the cache
+    return {num: summaries[num] for num in valid_adrs}, reparsed
+
+
+class AdrCollection:
+    """
+    An ADR directory parsed into memory.
+
+    run_audit() builds one and audits it once; --watch keeps it alive and
+    calls update() per changed file, so only that ADR is re-read and only
+    its graph edges are rebuilt before the (in-memory) checks re-run.
+    """
+
+    def __init__(self, adr_dir: Path, use_cache: bool = True, workers: Optional[int] = None):
+        self.adr_dir = adr_dir
+        self.readme_path = adr_dir / 'README.md'
+        self.adr_files = {f.name: f for f in adr_dir.glob('*.md') if f.name.startswith('adr-')}
+        self.naming_violations, self.valid_adrs = validate_naming(list(self.adr_files.values()))
+        # Extract metadata, cross-refs and sections (cached per file)
+        self.summaries, _ = load_summaries(adr_dir, self.valid_adrs, use_cache, workers)
+        self.digests = {}
+        self.graph = AdrGraph.from_summaries(self.summaries)
+        self.readme = self._read_readme()
+
+    def _read_readme(self) -> Optional[ReadmeDocument]:
+        """The parsed README, or None when there is none."""
+        try:
+            with open(self.readme_path, encoding='utf-8') as f:
+                return parse_readme(f)
+        except FileNotFoundError:
+            return None
+
+    def fix_readme(self) -> bool:
+        """Regenerate the README index tables in place; returns whether the file changed."""
+        readme = self.readme or ReadmeDocument(lines=[])
+        content = regenerate_readme(readme, self.summaries)
+        if content == ''.join(readme.lines) and self.readme is not None:
+            return False
+        write_readme(self.readme_path, content)
+        self.readme = parse_readme(content.splitlines(keepends=True))
+        return True
+
+    def update(self, name: str) -> bool:
+        """Re-read one created, modified or deleted file. Returns whether anything changed."""
+        if name == 'README.md':
+            readme, self.readme = self.readme, self._read_readme()
+            return readme != self.readme
+        if not (name.startswith('adr-') and name.endswith('.md')):
+            return False
+
+        path = self.adr_dir / name
+        exists = path.is_file()
+        known = name in self.adr_files
+        if not exists and not known:
+            return False
+        if exists:
+            self.adr_files[name] = path
+        else:
+            del self.adr_files[name]
+        self.naming_violations, self.valid_adrs = validate_naming(list(self.adr_files.values()))
+
+        # Drop ADRs that no longer resolve to a file (deleted, renamed, or a
+        # duplicate number now won by another file), then (re-)read the rest
+        changed = exists != known
+        for num in [num for num, summary in self.summaries.items()
+                    if self.valid_adrs.get(num, Path()).name != summary.file]:
+            del self.summaries[num]
+            self.digests.pop(num, None)
+            self.graph.update(num, None)
+            changed = True
+        for num, adr_path in self.valid_adrs.items():
+            if num in self.summaries and adr_path.name != name:
+                continue
+            try:
+                digest, summary = summarize_adr(adr_path, num, self.digests.get(num))
+            except (OSError, UnicodeDecodeError):
+                continue  # Mid-write or already gone; a later event follows
+            self.digests[num] = digest
+            if summary is not None and summary != self.summaries.get(num):
+                self.summaries[num] = summary
+                self.graph.update(num, summary.xrefs)
+                changed = True
+        return changed
+
+    def audit(self) -> AuditResult:
+        """Run every check over the in-memory collection."""
+        summaries = self.summaries
+
+        # Check sections
+        missing_sections = [
+            MissingSection(file=summary.file, adr_number=f'ADR-{num}', missing=summary.missing_sections)
+            for num, summary in summaries.items() if summary.missing_sections
+        ]
+
+        return AuditResult(
+            directory=str(self.adr_dir),
+            scan_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_files=len(self.adr_files),
+            valid_adrs=len(self.valid_adrs),
+            naming_violations=self.naming_violations,
+            missing_sections=missing_sections,
+            xref_issues=validate_xrefs(summaries, self.graph),
+            stale_reviews=check_review_dates(summaries),
+            metadata_issues=check_metadata(summaries),
+            readme_sync=check_readme_sync(self.readme_path, self.valid_adrs, summaries, self.readme),
+            number_gaps=find_number_gaps(self.valid_adrs),
+            external_refs=[
+                {'from': f'ADR-{num}', 'to': '{}/ADR-{}'.format(*ref.rsplit('/', 1))}
+                for num, summary in summaries.items() for ref in sorted(summary.xrefs['external'])
+            ],
+        )
+
+
+def run_audit(adr_dir: Path, use_cache: bool = True, workers: Optional[int] = None) -> AuditResult:
+    """Run full audit on ADR directory."""
+    return AdrCollection(adr_dir, use_cache, workers).audit()
+
+
+def load_graph(adr_dir: Path, use_cache: bool = True, workers: Optional[int] = None) -> AdrGraph:
+    """Build the relationship graph from (cached) summaries without running the checks."""
+    return AdrCollection(adr_dir, use_cache, workers).graph
+
+
+def watch_events(adr_dir: Path, poll_seconds: float = WATCH_POLL_SECONDS) -> Iterator[set[str]]:
+    """
+    Yield the names of .md files created, modified or deleted in adr_dir.
+
+    Uses inotify (via the optional inotify_simple package) and otherwise
+    polls mtime and size every poll_seconds.
+    """
+    if INotify is not None:
+        inotify = INotify()
+        inotify.add_watch(adr_dir, inotify_flags.CLOSE_WRITE | inotify_flags.CREATE | inotify_flags.DELETE |
+                          inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO)
+        while True:
+            names = {event.name for event in inotify.read(read_delay=WATCH_DEBOUNCE_MS)
+                     if event.name.endswith('.md')}
+            if names:
+                yield names
+
+    def snapshot() -> dict[str, tuple[int, int]]:
+        with os.scandir(adr_dir) as entries:
+            return {entry.name: (stat.st_mtime_ns, stat.st_size)
+                    for entry in entries if entry.name.endswith('.md') and entry.is_file()
+                    for stat in [entry.stat()]}
+
+    previous = snapshot()
+    while True:
+        time.sleep(poll_seconds)
+        current = snapshot()
+        names = {name for name in previous.keys() | current.keys() if previous.get(name) != current.get(name)}
+        previous = current
+        if names:
+            yield names
+
+
+def issue_set(result: AuditResult) -> dict[str, tuple[str, dict]]:
+    """Every issue in an audit, keyed by its category and content."""
+    issues = {}
+    for category in ISSUE_CATEGORIES:
+        for issue in getattr(result, category):
+            data = asdict(issue)
+            issues[category + json.dumps(data, sort_keys=True)] = (category, data)
+    return issues
 
-    # Check sections
-    missing_sections = []
-    for num, (content, xrefs) in adr_contents.items():
-        result = check_sections(content, valid_adrs[num].name, f'ADR-{num}')
-        if result:
-            missing_sections.append(result)
 
-    # Validate cross-references
-    xref_issues = validate_xrefs(adr_contents)
+def emit_diff(out: TextIO, previous: dict, result: AuditResult, changed: list[str]) -> dict:
+    """Write added/resolved issues and a closing audit line as NDJSON; returns the new issue set."""
+    current = issue_set(result)
+    added = [current[key] for key in current.keys() - previous.keys()]
+    resolved = [previous[key] for key in previous.keys() - current.keys()]
+    for event, issues in (('resolved', resolved), ('added', added)):
+        for category, data in sorted(issues, key=lambda item: (item[0], json.dumps(item[1], sort_keys=True))):
+            out.write(json.dumps({'event': event, 'category': category, 'issue': data}) + '\n')
+    out.write(json.dumps({
+        'event': 'audit',
+        'scan_date': result.scan_date,
+        'changed': changed,
+        'added': len(added),
+        'resolved': len(resolved),
+        'total_issues': len(current),
+        'valid_adrs': result.valid_adrs,
+        'number_gaps': result.number_gaps,
+    }) + '\n')
+    out.flush()
+    return current
+
+
+def watch(adr_dir: Path, use_cache: bool = True, workers: Optional[int] = None,
+          poll_seconds: float = WATCH_POLL_SECONDS, out: TextIO = sys.stdout) -> None:
+    """
+    Keep the collection in memory and stream issue diffs as files change.
+
+    The first audit reports every issue as added; after that each batch
+    of file events re-reads only the touched ADRs and emits what changed.
+    """
+    collection = AdrCollection(adr_dir, use_cache, workers)
+    issues = emit_diff(out, {}, collection.audit(), [])
+    for names in watch_events(adr_dir, poll_seconds):
+        changed = sorted(name for name in names if collection.update(name))
+        if changed:
+            issues = emit_diff(out, issues, collection.audit(), changed)
+
+
+# === Workspace Audit ===
+
+def discover_collections(root: Path) -> list[Path]:
+    """Every directory under root holding numbered adr-*.md files, in walk order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        if any(name.startswith('adr-') and name[4:5].isdigit() and name.endswith('.md') and name != TEMPLATE_FILE
+               for name in filenames):
+            found.append(Path(dirpath))
+    return found
+
+
+def collection_aliases(root: Path, directories: list[Path]) -> dict[Path, Optional[str]]:
+    """
+    Name each collection by its nearest non-generic directory.
+
+    services/billing/docs/adr is "billing", so "billing/ADR-012" points
+    into it. Names claimed by more than one collection resolve to None.
+    """
+    names = {}
+    for directory in directories:
+        parts = directory.relative_to(root).parts or (root.resolve().name,)
+        names[directory] = nearest_named_dir(parts) or parts[-1]
+    claimed = {}
+    for name in names.values():
+        claimed[name.lower()] = claimed.get(name.lower(), 0) + 1
+    return {directory: name if claimed[name.lower()] == 1 else None for directory, name in names.items()}
+
+
+def audit_collection(adr_dir: Path, name: str, alias: Optional[str], use_cache: bool = True) -> CollectionReport:
+    """Load and audit one collection, timing each step (runs in a worker process)."""
+    start = time.perf_counter()
+    # Parse inline: worker processes cannot start a pool of their own
+    collection = AdrCollection(adr_dir, use_cache, workers=1)
+    loaded = time.perf_counter()
+    result = collection.audit()
+    done = time.perf_counter()
+    return CollectionReport(
+        name=name,
+        alias=alias,
+        result=result,
+        numbers=list(collection.summaries),
+        timings={
+            'load_ms': round((loaded - start) * 1000, 2),
+            'check_ms': round((done - loaded) * 1000, 2),
+            'total_ms': round((done - start) * 1000, 2),
+        },
+    )
 
-    # Check review dates
-    stale_reviews = check_review_dates(adr_contents, valid_adrs)
 
-    # Check metadata
-    metadata_issues = check_metadata(adr_contents, valid_adrs)
+def resolve_cross_refs(reports: list[CollectionReport]) -> tuple[list[dict], list[XRefIssue]]:
+    """Match every "collection/ADR-NNN" reference against the audited collections."""
+    by_alias = {report.alias.lower(): report for report in reports if report.alias}
+    cross_refs = []
+    issues = []
 
-    # Check README sync
-    readme_path = adr_dir / 'README.md'
-    readme_issues = check_readme_sync(readme_path, valid_adrs, adr_contents)
+    for report in reports:
+        source = report.alias or report.name
+        for ref in report.result.external_refs:
+            scope, target_adr = ref['to'].rsplit('/', 1)
+            target_num = target_adr.removeprefix('ADR-')
+            target = by_alias.get(scope.lower())
+            resolved = target is not None and target_num in target.numbers
+            from_adr, to_adr = f"{source}/{ref['from']}", ref['to']
+            cross_refs.append({'from': from_adr, 'to': to_adr, 'resolved': resolved})
+            if resolved:
+                continue
+            if target is not None:
+                issue_type, fix = 'broken_ref', f'ADR-{target_num} does not exist in {target.name}'
+            else:
+                issue_type, fix = 'unknown_collection', f'No single ADR collection named "{scope}" under the root'
+            issues.append(XRefIssue(from_adr=from_adr, to_adr=to_adr, issue_type=issue_type,
+                                    relationship='cross_collection', suggested_fix=fix))
+    return cross_refs, issues
+
+
+def run_workspace_audit(root: Path, use_cache: bool = True, workers: Optional[int] = None) -> WorkspaceResult:
+    """
+    Audit every ADR collection under root and merge the results.
 
-    # Find number gaps
-    gaps = find_number_gaps(valid_adrs)
+    Collections are audited concurrently on a process pool (one
+    collection per task); cross-collection references are resolved once
+    all of them are back.
+    """
+    start = time.perf_counter()
+    directories = discover_collections(root)
+    discovered = time.perf_counter()
+
+    aliases = collection_aliases(root, directories)
+    jobs = [(directory, directory.relative_to(root).as_posix(), aliases[directory], use_cache)
+            for directory in directories]
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(audit_collection, *zip(*jobs)))
+    else:
+        reports = [audit_collection(*job) for job in jobs]
+    audited = time.perf_counter()
 
-    return AuditResult(
-        directory=str(adr_dir),
+    cross_refs, cross_ref_issues = resolve_cross_refs(reports)
+    return WorkspaceResult(
+        root=str(root),
         scan_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        total_files=len(adr_files),
-        valid_adrs=len(valid_adrs),
-        naming_violations=naming_violations,
-        missing_sections=missing_sections,
-        xref_issues=xref_issues,
-        stale_reviews=stale_reviews,
-        metadata_issues=metadata_issues,
-        readme_sync=readme_issues,
-        number_gaps=gaps,
+        collections=reports,
+        cross_refs=cross_refs,
+        cross_ref_issues=cross_ref_issues,
+        total_issues=sum(count_issues(report.result) for report in reports) + len(cross_ref_issues),
+        timings={
+            'discover_ms': round((discovered - start) * 1000, 2),
+            'audit_ms': round((audited - discovered) * 1000, 2),
+            'total_ms': round((time.perf_counter() - start) * 1000, 2),
+        },
     )
 
 
-def to_json(result: AuditResult) -> str:
-    """Convert audit result to JSON."""
+def to_json(result: AuditResult | WorkspaceResult) -> str:
+    """Convert an audit or workspace result to JSON."""
     def serialize(obj):
         if hasattr(obj, '__dataclass_fields__'):
             return asdict(obj)
@@ -642,16 +1641,14 @@ def to_json(result: AuditResult) -> str:
     return json.dumps(data, indent=2, default=serialize)
 
 
+def count_issues(result: AuditResult) -> int:
+    """Issues that make the audit fail (number gaps are informational)."""
+    return sum(len(getattr(result, category)) for category in ISSUE_CATEGORIES)
+
+
 def print_summary(result: AuditResult):
     """Print human-readable summary to stderr."""
-    total_issues = (
-        len(result.naming_violations) +
-        len(result.missing_sections) +
-        len(result.xref_issues) +
-        len(result.stale_reviews) +
-        len(result.metadata_issues) +
-        len(result.readme_sync)
-    )
+    total_issues = count_issues(result)
 
     print(f"\n=== ADR Audit Summary ===", file=sys.stderr)
     print(f"Directory: {result.directory}", file=sys.stderr)
@@ -666,6 +1663,27 @@ def print_summary(result: AuditResult):
     print(f"  - README sync: {len(result.readme_sync)}", file=sys.stderr)
     if result.number_gaps:
         print(f"  - Number gaps: {len(result.number_gaps)} (informational)", file=sys.stderr)
+    if result.external_refs:
+        print(f"  - Cross-collection refs: {len(result.external_refs)} "
+              f"(unchecked; audit the workspace root with --recursive)", file=sys.stderr)
+    print(file=sys.stderr)
+
+
+def print_workspace_summary(result: WorkspaceResult):
+    """Print a per-collection summary of a --recursive audit to stderr."""
+    print(f"\n=== ADR Workspace Audit Summary ===", file=sys.stderr)
+    print(f"Root: {result.root}", file=sys.stderr)
+    print(f"Collections: {len(result.collections)}", file=sys.stderr)
+    for report in result.collections:
+        alias = f" ({report.alias})" if report.alias and report.alias != report.name else ""
+        print(f"  - {report.name}{alias}: {report.result.valid_adrs} ADRs, "
+              f"{count_issues(report.result)} issues ({report.timings['total_ms']:.1f}ms)", file=sys.stderr)
+    unresolved = sum(not ref['resolved'] for ref in result.cross_refs)
+    print(f"Cross-collection references: {len(result.cross_refs)} ({unresolved} unresolved)", file=sys.stderr)
+    print(f"Total issues: {result.total_issues}", file=sys.stderr)
+    print(f"Time: {result.timings['total_ms']:.1f}ms "
+          f"(discover {result.timings['discover_ms']:.1f}ms, audit {result.timings['audit_ms']:.1f}ms)",
+          file=sys.stderr)
     print(file=sys.stderr)
 
 
@@ -678,13 +1696,51 @@ Examples:
   %(prog)s ./adr                    # Audit ADR directory
   %(prog)s ./adr --quiet            # JSON output only (no summary)
   %(prog)s ./adr --summary-only     # Summary only (no JSON)
+  %(prog)s ./adr --no-cache         # Re-parse every ADR
+  %(prog)s ./adr --query effective ADR-004   # Decision currently in force
+  %(prog)s ./adr --query chain 004           # Supersession chain from ADR-004
+  %(prog)s ./adr --query neighbors ADR-012   # Typed relations in and out
+  %(prog)s ./adr --query cycles              # Supersession cycles
+  %(prog)s ./adr --watch                     # Stream issue diffs as ADRs change
+  %(prog)s ./adr --fix-readme                # Regenerate README index tables, then audit
+  %(prog)s . --recursive                     # Audit every ADR collection under the current directory
+
+Per-file extraction results are cached in <directory>/.adr-audit-cache
+(keyed by file name, mtime and content hash), so only changed ADRs are
+re-parsed on later runs.
+
+--watch prints newline-delimited JSON: {"event": "added"|"resolved",
+"category", "issue"} per changed issue, then {"event": "audit", ...} per
+re-audit. It uses inotify when inotify_simple is installed and polls
+otherwise.
+
+--recursive treats the directory as a workspace root: every directory
+below it holding adr-NNN-*.md files is audited as its own collection, on
+a process pool, and one merged report is printed. ADRs reference other
+collections as "<collection>/ADR-NNN", where <collection> is the nearest
+directory name other than adr, docs, decisions and the like.
         """
     )
-    parser.add_argument('directory', type=Path, help='Path to ADR directory')
+    parser.add_argument('directory', type=Path, help='Path to ADR directory (workspace root with --recursive)')
     parser.add_argument('--quiet', '-q', action='store_true',
                         help='Suppress summary output (JSON only)')
     parser.add_argument('--summary-only', '-s', action='store_true',
                         help='Print summary only (no JSON)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore and don\'t update the .adr-audit-cache file')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for parsing changed ADRs (default: CPU count)')
+    parser.add_argument('--query', nargs='+', metavar=('QUERY', 'ADR'),
+                        help=f'Answer a relationship graph query instead of auditing '
+                             f'({", ".join(QUERY_KINDS)}; all but cycles take an ADR)')
+    parser.add_argument('--fix-readme', action='store_true',
+                        help='Regenerate the README index tables from the ADRs before auditing')
+    parser.add_argument('--watch', action='store_true',
+                        help='Stay running and stream NDJSON issue diffs as ADRs change')
+    parser.add_argument('--poll', type=float, default=WATCH_POLL_SECONDS, metavar='SECONDS',
+                        help=f'Polling interval for --watch without inotify (default: {WATCH_POLL_SECONDS})')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='Audit every ADR collection under the directory and merge the reports')
 
     args = parser.parse_args()
 
@@ -696,7 +1752,46 @@ Examples:
         print(f"Error: Not a directory: {args.directory}", file=sys.stderr)
         sys.exit(1)
 
-    result = run_audit(args.directory)
+    if args.recursive:
+        if args.query or args.watch or args.fix_readme:
+            parser.error('--recursive cannot be combined with --query, --watch or --fix-readme')
+        workspace = run_workspace_audit(args.directory, use_cache=not args.no_cache, workers=args.workers)
+        if not args.summary_only:
+            print(to_json(workspace))
+        if not args.quiet:
+            print_workspace_summary(workspace)
+        sys.exit(1 if workspace.total_issues > 0 else 0)
+
+    if args.query:
+        kind, adr = args.query[0], args.query[1] if len(args.query) > 1 else None
+        if kind not in QUERY_KINDS or len(args.query) > 2 or (adr is None) != (kind == 'cycles'):
+            parser.error(f'--query takes one of {", ".join(QUERY_KINDS)}, followed by an ADR unless it is cycles')
+        graph = load_graph(args.directory, use_cache=not args.no_cache, workers=args.workers)
+        num = None
+        if adr is not None:
+            num = adr.upper().removeprefix('ADR-')
+            num = num.zfill(3) if num.isdigit() else num
+            if num not in graph.nodes:
+                print(f"Error: ADR not found: {adr}", file=sys.stderr)
+                sys.exit(1)
+        print(json.dumps({
+            'query': kind,
+            'adr': f'ADR-{num}' if num else None,
+            'result': query_graph(graph, kind, num),
+        }, indent=2))
+        sys.exit(0)
+
+    if args.watch:
+        try:
+            watch(args.directory, use_cache=not args.no_cache, workers=args.workers, poll_seconds=args.poll)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    collection = AdrCollection(args.directory, use_cache=not args.no_cache, workers=args.workers)
+    if args.fix_readme and collection.fix_readme():
+        print(f"Regenerated index tables in {collection.readme_path}", file=sys.stderr)
+    result = collection.audit()
 
     if not args.summary_only:
         print(to_json(result))
@@ -705,15 +1800,7 @@ Examples:
         print_summary(result)
 
     # Exit with error code if issues found
-    total_issues = (
-        len(result.naming_violations) +
-        len(result.missing_sections) +
-        len(result.xref_issues) +
-        len(result.stale_reviews) +
-        len(result.metadata_issues) +
-        len(result.readme_sync)
-    )
-    sys.exit(1 if total_issues > 0 else 0)
+    sys.exit(1 if count_issues(result) > 0 else 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,77 @@
+"""Regression tests for adr-audit.py's reference scanner (run with pytest)."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).resolve().parent
+
+spec = importlib.util.spec_from_file_location('adr_audit', HOOKS_DIR / 'adr-audit.py')
+adr_audit = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(adr_audit)
+
+
+def refs(content: str) -> tuple[list[str], list[str]]:
+    """(local, external) references found in content."""
+    xrefs = adr_audit.parse_adr(content)[1]
+    return sorted(xrefs['all']), sorted(xrefs['external'])
+
+
+@pytest.mark.parametrize('content, local, external', [
+    # Qualified references into other collections
+    ('See billing/ADR-012', [], ['billing/012']),
+    ('(billing/ADR-012)', [], ['billing/012']),
+    ('[ADR-004](../service-a/docs/adr/adr-004-foo.md)', [], ['service-a/004']),
+    ('[link](../service-a/docs/adr/ADR-004-foo.md)', [], ['service-a/004']),
+    # Paths within the same collection
+    ('ADR-003', ['003'], []),
+    ('docs/ADR-004', ['004'], []),
+    ('../adr/adr-004-x.md', ['004'], []),
+    ('./adr-004-x.md', ['004'], []),
+    ('[ADR-004](adr-004-foo.md)', ['004'], []),
+    # A "/" in front of the reference that isn't a collection
+    ('See ADR-001/ADR-003', ['001', '003'], []),
+    ('https://github.com/o/r/blob/main/docs/adr/adr-003-c.md', ['003'], []),
+    ('[ADR-003](https://github.com/o/r/blob/main/docs/adr/adr-003-c.md)', ['003'], []),
+    ('<https://example.org/svc/ADR-003>', ['003'], []),
+    ('src/adr-004.md', ['004'], []),
+    ('services/billing/docs/adr/adr-012-x.md', ['012'], []),
+])
+def test_reference_qualifiers(content, local, external):
+    assert refs(content) == (local, external)
+
+
+def write_adr(adr_dir: Path, num: str, links: str) -> None:
+    (adr_dir / f'adr-{num}-x.md').write_text(
+        f'# ADR-{num}: X\n\n**Status**: Accepted\n**Date**: 2026-01-01\n**Domain**: Architecture\n\n'
+        f'## Context\nx\n## Decision\nx\n## Consequences\nx\n## Links\n{links}\n'
+    )
+
+
+def test_unqualified_backref_still_counts(tmp_path):
+    write_adr(tmp_path, '001', 'See https://github.com/o/r/blob/main/docs/adr/adr-003-x.md and ADR-001/ADR-003')
+    write_adr(tmp_path, '003', 'Related to ADR-001')
+
+    result = adr_audit.run_audit(tmp_path, use_cache=False)
+
+    assert result.xref_issues == []
+    assert result.external_refs == []
+
+
+def test_workspace_resolves_only_qualified_refs(tmp_path):
+    billing = tmp_path / 'services' / 'billing' / 'docs' / 'adr'
+    auth = tmp_path / 'services' / 'auth' / 'adr'
+    billing.mkdir(parents=True)
+    auth.mkdir(parents=True)
+    write_adr(billing, '001', 'Uses auth/ADR-002 and auth/ADR-009; see src/adr-001.md')
+    write_adr(auth, '002', 'See [billing](../../billing/docs/adr/adr-001-x.md)')
+
+    result = adr_audit.run_workspace_audit(tmp_path, use_cache=False, workers=1)
+
+    assert [(ref['from'], ref['to'], ref['resolved']) for ref in result.cross_refs] == [
+        ('auth/ADR-002', 'billing/ADR-001', True),
+        ('billing/ADR-001', 'auth/ADR-002', True),
+        ('billing/ADR-001', 'auth/ADR-009', False),
+    ]
+    assert [issue.issue_type for issue in result.cross_ref_issues] == ['broken_ref']
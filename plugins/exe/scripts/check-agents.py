@@ -14,11 +14,12 @@ Exit codes:
 
 import argparse
 import json
-import re
 import sys
 from pathlib import Path
 from typing import NamedTuple
 
+from toon import ExecutionPlan, parse_plan_file
+
 
 # Built-in Claude Code agents that are always available
 BUILTIN_AGENTS = {'general-purpose', 'Explore', 'Plan'}
@@ -49,37 +50,9 @@ def find_plugins_dir(start_path: Path) -> Path | None:
     return None
 
 
-def parse_agents_from_plan(content: str) -> set[str]:
+def parse_agents_from_plan(plan: ExecutionPlan) -> set[str]:
     """Extract all agent references from an execution plan."""
-    agents = set()
-
-    # Pattern for tasks array rows: Action,{id},{name},{type},{complexity},{model},{agent},...
-    # Agent is the 7th field (index 6)
-    task_pattern = re.compile(r'^Action,([^,]+),([^,]+),([^,]+),([^,]+),([^,]+),([^,]+)')
-
-    in_tasks_block = False
-
-    for line in content.split('\n'):
-        stripped = line.strip()
-
-        # Detect tasks array header
-        if re.match(r'^\s*tasks\[\d+,?\]', line):
-            in_tasks_block = True
-            continue
-
-        # End block on new section
-        if re.match(r'^\s*\w+\[.*?\]:', line) and 'tasks[' not in line:
-            in_tasks_block = False
-
-        # Parse task rows
-        if in_tasks_block:
-            match = task_pattern.match(stripped)
-            if match:
-                agent = match.group(6).strip()
-                if agent:
-                    agents.add(agent)
-
-    return agents
+    return {task.agent for task in plan.tasks.values() if task.agent}
 
 
 def check_agent_available(agent: str, plugins_dir: Path | None) -> tuple[bool, str | None]:
@@ -138,14 +111,14 @@ def check_agent_available(agent: str, plugins_dir: Path | None) -> tuple[bool, s
     return True, None
 
 
-def check_agents(content: str, filepath: Path, plugins_dir: Path | None) -> AgentCheckResult:
+def check_agents(plan: ExecutionPlan, plugins_dir: Path | None) -> AgentCheckResult:
     """Check all agents in an execution plan are available."""
     errors = []
     warnings = []
     agents_found = []
     agents_missing = []
 
-    agents = parse_agents_from_plan(content)
+    agents = parse_agents_from_plan(plan)
 
     if not agents:
         warnings.append("No agents found in execution plan")
@@ -212,13 +185,13 @@ Examples:
             continue
 
         try:
-            content = filepath.read_text(encoding='utf-8')
+            plan = parse_plan_file(filepath)
         except Exception as e:
             print(f"ERROR: Failed to read {filepath}: {e}", file=sys.stderr)
             all_valid = False
             continue
 
-        result = check_agents(content, filepath, plugins_dir)
+        result = check_agents(plan, plugins_dir)
 
         if not result.valid:
             all_valid = False
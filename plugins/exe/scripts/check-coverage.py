@@ -12,16 +12,36 @@ Exit codes:
 """
 
 import argparse
+import bisect
 import re
 import sys
 from pathlib import Path
 from typing import NamedTuple
 
+from toon import ExecutionPlan, parse_plan_file
+
+
+# Spec item patterns
+COMPONENT_NAME_PATTERN = re.compile(r'components?\.item\[\d*\]\.name:\s*(.+)')
+TOON_AC_PATTERN = re.compile(r'acceptanceCriteria\.item\[\d*\]\.identifier:\s*(AC-\d+)')
+MD_COMPONENTS_HEADING = re.compile(r'^#{1,2}\s*components?\s*$', re.IGNORECASE)
+MD_SECTION_HEADING = re.compile(r'^#{1,2}\s+[^#]')
+MD_H3_HEADING = re.compile(r'^###\s+(\w+)')
+MD_AC_PATTERN = re.compile(r'(?:^###\s*|\*\*)(AC-\d+)(?:\*\*)?[:\s]', re.MULTILINE)
+CONTRACT_COMPONENT_PATTERN = re.compile(r'contracts\.item\[\d*\]\.component:\s*(\w+)')
+TYPE_NAME_PATTERN = re.compile(r'types\.item\[\d*\]\.name:\s*(\w+)')
+FILE_PATH_PATTERN = re.compile(r'fileStructure\.items?\[\d*\]\.path:\s*(.+)')
+
+# Coverage index: words are indexed whole and by trigram for substring hits
+WORD_PATTERN = re.compile(r'\w+')
+NGRAM = 3
+
 
 class CoverageResult(NamedTuple):
     covered: list[str]
     uncovered: list[str]
     orphan_tasks: list[str]  # Tasks that don't map to any spec item
+    matches: dict[str, list[str]]  # Covered item -> every task that mentions it
 
 
 def extract_spec_items(content: str, filepath: Path) -> list[tuple[str, str]]:
@@ -34,52 +54,52 @@ def extract_spec_items(content: str, filepath: Path) -> list[tuple[str, str]]:
 
     # Pattern 1: TOON components
     # components.item[].name: ComponentName
-    for match in re.finditer(r'components?\.item\[\d*\]\.name:\s*(.+)', content):
+    for match in COMPONENT_NAME_PATTERN.finditer(content):
         items.append((f"component:{match.group(1).strip()}", match.group(1).strip()))
 
     # Pattern 2: TOON acceptance criteria
     # acceptanceCriteria.item[N].identifier: AC-1
-    for match in re.finditer(r'acceptanceCriteria\.item\[\d*\]\.identifier:\s*(AC-\d+)', content):
+    for match in TOON_AC_PATTERN.finditer(content):
         items.append((match.group(1), f"Acceptance Criteria {match.group(1)}"))
 
     # Pattern 3: Markdown components section
     # ## Components followed by ### ComponentName
     in_components = False
     for line in content.split('\n'):
-        if re.match(r'^#{1,2}\s*components?\s*$', line, re.IGNORECASE):
+        if MD_COMPONENTS_HEADING.match(line):
             in_components = True
             continue
-        if in_components and re.match(r'^#{1,2}\s+[^#]', line):
+        if in_components and MD_SECTION_HEADING.match(line):
             # New H2 section, end components
             in_components = False
         if in_components:
-            h3_match = re.match(r'^###\s+(\w+)', line)
+            h3_match = MD_H3_HEADING.match(line)
             if h3_match:
                 name = h3_match.group(1)
                 items.append((f"component:{name}", name))
 
     # Pattern 4: Markdown acceptance criteria
     # ### AC-1: or **AC-1**:
-    for match in re.finditer(r'(?:^###\s*|\*\*)(AC-\d+)(?:\*\*)?[:\s]', content, re.MULTILINE):
+    for match in MD_AC_PATTERN.finditer(content):
         ac_id = match.group(1)
         if (ac_id, f"Acceptance Criteria {ac_id}") not in items:
             items.append((ac_id, f"Acceptance Criteria {ac_id}"))
 
     # Pattern 5: TOON contracts
     # contracts.item[].component: + contracts.item[].method:
-    for match in re.finditer(r'contracts\.item\[\d*\]\.component:\s*(\w+)', content):
+    for match in CONTRACT_COMPONENT_PATTERN.finditer(content):
         comp = match.group(1).strip()
         if (f"component:{comp}", comp) not in items:
             items.append((f"component:{comp}", comp))
 
     # Pattern 6: TOON types
     # types.item[].name: TypeName
-    for match in re.finditer(r'types\.item\[\d*\]\.name:\s*(\w+)', content):
+    for match in TYPE_NAME_PATTERN.finditer(content):
         items.append((f"type:{match.group(1).strip()}", f"Type: {match.group(1).strip()}"))
 
     # Pattern 7: TOON file structure items
     # fileStructure.items[].path:
-    for match in re.finditer(r'fileStructure\.items?\[\d*\]\.path:\s*(.+)', content):
+    for match in FILE_PATH_PATTERN.finditer(content):
         path = match.group(1).strip()
         items.append((f"file:{path}", f"File: {path}"))
 
@@ -94,34 +114,101 @@ def extract_spec_items(content: str, filepath: Path) -> list[tuple[str, str]]:
     return unique_items
 
 
-def extract_plan_coverage(content: str) -> list[tuple[str, str]]:
+def extract_plan_coverage(plan: ExecutionPlan) -> list[tuple[str, str]]:
     """
     Extract task coverage info from a plan.
 
-    Returns list of (task_id, task_description) tuples.
+    Returns list of (task_id, task_description) tuples from taskDetails.
     """
-    tasks = []
+    return [(detail.task_id, detail.description) for detail in plan.task_details]
 
-    # Parse taskDetails for descriptions
-    # taskDetails[N,]{taskId,description,acceptance}:
-    in_details = False
-    for line in content.split('\n'):
-        if re.match(r'^\s*taskDetails\[', line):
-            in_details = True
-            continue
-        if in_details and re.match(r'^\s*\w+\[', line):
-            in_details = False
 
-        if in_details:
-            stripped = line.strip()
-            if ',' in stripped and not stripped.startswith('#'):
-                parts = stripped.split(',', 2)
-                if len(parts) >= 2:
-                    task_id = parts[0].strip()
-                    desc = parts[1].strip()
-                    tasks.append((task_id, desc))
+def search_term(item_id: str, item_desc: str) -> str:
+    """Lowercased term a task must mention to cover a spec item."""
+    if item_id.startswith('component:') or item_id.startswith('type:'):
+        return item_id.split(':')[1].lower()
+    if item_id.startswith('file:'):
+        return Path(item_id.split(':')[1]).stem.lower()
+    return item_desc.lower()
 
-    return tasks
+
+class CoverageIndex:
+    """
+    Inverted index over the words of task ids and descriptions.
+
+    Built once per plan. A term that appears in a task's text must have its
+    inner words appear there whole, its last word as a word prefix, its
+    first word as a word suffix (or, for a one-word term, anywhere inside a
+    word). lookup() intersects those posting lists, most selective first,
+    and confirms the surviving candidates with a substring test, keeping the
+    original "term appears in the description or id" semantics without
+    scanning every task per item.
+    """
+
+    def __init__(self, plan_tasks: list[tuple[str, str]]):
+        texts: dict[str, list[str]] = {}
+        for task_id, task_desc in plan_tasks:
+            texts.setdefault(task_id, [task_id.lower()]).append(task_desc.lower())
+        # Newline-joined so a term can't match across a description boundary
+        self.texts = {task_id: '\n'.join(parts) for task_id, parts in texts.items()}
+
+        self.words: dict[str, set[str]] = {}
+        for task_id, text in self.texts.items():
+            for word in set(WORD_PATTERN.findall(text)):
+                self.words.setdefault(word, set()).add(task_id)
+
+        self.sorted_words = sorted(self.words)
+        self.reversed_words = sorted(word[::-1] for word in self.words)
+        self.grams: dict[str, set[str]] = {}
+        for word in self.words:
+            for i in range(len(word) - NGRAM + 1):
+                self.grams.setdefault(word[i:i + NGRAM], set()).add(word)
+
+    def _with_prefix(self, sorted_words: list[str], prefix: str) -> list[str]:
+        start = bisect.bisect_left(sorted_words, prefix)
+        end = bisect.bisect_left(sorted_words, prefix + '\U0010ffff')
+        return sorted_words[start:end]
+
+    def _matching_words(self, part: str, position: str) -> list[str]:
+        """Indexed words that can hold part at position (whole/prefix/suffix/inner)."""
+        if position == 'whole':
+            return [part] if part in self.words else []
+        if position == 'prefix':
+            return self._with_prefix(self.sorted_words, part)
+        if position == 'suffix':
+            return [w[::-1] for w in self._with_prefix(self.reversed_words, part[::-1])]
+        if len(part) < NGRAM:
+            return [w for w in self.words if part in w]
+        grams = sorted((self.grams.get(part[i:i + NGRAM], set())
+                        for i in range(len(part) - NGRAM + 1)), key=len)
+        return [w for w in grams[0].intersection(*grams[1:]) if part in w]
+
+    def lookup(self, term: str) -> list[str]:
+        """Ids of every task whose id or description contains term."""
+        parts = WORD_PATTERN.findall(term)
+        if not parts:
+            return [task_id for task_id, text in self.texts.items() if term in text]
+
+        # A word at the term's edge may continue past it in the task text
+        open_left = WORD_PATTERN.match(term[0]) is not None
+        open_right = WORD_PATTERN.match(term[-1]) is not None
+        constraints = []
+        for i, part in enumerate(parts):
+            open_start = i == 0 and open_left
+            open_end = i == len(parts) - 1 and open_right
+            position = ('inner' if open_start and open_end else
+                        'suffix' if open_start else
+                        'prefix' if open_end else 'whole')
+            words = self._matching_words(part, position)
+            constraints.append((sum(len(self.words[w]) for w in words), words))
+
+        candidates = None
+        for _, words in sorted(constraints, key=lambda c: c[0]):
+            tasks = set().union(*(self.words[w] for w in words))
+            candidates = tasks if candidates is None else candidates & tasks
+            if not candidates:
+                return []
+        return [task_id for task_id in candidates if term in self.texts[task_id]]
 
 
 def check_coverage(spec_items: list[tuple[str, str]],
@@ -130,39 +217,28 @@ def check_coverage(spec_items: list[tuple[str, str]],
     Check if plan tasks cover spec items.
 
     Uses fuzzy matching - task description should mention component/type names.
+    Every task mentioning an item is recorded, so a task only counts as an
+    orphan when it mentions no spec item at all.
     """
+    index = CoverageIndex(plan_tasks)
     covered = []
     uncovered = []
-    task_matches = {task_id: False for task_id, _ in plan_tasks}
+    matches = {}
+    matched_tasks = set()
 
     for item_id, item_desc in spec_items:
-        # Extract the key term to search for
-        if item_id.startswith('component:'):
-            search_term = item_id.split(':')[1].lower()
-        elif item_id.startswith('type:'):
-            search_term = item_id.split(':')[1].lower()
-        elif item_id.startswith('file:'):
-            search_term = Path(item_id.split(':')[1]).stem.lower()
-        else:
-            search_term = item_desc.lower()
-
-        # Search for match in any task
-        found = False
-        for task_id, task_desc in plan_tasks:
-            if search_term in task_desc.lower() or search_term in task_id.lower():
-                found = True
-                task_matches[task_id] = True
-                break
-
-        if found:
+        task_ids = sorted(index.lookup(search_term(item_id, item_desc)))
+        if task_ids:
             covered.append(item_id)
+            matches[item_id] = task_ids
+            matched_tasks.update(task_ids)
         else:
             uncovered.append(item_id)
 
     # Find orphan tasks (don't match any spec item)
-    orphans = [task_id for task_id, matched in task_matches.items() if not matched]
+    orphans = [task_id for task_id in index.texts if task_id not in matched_tasks]
 
-    return CoverageResult(covered=covered, uncovered=uncovered, orphan_tasks=orphans)
+    return CoverageResult(covered=covered, uncovered=uncovered, orphan_tasks=orphans, matches=matches)
 
 
 def main():
@@ -208,14 +284,14 @@ Examples:
         sys.exit(2)
 
     try:
-        plan_content = args.plan.read_text(encoding='utf-8')
+        plan = parse_plan_file(args.plan)
     except Exception as e:
         print(f"ERROR: Failed to read plan: {e}", file=sys.stderr)
         sys.exit(2)
 
     # Extract items
     spec_items = extract_spec_items(spec_content, args.spec)
-    plan_tasks = extract_plan_coverage(plan_content)
+    plan_tasks = extract_plan_coverage(plan)
 
     if not spec_items:
         print("WARNING: No plannable items found in spec", file=sys.stderr)
@@ -251,7 +327,7 @@ Examples:
     if args.verbose and result.covered:
         print("Covered items:")
         for item_id in result.covered:
-            print(f"  ✓ {item_id}")
+            print(f"  ✓ {item_id} ({', '.join(result.matches[item_id])})")
 
     sys.exit(0)
 
@@ -3,7 +3,7 @@
 Check execution plan for dependency cycles and violations.
 
 Validates:
-- No circular dependencies in the dependency graph
+- No circular dependencies in the dependency graph (every cycle reported)
 - No dependencies on tasks in the same parallel group
 - No dependencies on tasks that execute later
 - All referenced tasks exist
@@ -15,17 +15,12 @@ Exit codes:
 """
 
 import argparse
-import re
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
 from pathlib import Path
 from typing import NamedTuple
 
-
-class Task(NamedTuple):
-    id: str
-    parallel_group: int
-    phase_order: int
+from toon import Dependency, ExecutionPlan, parse_plan_file
 
 
 class DependencyResult(NamedTuple):
@@ -34,149 +29,182 @@ class DependencyResult(NamedTuple):
     warnings: list[str]
     task_count: int
     dependency_count: int
+    layers: list[list[str]]  # Topological layers of the acyclic remainder
+
+
+def build_graph(dependencies: list[Dependency]) -> dict[str, list[str]]:
+    """Adjacency list: task id -> ids of the tasks it depends on."""
+    graph = defaultdict(list)
+    for dep in dependencies:
+        graph[dep.task_id].append(dep.depends_on)
+    return graph
 
 
-def parse_execution_plan(content: str) -> tuple[dict[str, Task], list[tuple[str, str, str]]]:
+def strongly_connected_components(graph: dict[str, list[str]], nodes: list[str]) -> list[list[str]]:
     """
-    Parse execution plan to extract tasks and dependencies.
+    Tarjan's strongly connected components, iteratively, in O(V+E).
 
-    Returns:
-        tasks: dict mapping task_id to Task info
-        dependencies: list of (task_id, depends_on, reason) tuples
+    Uses an explicit work stack so deep dependency chains cannot hit
+    Python's recursion limit.
     """
-    tasks = {}
-    dependencies = []
-    lines = content.split('\n')
-
-    current_phase = None
-    current_phase_order = 0
-    in_tasks_block = False
-    in_deps_block = False
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Detect phase blocks
-        phase_match = re.match(r'^(phase-[\w-]+):', stripped)
-        if phase_match:
-            current_phase = phase_match.group(1)
-
-        # Detect phase order
-        order_match = re.match(r'^\s*order:\s*(\d+)', line)
-        if order_match and current_phase:
-            current_phase_order = int(order_match.group(1))
-
-        # Detect tasks array header
-        if re.match(r'^\s*tasks\[\d+,?\]', line):
-            in_tasks_block = True
-            in_deps_block = False
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
             continue
 
-        # Detect dependencies array header
-        if re.match(r'^\s*dependencies\[\d+,?\]', line):
-            in_deps_block = True
-            in_tasks_block = False
-            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(graph.get(neighbor, ()))))
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                # All neighbors visited: propagate lowlink and maybe emit a component
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def shortest_cycle(graph: dict[str, list[str]], component: set[str], start: str) -> list[str]:
+    """Shortest cycle through start within one component (BFS), closed with start."""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in graph.get(node, ()):
+            if neighbor == start:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                return path + [start]
+            if neighbor in component and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+    return [start, start]
+
+
+def cyclic_components(graph: dict[str, list[str]], nodes: list[str]) -> list[set[str]]:
+    """Strongly connected components that contain at least one cycle."""
+    cyclic = []
+    for component in strongly_connected_components(graph, nodes):
+        if len(component) == 1 and component[0] not in graph.get(component[0], ()):
+            continue  # Single task without a self-dependency
+        cyclic.append(set(component))
+    return cyclic
+
+
+def find_cycles(dependencies: list[Dependency], graph: dict[str, list[str]] | None = None,
+                components: list[set[str]] | None = None) -> list[list[str]]:
+    """
+    Find every cycle-bearing strongly connected component of the dependency graph.
+
+    Returns one minimal witness cycle per cyclic component, where each cycle
+    is a list of task IDs starting and ending with the same task.
+    """
+    if graph is None:
+        graph = build_graph(dependencies)
+    if components is None:
+        components = cyclic_components(graph, _graph_nodes(graph))
+
+    return sorted(shortest_cycle(graph, members, min(members)) for members in components)
 
-        # End blocks on new section
-        if re.match(r'^\s*\w+\[.*?\]:', line) and 'tasks[' not in line and 'dependencies[' not in line:
-            in_tasks_block = False
-            in_deps_block = False
-
-        # Parse task rows: Action,{task-id},{name},{type},{complexity},{model},{agent},{tokens},{%},{group},Status
-        if in_tasks_block and stripped.startswith('Action,'):
-            parts = stripped.split(',')
-            if len(parts) >= 10:
-                task_id = parts[1].strip()
-                try:
-                    parallel_group = int(parts[9].strip())
-                except (ValueError, IndexError):
-                    parallel_group = 0
-                tasks[task_id] = Task(
-                    id=task_id,
-                    parallel_group=parallel_group,
-                    phase_order=current_phase_order
-                )
-
-        # Parse dependency rows: {task-id},{dependency-task-id},{reason}
-        if in_deps_block and ',' in stripped and not stripped.startswith('#'):
-            parts = stripped.split(',', 2)
-            if len(parts) >= 2:
-                task_id = parts[0].strip()
-                depends_on = parts[1].strip()
-                reason = parts[2].strip() if len(parts) > 2 else ''
-                if task_id and depends_on:
-                    dependencies.append((task_id, depends_on, reason))
-
-    return tasks, dependencies
-
-
-def find_cycles(dependencies: list[tuple[str, str, str]]) -> list[list[str]]:
+
+def topological_layers(graph: dict[str, list[str]], nodes: list[str],
+                       excluded: set[str] = frozenset()) -> list[list[str]]:
     """
-    Find all cycles in the dependency graph using DFS.
+    Group tasks into layers where each task only depends on earlier layers.
 
-    Returns list of cycles, where each cycle is a list of task IDs.
+    Tasks in excluded (cycle members) are left out, and so are dependency
+    edges pointing at them, so the acyclic remainder is still layered.
     """
-    # Build adjacency list
-    graph = defaultdict(list)
-    for task_id, depends_on, _ in dependencies:
-        graph[task_id].append(depends_on)
-
-    # All nodes in the graph
-    all_nodes = set(graph.keys())
-    for task_id, depends_on, _ in dependencies:
-        all_nodes.add(depends_on)
-
-    cycles = []
-    visited = set()
-    rec_stack = set()
-    path = []
-
-    def dfs(node):
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                if dfs(neighbor):
-                    return True
-            elif neighbor in rec_stack:
-                # Found cycle - extract it from path
-                cycle_start = path.index(neighbor)
-                cycle = path[cycle_start:] + [neighbor]
-                cycles.append(cycle)
-                return True
-
-        path.pop()
-        rec_stack.remove(node)
-        return False
-
-    for node in all_nodes:
-        if node not in visited:
-            dfs(node)
-
-    return cycles
-
-
-def check_dependencies(content: str, filepath: str) -> DependencyResult:
+    pending = {node: 0 for node in nodes if node not in excluded}
+    dependents = defaultdict(list)
+    for node in pending:
+        for dep in graph.get(node, ()):
+            if dep in pending:
+                pending[node] += 1
+                dependents[dep].append(node)
+
+    layers = []
+    layer = sorted(node for node, count in pending.items() if count == 0)
+    while layer:
+        layers.append(layer)
+        next_layer = []
+        for node in layer:
+            for dependent in dependents[node]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    next_layer.append(dependent)
+        layer = sorted(next_layer)
+
+    return layers
+
+
+def _graph_nodes(graph: dict[str, list[str]], tasks=()) -> list[str]:
+    """All task ids in tasks or on either end of a dependency, in stable order."""
+    nodes = dict.fromkeys(tasks)
+    for task_id, deps in graph.items():
+        nodes.setdefault(task_id)
+        for dep in deps:
+            nodes.setdefault(dep)
+    return list(nodes)
+
+
+def check_dependencies(plan: ExecutionPlan) -> DependencyResult:
     """Validate dependencies in an execution plan."""
     errors = []
     warnings = []
 
-    tasks, dependencies = parse_execution_plan(content)
+    tasks, dependencies = plan.tasks, plan.dependencies
 
     if not tasks:
-        return DependencyResult(False, ["No tasks found in execution plan"], [], 0, 0)
+        return DependencyResult(False, ["No tasks found in execution plan"], [], 0, 0, [])
+
+    graph = build_graph(dependencies)
+    nodes = _graph_nodes(graph, tasks)
 
     # Check for cycles
-    cycles = find_cycles(dependencies)
+    components = cyclic_components(graph, nodes)
+    cycles = find_cycles(dependencies, graph, components)
     for cycle in cycles:
         cycle_str = ' -> '.join(cycle)
         errors.append(f"Circular dependency detected: {cycle_str}")
 
     # Check each dependency
-    for task_id, depends_on, reason in dependencies:
+    for dep in dependencies:
+        task_id, depends_on = dep.task_id, dep.depends_on
+
         # Check task exists
         if task_id not in tasks:
             errors.append(f"Unknown task in dependency: {task_id}")
@@ -204,7 +232,7 @@ def check_dependencies(content: str, filepath: str) -> DependencyResult:
 
     # Check for orphan tasks (no dependencies but not in first phase)
     first_phase_order = min((t.phase_order for t in tasks.values()), default=1)
-    dependent_tasks = {task_id for task_id, _, _ in dependencies}
+    dependent_tasks = {dep.task_id for dep in dependencies}
 
     for task_id, task in tasks.items():
         if task.phase_order > first_phase_order and task_id not in dependent_tasks:
@@ -213,12 +241,15 @@ def check_dependencies(content: str, filepath: str) -> DependencyResult:
                 f"verify this is intentional"
             )
 
+    cycle_members = set().union(*components)
+
     return DependencyResult(
         valid=len(errors) == 0,
         errors=errors,
         warnings=warnings,
         task_count=len(tasks),
-        dependency_count=len(dependencies)
+        dependency_count=len(dependencies),
+        layers=topological_layers(graph, nodes, cycle_members)
     )
 
 
@@ -249,13 +280,13 @@ Examples:
             continue
 
         try:
-            content = filepath.read_text(encoding='utf-8')
+            plan = parse_plan_file(filepath)
         except Exception as e:
             print(f"ERROR: Failed to read {filepath}: {e}", file=sys.stderr)
             all_valid = False
             continue
 
-        result = check_dependencies(content, str(filepath))
+        result = check_dependencies(plan)
 
         if args.strict and result.warnings:
             result = DependencyResult(
@@ -263,7 +294,8 @@ Examples:
                 result.errors + result.warnings,
                 [],
                 result.task_count,
-                result.dependency_count
+                result.dependency_count,
+                result.layers
             )
 
         if not result.valid:
@@ -277,6 +309,8 @@ Examples:
             print(f"VALID: {filepath}")
             if args.verbose:
                 print(f"  Tasks: {result.task_count}, Dependencies: {result.dependency_count}")
+                widest = max((len(layer) for layer in result.layers), default=0)
+                print(f"  Layers: {len(result.layers)} (widest: {widest} tasks)")
             for warning in result.warnings:
                 print(f"  WARNING: {warning}")
 
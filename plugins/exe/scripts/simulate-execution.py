@@ -17,20 +17,15 @@ Exit codes:
 import argparse
 import re
 import sys
-from collections import defaultdict
 from pathlib import Path
 from typing import NamedTuple
 
+from toon import ExecutionPlan, parse_plan_file
 
-class TaskInfo(NamedTuple):
-    id: str
-    name: str
-    agent: str
-    parallel_group: int
-    phase: str
-    inputs: list[tuple[str, str, str]]  # (taskId, source, ref)
-    outputs: list[tuple[str, str, str]]  # (taskId, path, type)
-    returns: list[tuple[str, str, str, str]]  # (taskId, key, valueType, description)
+
+# Input references: {taskId}.outputs.{path} / {taskId}.returns.{key}
+OUTPUT_REF_PATTERN = re.compile(r'(\w+[-\w]*)\.outputs\.(.+)')
+RETURN_REF_PATTERN = re.compile(r'(\w+[-\w]*)\.returns\.(.+)')
 
 
 class SimulationProblem(NamedTuple):
@@ -40,182 +35,15 @@ class SimulationProblem(NamedTuple):
     message: str
 
 
-def parse_plan(content: str) -> tuple[list[TaskInfo], list[str], dict[str, list[str]]]:
-    """
-    Parse execution plan to extract tasks, execution order, and dependencies.
-
-    Returns:
-        tasks: list of TaskInfo
-        execution_order: list of task IDs in execution sequence
-        dependencies: dict mapping task_id -> list of dependency task_ids
-    """
-    tasks = []
-    execution_order = []
-    dependencies = defaultdict(list)
-
-    lines = content.split('\n')
-
-    current_phase = None
-    in_tasks = False
-    in_task_inputs = False
-    in_task_outputs = False
-    in_task_returns = False
-    in_deps = False
-    in_exec_order = False
-
-    task_map = {}  # task_id -> index in tasks list
-    task_inputs = defaultdict(list)
-    task_outputs = defaultdict(list)
-    task_returns = defaultdict(list)
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Track current phase
-        phase_match = re.match(r'^(phase-[\w-]+):', stripped)
-        if phase_match:
-            current_phase = phase_match.group(1)
-            in_tasks = False
-            in_task_inputs = False
-            in_task_outputs = False
-            in_task_returns = False
-
-        # Detect section headers
-        if re.match(r'^\s*tasks\[\d+', line):
-            in_tasks = True
-            in_task_inputs = False
-            in_task_outputs = False
-            in_task_returns = False
-            continue
-        if re.match(r'^\s*taskInputs\[', line):
-            in_tasks = False
-            in_task_inputs = True
-            in_task_outputs = False
-            in_task_returns = False
-            continue
-        if re.match(r'^\s*taskOutputs\[', line):
-            in_tasks = False
-            in_task_inputs = False
-            in_task_outputs = True
-            in_task_returns = False
-            continue
-        if re.match(r'^\s*taskReturns\[', line):
-            in_tasks = False
-            in_task_inputs = False
-            in_task_outputs = False
-            in_task_returns = True
-            continue
-        if re.match(r'^\s*dependencies\[\d+', line):
-            in_deps = True
-            in_tasks = False
-            in_task_inputs = False
-            in_task_outputs = False
-            in_task_returns = False
-            continue
-        if re.match(r'^\s*executionOrder\[', line):
-            in_exec_order = True
-            in_deps = False
-            # Parse inline execution order
-            order_match = re.search(r'executionOrder\[\d+\]:\s*(.+)', line)
-            if order_match:
-                execution_order = [t.strip() for t in order_match.group(1).split(',')]
-            continue
-
-        # End sections on new major section
-        if re.match(r'^[a-zA-Z]', stripped) and ':' in stripped:
-            if not stripped.startswith('Action,'):
-                in_tasks = False
-                in_task_inputs = False
-                in_task_outputs = False
-                in_task_returns = False
-                in_deps = False
-
-        # Parse task rows
-        if in_tasks and stripped.startswith('Action,'):
-            parts = stripped.split(',')
-            if len(parts) >= 10:
-                task_id = parts[1].strip()
-                task_name = parts[2].strip()
-                agent = parts[6].strip()
-                try:
-                    parallel_group = int(parts[9].strip())
-                except (ValueError, IndexError):
-                    parallel_group = 0
-
-                task_map[task_id] = len(tasks)
-                tasks.append(TaskInfo(
-                    id=task_id,
-                    name=task_name,
-                    agent=agent,
-                    parallel_group=parallel_group,
-                    phase=current_phase or 'unknown',
-                    inputs=[],
-                    outputs=[],
-                    returns=[]
-                ))
-
-        # Parse task inputs: taskId,source,ref
-        if in_task_inputs and ',' in stripped and not stripped.startswith('#'):
-            parts = stripped.split(',', 2)
-            if len(parts) >= 3:
-                task_id = parts[0].strip()
-                source = parts[1].strip()
-                ref = parts[2].strip()
-                task_inputs[task_id].append((task_id, source, ref))
-
-        # Parse task outputs: taskId,path,type
-        if in_task_outputs and ',' in stripped and not stripped.startswith('#'):
-            parts = stripped.split(',', 2)
-            if len(parts) >= 3:
-                task_id = parts[0].strip()
-                path = parts[1].strip()
-                out_type = parts[2].strip()
-                task_outputs[task_id].append((task_id, path, out_type))
-
-        # Parse task returns: taskId,key,valueType,description
-        if in_task_returns and ',' in stripped and not stripped.startswith('#'):
-            parts = stripped.split(',', 3)
-            if len(parts) >= 3:
-                task_id = parts[0].strip()
-                key = parts[1].strip()
-                value_type = parts[2].strip()
-                desc = parts[3].strip() if len(parts) > 3 else ''
-                task_returns[task_id].append((task_id, key, value_type, desc))
-
-        # Parse dependencies: taskId,dependsOn,reason
-        if in_deps and ',' in stripped and not stripped.startswith('#'):
-            parts = stripped.split(',', 2)
-            if len(parts) >= 2:
-                task_id = parts[0].strip()
-                depends_on = parts[1].strip()
-                if task_id and depends_on:
-                    dependencies[task_id].append(depends_on)
-
-    # Attach inputs/outputs/returns to tasks
-    final_tasks = []
-    for task in tasks:
-        final_tasks.append(TaskInfo(
-            id=task.id,
-            name=task.name,
-            agent=task.agent,
-            parallel_group=task.parallel_group,
-            phase=task.phase,
-            inputs=task_inputs.get(task.id, []),
-            outputs=task_outputs.get(task.id, []),
-            returns=task_returns.get(task.id, [])
-        ))
-
-    return final_tasks, execution_order, dict(dependencies)
-
-
-def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
-                       dependencies: dict[str, list[str]]) -> list[SimulationProblem]:
+def simulate_execution(plan: ExecutionPlan) -> list[SimulationProblem]:
     """
     Simulate plan execution and identify problems.
     """
     problems = []
 
-    task_by_id = {t.id: t for t in tasks}
+    task_by_id = plan.tasks
+    execution_order = plan.execution_order
+    dependencies = plan.dependencies_by_task()
 
     # Track state during simulation
     completed_tasks = set()
@@ -249,8 +77,6 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
         if task_id not in task_by_id:
             continue
 
-        task = task_by_id[task_id]
-
         # Check dependencies are satisfied
         for dep_id in dependencies.get(task_id, []):
             if dep_id not in completed_tasks:
@@ -262,7 +88,8 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
                 ))
 
         # Check inputs are available
-        for _, source, ref in task.inputs:
+        for task_input in plan.inputs.get(task_id, []):
+            source, ref = task_input.source, task_input.ref
             if source == 'static':
                 # Static inputs should exist in filesystem - can't check here
                 pass
@@ -270,7 +97,7 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
                 # Format: taskId.outputs.path
                 if ref not in available_outputs:
                     # Parse the ref to find source task
-                    ref_match = re.match(r'(\w+[-\w]*)\.outputs\.(.+)', ref)
+                    ref_match = OUTPUT_REF_PATTERN.match(ref)
                     if ref_match:
                         source_task = ref_match.group(1)
                         if source_task not in completed_tasks:
@@ -283,7 +110,7 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
             elif source == 'return':
                 # Format: taskId.returns.key
                 if ref not in available_returns:
-                    ref_match = re.match(r'(\w+[-\w]*)\.returns\.(.+)', ref)
+                    ref_match = RETURN_REF_PATTERN.match(ref)
                     if ref_match:
                         source_task = ref_match.group(1)
                         if source_task not in completed_tasks:
@@ -297,21 +124,22 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
         # Mark task complete and register outputs/returns
         completed_tasks.add(task_id)
 
-        for _, path, _ in task.outputs:
-            available_outputs[f"{task_id}.outputs.{path}"] = True
+        for output in plan.outputs.get(task_id, []):
+            available_outputs[f"{task_id}.outputs.{output.path}"] = True
 
-        for _, key, _, _ in task.returns:
-            available_returns[f"{task_id}.returns.{key}"] = True
+        for task_return in plan.returns.get(task_id, []):
+            available_returns[f"{task_id}.returns.{task_return.key}"] = True
 
     # Check for unused outputs (warning only)
     all_input_refs = set()
-    for task in tasks:
-        for _, source, ref in task.inputs:
-            if source in ('output', 'return'):
-                all_input_refs.add(ref)
-
-    for task in tasks:
-        for _, path, _ in task.outputs:
+    for task_inputs in plan.inputs.values():
+        for task_input in task_inputs:
+            if task_input.source in ('output', 'return'):
+                all_input_refs.add(task_input.ref)
+
+    for task in task_by_id.values():
+        for output in plan.outputs.get(task.id, []):
+            path = output.path
             output_ref = f"{task.id}.outputs.{path}"
             if output_ref not in all_input_refs:
                 # Check if it's a final deliverable (last phase)
@@ -325,6 +153,177 @@ def simulate_execution(tasks: list[TaskInfo], execution_order: list[str],
     return problems
 
 
+class ScheduleEntry(NamedTuple):
+    task_id: str
+    tokens: int
+    earliest_start: int
+    earliest_finish: int
+    layer: int
+    slack: int  # How far the task can slip without lengthening the critical path
+
+
+class Schedule(NamedTuple):
+    entries: dict[str, ScheduleEntry]
+    critical_path: list[str]
+    critical_path_tokens: int  # Lower bound on wall-clock with unlimited parallelism
+    layers: list[list[str]]    # Earliest-start layers = suggested parallel batches
+    max_concurrency: int       # Peak overlap of the earliest-start schedule
+    serial_tokens: int         # Everything run one after another
+    current_tokens: int        # Phases and parallelGroups as written in the plan
+    batched_tokens: int        # Suggested batches run one after another
+    cyclic_tasks: list[str]
+
+
+def task_duration(tokens: int) -> int:
+    """Token estimate used as the duration proxy (never zero)."""
+    return max(tokens, 1)
+
+
+def current_grouping_tokens(plan: ExecutionPlan) -> int:
+    """
+    Wall-clock (in tokens) of the plan's own grouping.
+
+    Phases run in order; within a phase each parallelGroup runs as one
+    batch (its longest task) and group 0 tasks run one at a time.
+    """
+    batches = {}
+    for task in plan.tasks.values():
+        group = task.parallel_group if task.parallel_group != 0 else f'solo:{task.id}'
+        key = (task.phase_order, task.phase or '', str(group))
+        batches[key] = max(batches.get(key, 0), task_duration(task.tokens))
+    return sum(batches.values())
+
+
+def compute_schedule(plan: ExecutionPlan) -> Schedule:
+    """
+    Critical-path analysis of the dependency DAG weighted by task tokens.
+
+    Computes earliest start/finish per task (Kahn order), the critical path,
+    slack, earliest-start layers and the peak number of tasks running at
+    once when every task starts as early as it can. Tasks on a dependency
+    cycle (a task depending on itself included), and tasks downstream of
+    one, cannot be scheduled and are reported in cyclic_tasks.
+    """
+    tasks = plan.tasks
+    depends_on = {task_id: [] for task_id in tasks}
+    dependents = {task_id: [] for task_id in tasks}
+    for dep in plan.dependencies:
+        if dep.task_id in tasks and dep.depends_on in tasks:
+            depends_on[dep.task_id].append(dep.depends_on)
+            dependents[dep.depends_on].append(dep.task_id)
+
+    # Forward pass in topological order
+    pending = {task_id: len(deps) for task_id, deps in depends_on.items()}
+    ready = [task_id for task_id, count in pending.items() if count == 0]
+    start, finish, layer, via = {}, {}, {}, {}
+    order = []
+    while ready:
+        task_id = ready.pop()
+        order.append(task_id)
+        deps = depends_on[task_id]
+        start[task_id] = max((finish[d] for d in deps), default=0)
+        layer[task_id] = max((layer[d] + 1 for d in deps), default=0)
+        via[task_id] = max(deps, key=lambda d: finish[d]) if deps else None
+        finish[task_id] = start[task_id] + task_duration(tasks[task_id].tokens)
+        for dependent in dependents[task_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    cyclic_tasks = sorted(task_id for task_id in tasks if task_id not in finish)
+    makespan = max(finish.values(), default=0)
+
+    # Backward pass for slack
+    latest_finish = {}
+    for task_id in reversed(order):
+        latest_finish[task_id] = min(
+            (latest_finish[d] - task_duration(tasks[d].tokens) for d in dependents[task_id] if d in latest_finish),
+            default=makespan
+        )
+
+    entries = {
+        task_id: ScheduleEntry(
+            task_id=task_id,
+            tokens=tasks[task_id].tokens,
+            earliest_start=start[task_id],
+            earliest_finish=finish[task_id],
+            layer=layer[task_id],
+            slack=latest_finish[task_id] - finish[task_id],
+        )
+        for task_id in order
+    }
+
+    # Walk back from the last task to finish along the dependency that finished last
+    critical_path = []
+    if finish:
+        node = max(finish, key=finish.get)
+        while node is not None:
+            critical_path.append(node)
+            node = via[node]
+        critical_path.reverse()
+
+    layers = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+    for task_id in sorted(layer):
+        layers[layer[task_id]].append(task_id)
+
+    # Peak overlap in the earliest-start schedule (finishes sort before starts)
+    events = sorted([(start[t], 1) for t in order] + [(finish[t], -1) for t in order])
+    running = max_concurrency = 0
+    for _, delta in events:
+        running += delta
+        max_concurrency = max(max_concurrency, running)
+
+    return Schedule(
+        entries=entries,
+        critical_path=critical_path,
+        critical_path_tokens=makespan,
+        layers=layers,
+        max_concurrency=max_concurrency,
+        serial_tokens=sum(task_duration(t.tokens) for t in tasks.values()),
+        current_tokens=current_grouping_tokens(plan),
+        batched_tokens=sum(max(task_duration(tasks[t].tokens) for t in batch) for batch in layers),
+        cyclic_tasks=cyclic_tasks,
+    )
+
+
+def print_schedule(schedule: Schedule, verbose: bool = False) -> None:
+    """Print critical-path and batching analysis."""
+    def pct_of(value: int, total: int) -> str:
+        return f"{value / total * 100:.0f}%" if total else "0%"
+
+    if schedule.cyclic_tasks:
+        print(f"CANNOT SCHEDULE: {len(schedule.cyclic_tasks)} tasks on or behind dependency cycles: "
+              f"{', '.join(schedule.cyclic_tasks)}", file=sys.stderr)
+
+    print(f"SCHEDULE: {len(schedule.entries)} tasks in {len(schedule.layers)} layers")
+    print(f"  Critical path ({schedule.critical_path_tokens} tokens, lower bound): "
+          f"{' -> '.join(schedule.critical_path)}")
+    print(f"  Peak concurrency (earliest-start): {schedule.max_concurrency} tasks")
+
+    # Serial and current grouping count every task; only compare once all of them can be scheduled
+    if not schedule.cyclic_tasks:
+        print(f"  Serial:            {schedule.serial_tokens} tokens")
+        print(f"  Current grouping:  {schedule.current_tokens} tokens")
+        print(f"  Suggested batches: {schedule.batched_tokens} tokens")
+
+        on_table = schedule.current_tokens - schedule.critical_path_tokens
+        if on_table > 0:
+            print(f"  Current grouping leaves {on_table} tokens ({pct_of(on_table, schedule.current_tokens)}) "
+                  f"on the table vs. the critical path; suggested batches recover "
+                  f"{max(schedule.current_tokens - schedule.batched_tokens, 0)}")
+
+    print("Suggested batches:" if not schedule.cyclic_tasks else "Suggested batches (schedulable tasks only):")
+    for i, batch in enumerate(schedule.layers, 1):
+        longest = max(task_duration(schedule.entries[t].tokens) for t in batch)
+        print(f"  Batch {i} ({len(batch)} tasks, {longest} tokens): {', '.join(batch)}")
+
+    if verbose:
+        print("Tasks (earliest start / finish / slack):")
+        for entry in sorted(schedule.entries.values(), key=lambda e: (e.earliest_start, e.task_id)):
+            marker = '*' if entry.slack == 0 else ' '
+            print(f"  {marker} {entry.task_id}: {entry.earliest_start} / {entry.earliest_finish} / {entry.slack}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Simulate execution of an execution plan to find problems',
@@ -336,15 +335,23 @@ Checks performed:
     - Inputs (outputs/returns from other tasks) are available
     - No orphan outputs (warnings only)
 
+Schedule mode (--schedule):
+    Uses dependencies and per-task token estimates to report the critical
+    path, earliest-start layers, peak concurrency and a suggested batch
+    assignment, compared against the plan's phase/parallelGroup grouping.
+
 Examples:
     %(prog)s execution-plan.toon
     %(prog)s specs/auth-plan.toon --verbose
+    %(prog)s execution-plan.toon --schedule
         """
     )
     parser.add_argument('file', type=Path, help='Execution plan file to simulate')
     parser.add_argument('--verbose', '-v', action='store_true', help='Show simulation progress')
     parser.add_argument('--warnings-as-errors', '-W', action='store_true',
                         help='Treat warnings as errors')
+    parser.add_argument('--schedule', action='store_true',
+                        help='Analyse critical path and parallelism instead of simulating')
 
     args = parser.parse_args()
 
@@ -353,21 +360,27 @@ Examples:
         sys.exit(2)
 
     try:
-        content = args.file.read_text(encoding='utf-8')
+        plan = parse_plan_file(args.file)
     except Exception as e:
         print(f"ERROR: Failed to read {args.file}: {e}", file=sys.stderr)
         sys.exit(2)
 
-    tasks, execution_order, dependencies = parse_plan(content)
+    tasks, execution_order = plan.tasks, plan.execution_order
 
     if args.verbose:
-        print(f"Parsed: {len(tasks)} tasks, {len(execution_order)} in order, {len(dependencies)} with deps")
+        print(f"Parsed: {len(tasks)} tasks, {len(execution_order)} in order, "
+              f"{len(plan.dependencies_by_task())} with deps")
 
     if not tasks:
         print("ERROR: No tasks found in plan", file=sys.stderr)
         sys.exit(1)
 
-    problems = simulate_execution(tasks, execution_order, dependencies)
+    if args.schedule:
+        schedule = compute_schedule(plan)
+        print_schedule(schedule, args.verbose)
+        sys.exit(1 if schedule.cyclic_tasks else 0)
+
+    problems = simulate_execution(plan)
 
     errors = [p for p in problems if p.severity == 'ERROR']
     warnings = [p for p in problems if p.severity == 'WARNING']
@@ -0,0 +1,348 @@
+"""
+Streaming TOON tokenizer and execution plan model.
+
+Shared by the exe validation scripts so a plan is tokenized and parsed
+once per process:
+
+    plan = toon.parse_plan_file(Path('execution-plan.toon'))
+    plan.tasks, plan.dependencies, plan.execution_order, ...
+
+The tokenizer classifies each line exactly once (blank, comment, closing
+brace, property/array/table header, or free text such as table rows).
+parse_plan() folds the token stream into an ExecutionPlan in the same pass.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+# === Token kinds ===
+
+BLANK = 'blank'
+COMMENT = 'comment'
+CLOSE = 'close'        # A lone closing brace
+PROPERTY = 'property'  # key: value, key[N]: a,b,c or key[N,]{f1,f2}:
+TEXT = 'text'          # Anything else: table rows, list items
+BLOCK = 'block'        # Body of a `key: |` / `key: >` block scalar
+
+# key, optional [length], optional {field,list}, colon, optional value
+PROPERTY_PATTERN = re.compile(
+    r'^(?P<key>@?\w[\w\-\.]*)'
+    r'(?:\[(?P<length>[^\]]*)\])?'
+    r'(?:\{(?P<fields>[^}]*)\})?'
+    r':(?:\s+(?P<value>.*?))?\s*$'
+)
+
+# Default column layouts used when a table header omits its {field,list}
+TASK_FIELDS = ('@type', '@id', 'name', 'type', 'complexity', 'model', 'agent',
+               'tokens', 'variance', 'parallelGroup', 'status')
+TASK_DETAIL_FIELDS = ('taskId', 'description', 'acceptance')
+TASK_INPUT_FIELDS = ('taskId', 'source', 'ref')
+TASK_OUTPUT_FIELDS = ('taskId', 'path', 'type')
+TASK_RETURN_FIELDS = ('taskId', 'key', 'valueType', 'description')
+DEPENDENCY_FIELDS = ('taskId', 'dependsOn', 'reason')
+
+
+@dataclass(slots=True)
+class Token:
+    """One classified line of a TOON document."""
+    line_no: int
+    kind: str
+    indent: int
+    text: str                           # Line without indentation or newline
+    key: str | None = None
+    length: str | None = None           # Contents of [...] for arrays/tables
+    fields: list[str] | None = None     # Column names of a table header
+    value: str = ''
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Classify each line of a TOON document in a single pass."""
+    block_indent = None     # Indent of the key owning an open block scalar
+
+    for line_no, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        text = line.lstrip()
+        indent = len(line) - len(text)
+        text = text.rstrip()
+
+        if block_indent is not None:
+            if not text or indent > block_indent:
+                yield Token(line_no, BLOCK, indent, text)
+                continue
+            block_indent = None
+
+        if not text:
+            yield Token(line_no, BLANK, indent, text)
+        elif text[0] == '#':
+            yield Token(line_no, COMMENT, indent, text)
+        elif text == '}':
+            yield Token(line_no, CLOSE, indent, text)
+        else:
+            match = PROPERTY_PATTERN.match(text)
+            if match:
+                fields = match.group('fields')
+                if match.group('value') in ('|', '>'):
+                    block_indent = indent
+                yield Token(
+                    line_no, PROPERTY, indent, text,
+                    key=match.group('key'),
+                    length=match.group('length'),
+                    fields=[f.strip() for f in fields.split(',')] if fields is not None else None,
+                    value=match.group('value') or '',
+                )
+            else:
+                yield Token(line_no, TEXT, indent, text)
+
+
+def split_row(text: str, maxsplit: int = -1) -> list[str]:
+    """Split a comma-separated row, honouring double-quoted values."""
+    if '"' not in text:
+        return [part.strip() for part in text.split(',', maxsplit)]
+
+    parts = []
+    current = []
+    in_quotes = False
+    for char in text:
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ',' and not in_quotes and (maxsplit < 0 or len(parts) < maxsplit):
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return [part[1:-1] if len(part) >= 2 and part[0] == part[-1] == '"' else part
+            for part in parts]
+
+
+# === Execution plan model ===
+
+@dataclass(slots=True)
+class Phase:
+    id: str
+    order: int = 0
+    name: str = ''
+
+
+@dataclass(slots=True)
+class PlanTask:
+    id: str
+    name: str
+    type: str
+    complexity: str
+    model: str
+    agent: str
+    tokens: int
+    variance: str
+    parallel_group: int
+    status: str
+    phase: str | None
+    phase_order: int
+
+
+@dataclass(slots=True)
+class TaskDetail:
+    task_id: str
+    description: str
+    acceptance: str
+
+
+@dataclass(slots=True)
+class TaskInput:
+    task_id: str
+    source: str
+    ref: str
+
+
+@dataclass(slots=True)
+class TaskOutput:
+    task_id: str
+    path: str
+    type: str
+
+
+@dataclass(slots=True)
+class TaskReturn:
+    task_id: str
+    key: str
+    value_type: str
+    description: str
+
+
+@dataclass(slots=True)
+class Dependency:
+    task_id: str
+    depends_on: str
+    reason: str
+
+
+@dataclass(slots=True)
+class ExecutionPlan:
+    """Everything the exe checks need from an execution plan."""
+    type: str | None = None
+    id: str | None = None
+    phase_ids: list[str] = field(default_factory=list)
+    phases: dict[str, Phase] = field(default_factory=dict)
+    tasks: dict[str, PlanTask] = field(default_factory=dict)
+    task_details: list[TaskDetail] = field(default_factory=list)
+    inputs: dict[str, list[TaskInput]] = field(default_factory=lambda: defaultdict(list))
+    outputs: dict[str, list[TaskOutput]] = field(default_factory=lambda: defaultdict(list))
+    returns: dict[str, list[TaskReturn]] = field(default_factory=lambda: defaultdict(list))
+    dependencies: list[Dependency] = field(default_factory=list)
+    execution_order: list[str] = field(default_factory=list)
+    sections: set[str] = field(default_factory=set)   # Top-level array/table keys
+    tokens: list[Token] = field(default_factory=list)
+
+    def dependencies_by_task(self) -> dict[str, list[str]]:
+        """Map task id -> ids of the tasks it depends on."""
+        deps = defaultdict(list)
+        for dep in self.dependencies:
+            deps[dep.task_id].append(dep.depends_on)
+        return dict(deps)
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _row_values(text: str, fields: tuple[str, ...] | list[str]) -> dict[str, str]:
+    """Map a table row onto its column names (extra commas go to the last column)."""
+    values = split_row(text, len(fields) - 1)
+    return {name: values[i] if i < len(values) else '' for i, name in enumerate(fields)}
+
+
+def _add_row(plan: ExecutionPlan, table: str, fields, text: str, phase: Phase | None) -> None:
+    """Fold one table row into the plan model."""
+    if table == 'tasks':
+        row = _row_values(text, fields or TASK_FIELDS)
+        if row.get('@type') != 'Action' or not row.get('@id'):
+            return
+        plan.tasks[row['@id']] = PlanTask(
+            id=row['@id'],
+            name=row.get('name', ''),
+            type=row.get('type', ''),
+            complexity=row.get('complexity', ''),
+            model=row.get('model', ''),
+            agent=row.get('agent', ''),
+            tokens=_to_int(row.get('tokens', '')),
+            variance=row.get('variance', ''),
+            parallel_group=_to_int(row.get('parallelGroup', '')),
+            status=row.get('status', ''),
+            phase=phase.id if phase else None,
+            phase_order=phase.order if phase else 0,
+        )
+    elif table == 'taskDetails':
+        row = _row_values(text, fields or TASK_DETAIL_FIELDS)
+        if row['taskId']:
+            plan.task_details.append(TaskDetail(
+                row['taskId'], row.get('description', ''), row.get('acceptance', '')
+            ))
+    elif table == 'taskInputs':
+        row = _row_values(text, fields or TASK_INPUT_FIELDS)
+        if row['taskId']:
+            plan.inputs[row['taskId']].append(TaskInput(row['taskId'], row.get('source', ''), row['ref']))
+    elif table == 'taskOutputs':
+        row = _row_values(text, fields or TASK_OUTPUT_FIELDS)
+        if row['taskId']:
+            plan.outputs[row['taskId']].append(TaskOutput(row['taskId'], row.get('path', ''), row.get('type', '')))
+    elif table == 'taskReturns':
+        row = _row_values(text, fields or TASK_RETURN_FIELDS)
+        if row['taskId']:
+            plan.returns[row['taskId']].append(TaskReturn(
+                row['taskId'], row.get('key', ''), row.get('valueType', ''), row.get('description', '')
+            ))
+    elif table == 'dependencies':
+        row = _row_values(text, fields or DEPENDENCY_FIELDS)
+        if row['taskId'] and row.get('dependsOn'):
+            plan.dependencies.append(Dependency(row['taskId'], row['dependsOn'], row.get('reason', '')))
+    elif table == 'executionOrder':
+        plan.execution_order.extend(t for t in split_row(text) if t)
+
+
+def parse_plan(source: str | Iterable[str]) -> ExecutionPlan:
+    """Tokenize and parse an execution plan in one streaming pass.
+
+    Phase blocks are top-level keys listed in `phases[N]:`, named
+    `phase-*`, or declaring `@type: Phase`. `phase-*` blocks nested at
+    any indent count too; they end at the next key indented no deeper.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    plan = ExecutionPlan()
+
+    block = None            # Current top-level key
+    phase = None            # Current Phase, if the block is one
+    phase_indent = 0        # Indent of the current phase's key
+    table = None            # (key, fields) of the table whose rows follow
+
+    for token in tokenize(lines):
+        plan.tokens.append(token)
+        kind = token.kind
+
+        if kind in (BLANK, COMMENT, CLOSE, BLOCK):
+            continue
+
+        if kind == TEXT:
+            if table is not None:
+                _add_row(plan, table[0], table[1], token.text, phase)
+            continue
+
+        # Any property ends the current table
+        table = None
+        key = token.key
+
+        if phase is not None and 0 < token.indent <= phase_indent:
+            phase = None
+
+        if token.indent == 0:
+            block = key
+            phase = None
+            phase_indent = 0
+            if not token.value and token.length is None and (
+                    key in plan.phase_ids or key.startswith('phase-')):
+                phase = plan.phases.setdefault(key, Phase(key))
+            if token.length is not None:
+                plan.sections.add(key)
+            if key == '@type' and plan.type is None:
+                plan.type = token.value
+            elif key == '@id' and plan.id is None:
+                plan.id = token.value
+        elif key.startswith('phase-') and not token.value and token.length is None:
+            phase = plan.phases.setdefault(key, Phase(key))
+            phase_indent = token.indent
+        elif key == '@type' and token.value == 'Phase' and phase is None and block:
+            phase = plan.phases.setdefault(block, Phase(block))
+        elif phase is not None and token.indent > phase_indent:
+            if key == 'order':
+                phase.order = _to_int(token.value)
+            elif key == 'name' and not phase.name:
+                phase.name = token.value
+
+        if token.length is None:
+            continue
+
+        if key == 'phases':
+            plan.phase_ids = [p for p in split_row(token.value) if p] if token.value else []
+        elif key == 'executionOrder' and token.value:
+            plan.execution_order = [t for t in split_row(token.value) if t]
+        elif not token.value:
+            table = (key, token.fields)
+
+    # `order:` may follow a phase's task table
+    for task in plan.tasks.values():
+        if task.phase is not None:
+            task.phase_order = plan.phases[task.phase].order
+
+    return plan
+
+
+def parse_plan_file(path: Path) -> ExecutionPlan:
+    """Parse an execution plan file without loading it into one string."""
+    with open(path, encoding='utf-8') as f:
+        return parse_plan(f)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Run every execution plan check in one process on a single parse.
+
+Parses the plan (and spec) once, then runs the validate-toon,
+check-dependencies, check-agents, check-coverage and simulate-execution
+checks against the shared in-memory model on a thread pool and emits one
+merged report with per-check timings.
+
+Exit codes:
+    0 - All checks passed
+    1 - One or more checks failed
+    2 - Usage error or file not found
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from toon import ExecutionPlan, parse_plan_file
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+class CheckReport(NamedTuple):
+    name: str
+    valid: bool
+    errors: list[str]
+    warnings: list[str]
+    duration_ms: float
+    details: dict
+
+
+def load_script(name: str):
+    """Import a hyphenated sibling script (e.g. check-agents.py) as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), SCRIPTS_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The individual checks, loaded once up front (not from worker threads)
+validate_toon = load_script('validate-toon')
+check_dependencies = load_script('check-dependencies')
+check_agents = load_script('check-agents')
+check_coverage = load_script('check-coverage')
+simulate_execution = load_script('simulate-execution')
+
+
+def run_toon_check(plan: ExecutionPlan, **_) -> tuple[list[str], list[str], dict]:
+    result = validate_toon.validate_plan(plan)
+    return result.errors, result.warnings, {}
+
+
+def run_dependency_check(plan: ExecutionPlan, **_) -> tuple[list[str], list[str], dict]:
+    result = check_dependencies.check_dependencies(plan)
+    return result.errors, result.warnings, {
+        'tasks': result.task_count,
+        'dependencies': result.dependency_count,
+        'layers': len(result.layers),
+    }
+
+
+def run_agent_check(plan: ExecutionPlan, plugins_dir: Path | None, **_) -> tuple[list[str], list[str], dict]:
+    result = check_agents.check_agents(plan, plugins_dir)
+    return result.errors, result.warnings, {
+        'agents_found': result.agents_found,
+        'agents_missing': result.agents_missing,
+    }
+
+
+def run_coverage_check(plan: ExecutionPlan, spec_content: str, spec_path: Path,
+                       orphans_ok: bool, **_) -> tuple[list[str], list[str], dict]:
+    spec_items = check_coverage.extract_spec_items(spec_content, spec_path)
+    plan_tasks = check_coverage.extract_plan_coverage(plan)
+    if not plan_tasks:
+        return ["No tasks found in plan"], [], {}
+
+    result = check_coverage.check_coverage(spec_items, plan_tasks)
+    errors = [f"Spec item not covered by any task: {item_id}" for item_id in result.uncovered]
+    warnings = []
+    if not spec_items:
+        warnings.append("No plannable items found in spec")
+    if result.orphan_tasks and not orphans_ok:
+        warnings.extend(f"Task doesn't map to spec items: {task_id}" for task_id in result.orphan_tasks)
+    return errors, warnings, {
+        'spec_items': len(spec_items),
+        'covered': result.covered,
+        'uncovered': result.uncovered,
+        'orphan_tasks': result.orphan_tasks,
+    }
+
+
+def run_simulation_check(plan: ExecutionPlan, **_) -> tuple[list[str], list[str], dict]:
+    if not plan.tasks:
+        return ["No tasks found in plan"], [], {}
+
+    problems = simulate_execution.simulate_execution(plan)
+    errors = [f"[{p.category}] {p.task_id}: {p.message}" for p in problems if p.severity == 'ERROR']
+    warnings = [f"[{p.category}] {p.task_id}: {p.message}" for p in problems if p.severity == 'WARNING']
+    return errors, warnings, {'execution_order': len(plan.execution_order)}
+
+
+# Checks whose standalone scripts take --strict
+STRICT_CHECKS = {'validate-toon', 'check-dependencies'}
+
+# name -> runner; coverage only runs when a spec is given
+CHECKS: dict[str, Callable] = {
+    'validate-toon': run_toon_check,
+    'check-dependencies': run_dependency_check,
+    'check-agents': run_agent_check,
+    'check-coverage': run_coverage_check,
+    'simulate-execution': run_simulation_check,
+}
+
+
+def run_check(name: str, strict: bool, **context) -> CheckReport:
+    """Run one check and time it, turning crashes into check errors."""
+    start = time.perf_counter()
+    try:
+        errors, warnings, details = CHECKS[name](**context)
+    except Exception as e:
+        errors, warnings, details = [f"Check crashed: {type(e).__name__}: {e}"], [], {}
+
+    if strict and warnings and name in STRICT_CHECKS:
+        errors, warnings = errors + warnings, []
+
+    return CheckReport(
+        name=name,
+        valid=len(errors) == 0,
+        errors=errors,
+        warnings=warnings,
+        duration_ms=(time.perf_counter() - start) * 1000,
+        details=details,
+    )
+
+
+def run_pipeline(plan: ExecutionPlan, spec_content: str | None, spec_path: Path | None,
+                 plugins_dir: Path | None, strict: bool = False, orphans_ok: bool = False,
+                 workers: int = 4) -> list[CheckReport]:
+    """Run all checks against one parsed plan on a thread pool."""
+    names = [name for name in CHECKS if name != 'check-coverage' or spec_content is not None]
+    context = {
+        'plan': plan,
+        'spec_content': spec_content,
+        'spec_path': spec_path,
+        'plugins_dir': plugins_dir,
+        'orphans_ok': orphans_ok,
+    }
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_check, name, strict, **context) for name in names]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run all execution plan checks on a single parse',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Checks performed:
+    validate-toon, check-dependencies, check-agents,
+    check-coverage (only with --spec), simulate-execution
+
+Examples:
+    %(prog)s execution-plan.toon --spec spec.md --plugins-dir ./plugins
+    %(prog)s execution-plan.toon --spec spec.toon --strict --json
+        """
+    )
+    parser.add_argument('plan', type=Path, help='Execution plan file (.toon)')
+    parser.add_argument('--spec', type=Path, help='Specification file (.md or .toon) for coverage')
+    parser.add_argument(
+        '--plugins-dir', '-p', type=Path,
+        help='Path to plugins directory (auto-detected if not specified)'
+    )
+    parser.add_argument('--strict', action='store_true', help='Treat validate-toon and check-dependencies warnings as errors')
+    parser.add_argument('--orphans-ok', action='store_true',
+                        help='Don\'t warn about tasks without spec mapping')
+    parser.add_argument('--json', action='store_true', help='Emit the merged report as JSON')
+    parser.add_argument('--workers', type=int, default=4, help='Thread pool size')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Only output on error')
+
+    args = parser.parse_args()
+
+    if not args.plan.exists():
+        print(f"ERROR: Plan not found: {args.plan}", file=sys.stderr)
+        sys.exit(2)
+
+    spec_content = None
+    if args.spec:
+        if not args.spec.exists():
+            print(f"ERROR: Spec not found: {args.spec}", file=sys.stderr)
+            sys.exit(2)
+        try:
+            spec_content = args.spec.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"ERROR: Failed to read spec: {e}", file=sys.stderr)
+            sys.exit(2)
+
+    plugins_dir = args.plugins_dir
+    if not plugins_dir:
+        plugins_dir = check_agents.find_plugins_dir(args.plan) or check_agents.find_plugins_dir(Path.cwd())
+    if plugins_dir and not plugins_dir.is_dir():
+        print(f"ERROR: Plugins directory not found: {plugins_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    start = time.perf_counter()
+    try:
+        plan = parse_plan_file(args.plan)
+    except Exception as e:
+        print(f"ERROR: Failed to read {args.plan}: {e}", file=sys.stderr)
+        sys.exit(2)
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    reports = run_pipeline(plan, spec_content, args.spec, plugins_dir,
+                           strict=args.strict, orphans_ok=args.orphans_ok, workers=args.workers)
+    total_ms = (time.perf_counter() - start) * 1000
+    all_valid = all(report.valid for report in reports)
+
+    if args.json:
+        print(json.dumps({
+            'plan': str(args.plan),
+            'spec': str(args.spec) if args.spec else None,
+            'valid': all_valid,
+            'parse_ms': round(parse_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'checks': [{**report._asdict(), 'duration_ms': round(report.duration_ms, 2)}
+                       for report in reports],
+        }, indent=2))
+        sys.exit(0 if all_valid else 1)
+
+    for report in reports:
+        if not report.valid:
+            print(f"INVALID [{report.name}] ({report.duration_ms:.1f}ms)", file=sys.stderr)
+            for error in report.errors:
+                print(f"  ERROR: {error}", file=sys.stderr)
+            for warning in report.warnings:
+                print(f"  WARNING: {warning}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"VALID [{report.name}] ({report.duration_ms:.1f}ms)")
+            for warning in report.warnings:
+                print(f"  WARNING: {warning}")
+
+    if not args.quiet or not all_valid:
+        status = "PASSED" if all_valid else "FAILED"
+        print(f"{status}: {sum(r.valid for r in reports)}/{len(reports)} checks "
+              f"(parse {parse_ms:.1f}ms, total {total_ms:.1f}ms)",
+              file=sys.stdout if all_valid else sys.stderr)
+
+    sys.exit(0 if all_valid else 1)
+
+
+if __name__ == '__main__':
+    main()
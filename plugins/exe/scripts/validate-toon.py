@@ -17,6 +17,12 @@ import sys
 from pathlib import Path
 from typing import NamedTuple
 
+from toon import BLANK, BLOCK, COMMENT, PROPERTY, TEXT, ExecutionPlan, parse_plan
+
+
+# CSV-style table row
+ROW_PATTERN = re.compile(r'\S+,\S+')
+
 
 class ValidationResult(NamedTuple):
     valid: bool
@@ -26,41 +32,38 @@ class ValidationResult(NamedTuple):
 
 def validate_toon(content: str, filename: str) -> ValidationResult:
     """Validate TOON content structure."""
+    return validate_plan(parse_plan(content))
+
+
+def validate_plan(plan: ExecutionPlan) -> ValidationResult:
+    """Validate the structure of an already tokenized TOON document."""
     errors = []
     warnings = []
-    lines = content.split('\n')
+    tokens = plan.tokens
 
-    # Check for @type marker (required)
-    has_type = any(re.match(r'^@type:\s*\S+', line) for line in lines)
-    if not has_type:
+    # Check for @type and @id markers (required)
+    top_level = {t.key for t in tokens if t.kind == PROPERTY and t.indent == 0 and t.value}
+    if '@type' not in top_level:
         errors.append("Missing required @type marker")
-
-    # Check for @id marker (required)
-    has_id = any(re.match(r'^@id:\s*\S+', line) for line in lines)
-    if not has_id:
+    if '@id' not in top_level:
         errors.append("Missing required @id marker")
 
-    # Check for unclosed brackets/arrays
+    # Check for unclosed brackets/arrays. A table header's {field,list}
+    # is part of the header, not an open block.
     bracket_stack = []
-    for i, line in enumerate(lines, 1):
-        # Skip comment lines
-        if line.strip().startswith('#'):
+    for token in tokens:
+        if token.kind in (BLANK, BLOCK, COMMENT):
             continue
-
-        # Track array declarations like "phases[3]:" or "tasks[N,]{"
-        array_match = re.search(r'\[(\d+|\w+),?\]', line)
-        if array_match and '{' in line:
-            bracket_stack.append((i, 'array-object'))
-
-        # Simple bracket tracking for nested structures
-        for char in line:
+        text = token.value if token.kind == PROPERTY else token.text
+        opener = 'array-object' if token.length is not None else '{'
+        for char in text:
             if char == '{':
-                bracket_stack.append((i, '{'))
+                bracket_stack.append((token.line_no, opener))
             elif char == '}':
-                if bracket_stack and bracket_stack[-1][1] in ('{', 'array-object'):
+                if bracket_stack:
                     bracket_stack.pop()
                 else:
-                    errors.append(f"Line {i}: Unmatched closing brace '}}'" )
+                    errors.append(f"Line {token.line_no}: Unmatched closing brace '}}'")
 
     # Report unclosed brackets
     for line_num, bracket_type in bracket_stack:
@@ -71,33 +74,24 @@ def validate_toon(content: str, filename: str) -> ValidationResult:
 
     # Check for common TOON patterns
     # Valid property patterns: "key: value" or "key:" on its own line
-    property_pattern = re.compile(r'^(\s*)(\w[\w\-\.]*|\@\w+)(\[.*?\])?:\s*(.*)?$')
-
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-
-        # Skip empty lines, comments, pure values (in arrays), and closing braces
-        if not stripped or stripped.startswith('#') or stripped == '}':
+    for token in tokens:
+        if token.kind != TEXT or ':' not in token.text:
             continue
 
         # Skip lines that are just values (in multi-line arrays)
-        if re.match(r'^\s+\S+,\S+', line):  # CSV-style array row
-            continue
-        if re.match(r'^\s+-\s+', line):  # YAML-style list item
+        if token.indent and (ROW_PATTERN.match(token.text) or token.text.startswith('- ')):
             continue
 
-        # Check if line looks like a property
-        if ':' in stripped and not property_pattern.match(line):
-            # Could be a value containing colons (like URLs) - just warn
-            if not stripped.startswith('http') and '://' not in stripped:
-                warnings.append(f"Line {i}: Unusual property format: {stripped[:50]}...")
+        # Could be a value containing colons (like URLs) - just warn
+        stripped = token.text
+        if not stripped.startswith('http') and '://' not in stripped:
+            warnings.append(f"Line {token.line_no}: Unusual property format: {stripped[:50]}...")
 
     # Validate specific execution-plan structure if this looks like one
-    if 'execution-plan' in content.lower():
+    if any('execution-plan' in token.text.lower() for token in tokens):
         required_sections = ['phases', 'executionOrder']
         for section in required_sections:
-            pattern = rf'^{section}\[.*?\]:'
-            if not any(re.match(pattern, line) for line in lines):
+            if section not in plan.sections:
                 warnings.append(f"Execution plan missing expected section: {section}")
 
     return ValidationResult(
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark status line refresh latency: cold process vs. daemon client.
+
+Builds a synthetic transcript and project, then measures wall-clock time
+per refresh for:
+- cold:   a fresh `status_line.py` process per refresh (what Claude Code does)
+- daemon: a fresh `status_line_client.py` process talking to a warm daemon
+
+Usage:
+    python status_line_latency.py
+    python status_line_latency.py --runs 200 --transcript-lines 50000
+    python status_line_latency.py --cold-cmd "uv run --script"
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+STATUS_LINE = SCRIPTS_DIR / "status_line.py"
+CLIENT = SCRIPTS_DIR / "status_line_client.py"
+
+
+def write_transcript(path: Path, lines: int) -> None:
+    """Write a synthetic session transcript with usage on every entry."""
+    with open(path, "w") as f:
+        for i in range(lines):
+            f.write(json.dumps({
+                "timestamp": f"2025-01-01T00:{i // 3600 % 60:02d}:{i % 60:02d}.{i:06d}Z",
+                "isSidechain": i % 5 == 0,
+                "message": {
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": "x" * 200}],
+                    "usage": {
+                        "input_tokens": 10,
+                        "output_tokens": 200,
+                        "cache_read_input_tokens": 5000,
+                        "cache_creation_input_tokens": 100,
+                    },
+                },
+            }) + "\n")
+
+
+def time_refreshes(cmd: list[str], payload: bytes, runs: int, env: dict) -> list[float]:
+    """Run cmd once per refresh and return latencies in milliseconds."""
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, input=payload, stdout=subprocess.DEVNULL, env=env, check=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def wait_for_socket(path: str, timeout: float = 5.0) -> bool:
+    """Wait until the daemon socket exists."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare cold-process and daemon status line latency')
+    parser.add_argument('--runs', type=int, default=50, help='Refreshes per mode')
+    parser.add_argument('--transcript-lines', type=int, default=20000,
+                        help='Synthetic transcript length')
+    parser.add_argument('--cold-cmd', default=sys.executable,
+                        help='Launcher for the cold path (e.g. "uv run --script")')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        transcript = tmp_dir / "session.jsonl"
+        write_transcript(transcript, args.transcript_lines)
+
+        project_dir = tmp_dir / "project"
+        (project_dir / ".claude").mkdir(parents=True)
+        (project_dir / ".claude" / "project-info.toon").write_text(json.dumps({"currentFocus": "bench"}))
+
+        payload = json.dumps({
+            "workspace": {"current_dir": str(project_dir), "project_dir": str(project_dir)},
+            "transcript_path": str(transcript),
+            "cost": {"total_duration_ms": 120000, "total_api_duration_ms": 60000},
+        }).encode()
+
+        sock = str(tmp_dir / "status.sock")
+        env = dict(os.environ, HOME=str(tmp_dir), LUC_STATUS_SOCKET=sock)
+
+        cold = time_refreshes(
+            [*shlex.split(args.cold_cmd), str(STATUS_LINE)], payload, args.runs, env
+        )
+
+        daemon = subprocess.Popen(
+            [sys.executable, str(STATUS_LINE), "--daemon", "--socket", sock],
+            env=env, stderr=subprocess.DEVNULL
+        )
+        try:
+            if not wait_for_socket(sock):
+                print("ERROR: daemon did not start", file=sys.stderr)
+                sys.exit(1)
+            # Warm the daemon's in-memory state before timing
+            time_refreshes([sys.executable, str(CLIENT)], payload, 1, env)
+            warm = time_refreshes([sys.executable, str(CLIENT)], payload, args.runs, env)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"Status line refresh latency ({args.runs} runs, {args.transcript_lines} transcript lines)")
+    print(f"| Mode | p50 | p99 | mean |")
+    print(f"|------|-----|-----|------|")
+    for name, values in (("cold process", cold), ("daemon client", warm)):
+        print(f"| {name} | {percentile(values, 50):.1f}ms | {percentile(values, 99):.1f}ms "
+              f"| {statistics.fmean(values):.1f}ms |")
+
+
+if __name__ == '__main__':
+    main()
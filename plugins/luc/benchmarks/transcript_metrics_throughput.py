@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark transcript parsing throughput on a large synthetic transcript.
+
+Builds a session transcript of the requested size (tool results and user
+prompts dominate the bytes, as in real sessions) and times:
+- full decode: json.loads on every line (the previous status line / harness loop)
+- engine + json:   transcript_metrics with the stdlib decoder
+- engine + orjson: transcript_metrics with orjson (when installed)
+
+Usage:
+    python transcript_metrics_throughput.py
+    python transcript_metrics_throughput.py --size-mb 500 --runs 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from transcript_metrics import TranscriptMetrics, parse_transcript_file  # noqa: E402
+
+
+def write_transcript(path: Path, size_mb: int, seed: int = 0) -> int:
+    """Write a synthetic transcript of roughly size_mb; returns line count."""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    written = lines = 0
+    with open(path, "w") as f:
+        while written < target:
+            stamp = f"2025-01-01T{lines // 3600 % 24:02d}:{lines // 60 % 60:02d}:{lines % 60:02d}.{lines % 1000:03d}Z"
+            kind = rng.random()
+            if kind < 0.45:
+                entry = {"timestamp": stamp, "type": "user", "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"toolu_{lines}", "content": "r" * rng.randint(200, 8000)}]}}
+            elif kind < 0.6:
+                entry = {"timestamp": stamp, "type": "user", "message": {"role": "user", "content": "p" * rng.randint(50, 2000)}}
+            elif kind < 0.95:
+                entry = {"timestamp": stamp, "isSidechain": rng.random() < 0.3, "message": {
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": "t" * rng.randint(50, 1500)}],
+                    "usage": {"input_tokens": rng.randint(1, 50), "output_tokens": rng.randint(1, 800),
+                              "cache_read_input_tokens": rng.randint(0, 90000),
+                              "cache_creation_input_tokens": rng.randint(0, 3000)}}}
+            else:
+                entry = {"timestamp": stamp, "message": {
+                    "role": "assistant",
+                    "content": [{"type": "tool_use", "name": "Task", "id": f"toolu_{lines}",
+                                 "input": {"model": rng.choice(("haiku", "sonnet", "opus")), "prompt": "q" * 400}}],
+                    "usage": {"input_tokens": 3, "output_tokens": 120}}}
+            line = json.dumps(entry) + "\n"
+            f.write(line)
+            written += len(line)
+            lines += 1
+    return lines
+
+
+def full_decode(path: Path) -> int:
+    """The previous approach: decode every line, then dig for usage."""
+    total = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            usage = data.get("message", {}).get("usage", {})
+            if usage:
+                total += usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+    return total
+
+
+def time_runs(fn, runs: int) -> list[float]:
+    """Wall-clock seconds per run."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcript parsing throughput benchmark')
+    parser.add_argument('--size-mb', type=int, default=100, help='Synthetic transcript size')
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per parser')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        transcript = Path(tmp) / "session.jsonl"
+        lines = write_transcript(transcript, args.size_mb)
+        size_mb = transcript.stat().st_size / (1024 * 1024)
+
+        parsers = [
+            ("full decode (json)", lambda: full_decode(transcript)),
+            ("engine + json", lambda: parse_transcript_file(transcript, decode=json.loads)),
+        ]
+        try:
+            import orjson
+            parsers.append(("engine + orjson", lambda: parse_transcript_file(transcript, decode=orjson.loads)))
+        except ImportError:
+            print("orjson not installed; skipping engine + orjson", file=sys.stderr)
+
+        metrics: TranscriptMetrics = parse_transcript_file(transcript)
+        print(f"Transcript: {size_mb:.0f} MB, {lines} lines, "
+              f"{metrics.decoded_lines} decoded by the engine ({metrics.decoded_lines / lines * 100:.0f}%)")
+        print(f"| Parser | median | MB/s |")
+        print(f"|--------|--------|------|")
+        for name, fn in parsers:
+            median = statistics.median(time_runs(fn, args.runs))
+            print(f"| {name} | {median * 1000:.0f}ms | {size_mb / median:.0f} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,27 +9,126 @@ Updates every 300ms when conversation changes.
 """
 import sys
 import json
+import argparse
+import hashlib
+import os
+import socket
 import subprocess
+import tempfile
+import time
 from pathlib import Path
 
+from status_line_client import CLIENT_TIMEOUT_SECONDS, socket_path
+from transcript_metrics import TranscriptMetrics
+
 # Will be set dynamically from stdin input
 workspace_root: Path | None = None
 project_info: dict | None = None
 
+# Persistent state shared between the short-lived status line processes
+CACHE_DIR = Path.home() / ".cache" / "luc" / "status_line"
+
+# In daemon mode state stays in memory; short-lived processes persist it
+PERSIST_STATE = True
+_memory_state: dict[str, dict] = {}
+
+# Extracted project-info/session-summary fields keyed by file
+FILE_CACHE_NAME = "files.json"
+
+# Daemon exits after this long without a request
+DAEMON_IDLE_TIMEOUT_SECONDS = 3600
+
+# Bytes hashed at the start of a transcript to detect rewrites
+CHECKPOINT_HEAD_BYTES = 4096
+
+# Transcript checkpoints are one state file per session. Whenever a new
+# transcript is checkpointed, ones older than the age limit and all but the
+# newest CHECKPOINT_MAX_FILES are removed, so finished sessions don't pile up.
+CHECKPOINT_PREFIX = "transcript-"
+CHECKPOINT_MAX_FILES = 32
+CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Working tree edits do not touch the index, so cached git counts expire
+GIT_CACHE_TTL_SECONDS = 10
+
+# Overall budget for the concurrent `git status`/`git log` forks; well under
+# CLIENT_TIMEOUT_SECONDS so a daemon render that hits it still reaches the client
+GIT_DEADLINE_SECONDS = 1.0
+
+
+def _read_state(name: str) -> dict | None:
+    """Read a persisted state file from the cache directory."""
+    if name in _memory_state:
+        return _memory_state[name]
+    try:
+        with open(CACHE_DIR / name) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_state(name: str, data: dict) -> None:
+    """Atomically persist a state file to the cache directory."""
+    _memory_state[name] = data
+    if not PERSIST_STATE:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{name}.")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, CACHE_DIR / name)
+    except OSError:
+        pass
+
+
+def _load_cached_fields(path: Path, extract) -> dict:
+    """Load the fields the status line uses from a JSON file.
+
+    extract(data) -> dict picks the fields out of the parsed file. Results
+    are cached on disk keyed by (path, mtime_ns, size), so an unchanged
+    file costs a stat instead of a read and parse. Raises OSError if the
+    file is missing and json.JSONDecodeError if it is malformed.
+    """
+    stat = path.stat()
+    fingerprint = [stat.st_mtime_ns, stat.st_size]
+
+    cache = _read_state(FILE_CACHE_NAME) or {}
+    entry = cache.get(str(path))
+    if entry and entry.get("fingerprint") == fingerprint:
+        return entry["fields"]
+
+    with open(path) as f:
+        data = json.load(f)
+    fields = extract(data if isinstance(data, dict) else {})
+
+    cache[str(path)] = {"fingerprint": fingerprint, "fields": fields}
+    _write_state(FILE_CACHE_NAME, cache)
+    return fields
+
+
+def _extract_project_fields(data: dict) -> dict:
+    """Fields of workspace-info.toon/project-info.toon used for focus."""
+    return {"currentFocus": data.get("currentFocus"), "focus": data.get("focus")}
+
+
+def _extract_session_fields(data: dict) -> dict:
+    """Fields of sessions_summary.json used for focus."""
+    summary = data.get("summary", {})
+    return {"currentFocusedOutcome": summary.get("currentFocusedOutcome", "No Focus Set")}
+
 
 def load_project_info(project_dir: Path) -> dict | None:
-    """Load workspace-info.toon or project-info.toon from .claude directory."""
+    """Load focus fields of workspace-info.toon or project-info.toon from .claude directory."""
     claude_dir = project_dir / ".claude"
 
     # Try workspace-info.toon first, then project-info.toon
     for filename in ["workspace-info.toon", "project-info.toon"]:
         info_file = claude_dir / filename
-        if info_file.exists():
-            try:
-                with open(info_file) as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
-                continue
+        try:
+            return _load_cached_fields(info_file, _extract_project_fields)
+        except (json.JSONDecodeError, OSError, AttributeError):
+            continue
     return None
 
 # ANSI color codes matching Claude Code CLI theme
@@ -75,14 +174,12 @@ class Icons:
 
 
 def load_session_summary(project_dir: Path | None) -> dict | None:
-    """Load session summary data from project's status directory."""
+    """Load focus fields of the session summary from project's status directory."""
     if not project_dir:
         return None
     try:
         summary_file = project_dir / "status/sessions_summary.json"
-        if summary_file.exists():
-            with open(summary_file) as f:
-                return json.load(f)
+        return _load_cached_fields(summary_file, _extract_session_fields)
     except Exception:
         pass
     return None
@@ -92,85 +189,174 @@ def get_focused_outcome(session_data):
     """Get currently focused outcome name."""
     if not session_data:
         return None
-    outcome = session_data.get("summary", {}).get("currentFocusedOutcome", "No Focus Set")
+    outcome = session_data.get("currentFocusedOutcome", "No Focus Set")
     return outcome if outcome != "No Focus Set" else None
 
 
-def get_git_branch(project_dir: Path | None) -> str:
-    """Get current git branch name."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=1,
-            cwd=project_dir
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return "unknown"
+def find_git_dirs(project_dir: Path | None) -> tuple[Path, Path] | None:
+    """Locate the git dir and common dir for project_dir without forking git.
+
+    Handles both regular checkouts (``.git`` directory) and linked worktrees
+    (``.git`` file containing ``gitdir: <path>``).
+    """
+    start = (project_dir or Path.cwd()).resolve()
+    for directory in [start, *start.parents]:
+        dot_git = directory / ".git"
+        try:
+            if dot_git.is_dir():
+                git_dir = dot_git
+            elif dot_git.is_file():
+                content = dot_git.read_text().strip()
+                if not content.startswith("gitdir:"):
+                    return None
+                git_dir = (directory / content[len("gitdir:"):].strip()).resolve()
+            else:
+                continue
+
+            common_dir = git_dir
+            commondir_file = git_dir / "commondir"
+            if commondir_file.is_file():
+                common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+            return git_dir, common_dir
+        except OSError:
+            return None
+    return None
 
 
-def get_git_worktree_name(project_dir: Path | None) -> str:
-    """Get current git worktree name."""
+def read_git_head(git_dir: Path) -> str | None:
+    """Read the symbolic ref (or detached commit) stored in HEAD."""
     try:
-        # Check if we're in a worktree
-        result = subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
-            capture_output=True,
-            text=True,
-            timeout=1,
-            cwd=project_dir
-        )
-        if result.returncode == 0:
-            git_dir = result.stdout.strip()
-            # If git-dir ends with .git/worktrees/<name>, extract the name
-            if "/worktrees/" in git_dir:
-                worktree_name = git_dir.split("/worktrees/")[-1]
-                return worktree_name
-            # Otherwise, not in a worktree
-            return "none"
-    except Exception:
-        pass
-    return "none"
+        return (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
 
 
-def get_git_changes(project_dir: Path | None) -> int:
-    """Get count of changed files."""
-    try:
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            timeout=1,
-            cwd=project_dir
-        )
-        if result.returncode == 0:
-            lines = [l for l in result.stdout.strip().split('\n') if l]
-            return len(lines) if lines else 0
-    except Exception:
-        pass
-    return 0
+def _branch_from_head(head: str | None) -> str:
+    """Branch name as reported by ``git rev-parse --abbrev-ref HEAD``."""
+    if not head:
+        return "unknown"
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        return ref.removeprefix("refs/heads/")
+    return "HEAD"  # Detached
 
 
-def get_commits_today(project_dir: Path | None) -> int:
-    """Get count of commits in the last 24 hours."""
-    try:
-        result = subprocess.run(
-            ["git", "log", "--since=1 day ago", "--format=%h"],
-            capture_output=True,
-            text=True,
-            timeout=1,
-            cwd=project_dir
-        )
-        if result.returncode == 0:
-            commits = [l for l in result.stdout.strip().split('\n') if l]
-            return len(commits)
-    except Exception:
-        pass
-    return 0
+def _worktree_from_git_dir(git_dir: Path) -> str:
+    """Worktree name if git_dir is .git/worktrees/<name>, else "none"."""
+    if git_dir.parent.name == "worktrees":
+        return git_dir.name
+    return "none"
+
+
+def _git_fingerprint(git_dir: Path, common_dir: Path, head: str | None) -> list[int]:
+    """mtimes of the index and refs that `git status`/`git log` depend on."""
+    paths = [
+        git_dir / "index",
+        git_dir / "HEAD",
+        git_dir / "logs" / "HEAD",
+        common_dir / "packed-refs",
+    ]
+    if head and head.startswith("ref:"):
+        paths.append(common_dir / head[len("ref:"):].strip())
+
+    fingerprint = []
+    for path in paths:
+        try:
+            fingerprint.append(path.stat().st_mtime_ns)
+        except OSError:
+            fingerprint.append(0)
+    return fingerprint
+
+
+def _run_git_concurrently(project_dir: Path | None, commands: list[list[str]],
+                          deadline: float) -> list[str | None]:
+    """Run git commands in parallel, sharing one overall deadline (seconds).
+
+    Returns stdout per command, or None if it failed or missed the deadline.
+    """
+    procs = []
+    for args in commands:
+        try:
+            procs.append(subprocess.Popen(
+                ["git", "--no-optional-locks", *args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                cwd=project_dir
+            ))
+        except OSError:
+            procs.append(None)
+
+    end = time.monotonic() + deadline
+    outputs = []
+    for proc in procs:
+        if proc is None:
+            outputs.append(None)
+            continue
+        try:
+            stdout, _ = proc.communicate(timeout=max(0.0, end - time.monotonic()))
+            outputs.append(stdout if proc.returncode == 0 else None)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            outputs.append(None)
+    return outputs
+
+
+def _count_lines(output: str | None) -> int:
+    """Count non-empty lines of command output."""
+    if not output:
+        return 0
+    return sum(1 for line in output.splitlines() if line)
+
+
+def get_git_info(project_dir: Path | None) -> dict:
+    """Get branch, worktree, changed file count and commits in the last day.
+
+    Branch and worktree are read straight from the git dir. `git status` and
+    `git log` only run when the index or ref mtimes changed (or the cached
+    counts are older than GIT_CACHE_TTL_SECONDS, since working tree edits do
+    not touch the index), and then run concurrently under one deadline.
+    """
+    info = {"branch": "unknown", "worktree": "none", "changes": 0, "commits_today": 0}
+
+    dirs = find_git_dirs(project_dir)
+    if not dirs:
+        return info
+    git_dir, common_dir = dirs
+
+    head = read_git_head(git_dir)
+    info["branch"] = _branch_from_head(head)
+    info["worktree"] = _worktree_from_git_dir(git_dir)
+
+    cache_name = f"git-{hashlib.sha1(str(git_dir).encode()).hexdigest()[:16]}.json"
+    fingerprint = _git_fingerprint(git_dir, common_dir, head)
+    cached = _read_state(cache_name)
+    if (
+        cached
+        and cached.get("fingerprint") == fingerprint
+        and time.time() - cached.get("checked_at", 0) < GIT_CACHE_TTL_SECONDS
+    ):
+        info["changes"] = cached["changes"]
+        info["commits_today"] = cached["commits_today"]
+        return info
+
+    status_out, log_out = _run_git_concurrently(
+        project_dir,
+        [["status", "--porcelain"], ["log", "--since=1 day ago", "--format=%h"]],
+        GIT_DEADLINE_SECONDS
+    )
+    info["changes"] = _count_lines(status_out)
+    info["commits_today"] = _count_lines(log_out)
+
+    if status_out is not None and log_out is not None:
+        _write_state(cache_name, {
+            "fingerprint": fingerprint,
+            "checked_at": time.time(),
+            "changes": info["changes"],
+            "commits_today": info["commits_today"],
+        })
+    return info
 
 
 def format_duration(ms):
@@ -195,67 +381,116 @@ def format_tokens(count):
         return str(count)
 
 
+def _head_digest(f, length: int) -> str:
+    """Hash the first bytes of a transcript to detect in-place rewrites."""
+    f.seek(0)
+    return hashlib.sha1(f.read(min(length, CHECKPOINT_HEAD_BYTES))).hexdigest()
+
+
+def _transcript_checkpoint_name(transcript_path: Path) -> str:
+    """Cache file name for a transcript checkpoint."""
+    key = hashlib.sha1(str(transcript_path.resolve()).encode()).hexdigest()[:16]
+    return f"{CHECKPOINT_PREFIX}{key}.json"
+
+
+def _prune_checkpoints(keep: str) -> None:
+    """Drop stale and surplus transcript checkpoints, never `keep`."""
+    in_memory = [name for name in _memory_state if name.startswith(CHECKPOINT_PREFIX) and name != keep]
+    for name in in_memory[:max(0, len(in_memory) - (CHECKPOINT_MAX_FILES - 1))]:
+        del _memory_state[name]
+    if not PERSIST_STATE:
+        return
+
+    try:
+        checkpoints = sorted(
+            ((entry.stat().st_mtime, entry.path) for entry in os.scandir(CACHE_DIR)
+             if entry.name.startswith(CHECKPOINT_PREFIX) and entry.name != keep),
+            reverse=True,
+        )
+    except OSError:
+        return
+    cutoff = time.time() - CHECKPOINT_MAX_AGE_SECONDS
+    for index, (mtime, path) in enumerate(checkpoints):
+        if index >= CHECKPOINT_MAX_FILES - 1 or mtime < cutoff:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
 def parse_transcript_tokens(transcript_path):
-    """Parse transcript file to extract token usage."""
+    """Parse transcript file to extract token usage.
+
+    Only the bytes appended since the previous refresh are parsed. A
+    checkpoint (byte offset, inode/size fingerprint and running totals) is
+    persisted per transcript; truncation or rotation of the file triggers a
+    full rescan. Checkpointing a new transcript prunes old checkpoints.
+    """
     try:
-        if not Path(transcript_path).exists():
+        path = Path(transcript_path)
+        if not path.exists():
             return None
 
-        input_tokens = 0
-        output_tokens = 0
-        cache_read_tokens = 0
-        cache_creation_tokens = 0
-        context_length = 0
-        most_recent_timestamp = None
-
-        with open(transcript_path, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    usage = data.get("message", {}).get("usage", {})
-
-                    if usage:
-                        input_tokens += usage.get("input_tokens", 0)
-                        output_tokens += usage.get("output_tokens", 0)
-                        cache_read_tokens += usage.get("cache_read_input_tokens", 0)
-                        cache_creation_tokens += usage.get("cache_creation_input_tokens", 0)
-
-                        # Track most recent main chain entry for context length
-                        is_sidechain = data.get("isSidechain", False)
-                        timestamp = data.get("timestamp")
-                        is_error = data.get("isApiErrorMessage", False)
-
-                        if not is_sidechain and timestamp and not is_error:
-                            if most_recent_timestamp is None or timestamp > most_recent_timestamp:
-                                most_recent_timestamp = timestamp
-                                # Context length = input + cache tokens from most recent message
-                                context_length = (
-                                        usage.get("input_tokens", 0) +
-                                        usage.get("cache_read_input_tokens", 0) +
-                                        usage.get("cache_creation_input_tokens", 0)
-                                )
-                except (json.JSONDecodeError, AttributeError):
-                    continue
-
-        total_cache = cache_read_tokens + cache_creation_tokens
+        stat = path.stat()
+        checkpoint_name = _transcript_checkpoint_name(path)
+        checkpoint = _read_state(checkpoint_name)
+
+        with open(path, 'rb') as f:
+            metrics = None
+            if (
+                checkpoint
+                and checkpoint.get("dev") == stat.st_dev
+                and checkpoint.get("ino") == stat.st_ino
+                and checkpoint.get("offset", 0) <= stat.st_size
+                and checkpoint.get("head") == _head_digest(f, checkpoint.get("offset", 0))
+            ):
+                metrics = TranscriptMetrics.from_state(checkpoint.get("metrics"))
+                offset = checkpoint["offset"]
+            if metrics is None:
+                # First run, rotation or truncation: rescan from the start
+                metrics = TranscriptMetrics()
+                offset = 0
+
+            f.seek(offset)
+            appended = f.read()
+
+            # Only consume complete lines; a partially written last line is
+            # counted for this refresh but re-read next time.
+            last_newline = appended.rfind(b"\n")
+            complete, partial = appended[:last_newline + 1], appended[last_newline + 1:]
+            if complete:
+                metrics.feed(complete)
+                offset += len(complete)
+                _write_state(checkpoint_name, {
+                    "dev": stat.st_dev,
+                    "ino": stat.st_ino,
+                    "offset": offset,
+                    "head": _head_digest(f, offset),
+                    "metrics": metrics.finish().to_state(),
+                })
+                if checkpoint is None:
+                    _prune_checkpoints(checkpoint_name)
+
+        if partial.strip():
+            metrics = metrics.copy()
+            metrics.feed(partial)
 
         return {
-            "input": input_tokens,
-            "output": output_tokens,
-            "cache": total_cache,
-            "total": input_tokens + output_tokens + total_cache,
-            "context": context_length,
-            "total_cached": cache_creation_tokens  # Total tokens stored in cache
+            "input": metrics.input_tokens,
+            "output": metrics.output_tokens,
+            "cache": metrics.cache_tokens,
+            "total": metrics.total_tokens,
+            "context": metrics.context_tokens,
+            "total_cached": metrics.cache_creation_tokens  # Total tokens stored in cache
         }
     except Exception:
         return None
 
 
-def main():
-    """Generate status line from Claude Code session context."""
+def render_status(payload: str | bytes) -> str:
+    """Render the status line for one Claude Code stdin payload."""
     try:
-        # Read JSON input from Claude Code via stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = json.loads(payload)
 
         # Extract workspace data and determine project directory
         workspace = input_data.get("workspace", {})
@@ -296,10 +531,10 @@ def main():
             efficiency_text = "0%"
 
         # Get git information
-        git_branch = get_git_branch(project_dir)
-        git_worktree = get_git_worktree_name(project_dir)
-        git_changes = get_git_changes(project_dir)
-        commits_today = get_commits_today(project_dir)
+        git_info = get_git_info(project_dir)
+        git_branch = git_info["branch"]
+        git_worktree = git_info["worktree"]
+        commits_today = git_info["commits_today"]
 
         # Get lines changed from cost data
         lines_added = cost_data.get("total_lines_added", 0)
@@ -377,15 +612,88 @@ def main():
         # Line 3: Cwd (dim white for path)
         line3 = f"{Colors.CYAN}{Icons.CWD}{Colors.RESET} {Colors.WHITE}{cwd}{Colors.RESET}"
 
-        # Output status line
-        print(f"{line1}\n{line2}\n{line3}")
+        return f"{line1}\n{line2}\n{line3}"
 
     except json.JSONDecodeError:
         # Fallback if no valid JSON input
-        print("lucid_stack\nNo data\nNo cwd")
+        return "lucid_stack\nNo data\nNo cwd"
     except Exception as e:
         # Fallback with error indication
-        print(f"lucid_stack\nerr: {type(e).__name__}\nNo cwd")
+        return f"lucid_stack\nerr: {type(e).__name__}\nNo cwd"
+
+
+def _handle_client(conn: socket.socket) -> None:
+    """Serve one status line request over a daemon connection."""
+    with conn:
+        conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+        chunks = []
+        while chunk := conn.recv(65536):
+            chunks.append(chunk)
+        conn.sendall(render_status(b"".join(chunks)).encode())
+
+
+def serve_daemon(socket_path: str, idle_timeout: float) -> None:
+    """Serve status line requests on a Unix socket until idle_timeout elapses.
+
+    Transcript checkpoints, git snapshots and project info stay warm in
+    memory between requests instead of being reloaded from disk.
+    """
+    global PERSIST_STATE
+    PERSIST_STATE = False
+
+    if os.path.exists(socket_path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(socket_path)
+            print(f"Daemon already running on {socket_path}", file=sys.stderr)
+            return
+        except OSError:
+            os.unlink(socket_path)  # Stale socket from a dead daemon
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(8)
+        server.settimeout(idle_timeout)
+
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            try:
+                _handle_client(conn)
+            except OSError:
+                continue
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def main():
+    """Generate status line from Claude Code session context."""
+    parser = argparse.ArgumentParser(description='Claude Code status line')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Serve requests from status_line_client.py over a Unix socket')
+    parser.add_argument('--socket', default=socket_path(),
+                        help='Daemon socket path (default: %(default)s)')
+    parser.add_argument('--idle-timeout', type=float, default=DAEMON_IDLE_TIMEOUT_SECONDS,
+                        help='Exit the daemon after this many idle seconds')
+    args = parser.parse_args()
+
+    if args.daemon:
+        serve_daemon(args.socket, args.idle_timeout)
+        return
+
+    # Read JSON input from Claude Code via stdin
+    print(render_status(sys.stdin.read()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+#!/usr/bin/env -S python3 -S
+"""Thin client for the status_line.py daemon.
+
+Pipes the Claude Code stdin JSON to a running `status_line.py --daemon`
+over a Unix socket and prints the rendered lines. When no daemon is
+listening it falls back to rendering in-process.
+
+Deliberately imports only os, socket and sys so startup stays cheap.
+"""
+import os
+import socket
+import sys
+
+# Upper bound for one round trip to the daemon. Kept well above the daemon's
+# git deadline (status_line.GIT_DEADLINE_SECONDS): a render that waited on a
+# slow git must still arrive, or the fallback would run git a second time.
+CLIENT_TIMEOUT_SECONDS = 2.5
+
+
+def socket_path() -> str:
+    """Per-user daemon socket path (override with LUC_STATUS_SOCKET)."""
+    override = os.environ.get("LUC_STATUS_SOCKET")
+    if override:
+        return override
+    tmp_dir = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmp_dir, f"luc-status-line-{os.getuid()}.sock")
+
+
+def request_status(payload: bytes, path: str) -> bytes | None:
+    """Send payload to the daemon and return its response, or None if absent."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+            sock.connect(path)
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+    return b"".join(chunks) or None
+
+
+def main():
+    payload = sys.stdin.buffer.read()
+
+    response = request_status(payload, socket_path())
+    if response is not None:
+        sys.stdout.buffer.write(response + b"\n")
+        return
+
+    # No daemon: render in this process
+    from status_line import render_status
+    print(render_status(payload))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Streaming metrics engine for Claude Code JSONL transcripts.
+
+Shared by the luc status line and the analyst benchmark harness so both
+read transcripts the same way:
+
+    metrics = TranscriptMetrics()
+    for line in f:                 # binary mode
+        metrics.feed_line(line)
+
+or, to watch totals grow while a large file is scanned:
+
+    for offset, metrics in scan_transcript(path):
+        ...
+
+Lines are screened with a byte search before decoding: only lines
+containing "usage" or "tool_use" can change token totals or agent
+counts, so everything else (user prompts, tool results, summaries) is
+never handed to the JSON decoder. orjson is used when installed.
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+try:
+    import orjson
+    loads: Callable = orjson.loads
+    DECODE_ERRORS: tuple = (orjson.JSONDecodeError, UnicodeDecodeError)
+except ImportError:
+    loads = json.loads
+    DECODE_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+# Only lines containing one of these can carry usage or a Task call
+USAGE_MARKER = b'"usage"'
+TOOL_USE_MARKER = b'"tool_use"'
+TIMESTAMP_MARKER = b'"timestamp"'
+
+# scan_transcript() yields a snapshot after roughly this many bytes
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+READ_BUFFER_BYTES = 1024 * 1024
+
+MODEL_TIERS = ("haiku", "sonnet", "opus")
+
+
+@dataclass(slots=True)
+class TranscriptMetrics:
+    """Running totals over the lines of one transcript."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    # Input + cache tokens of the latest main-chain (non-sidechain) reply
+    context_tokens: int = 0
+    latest_timestamp: str | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+    agent_calls: int = 0   # Task tool_use blocks
+    models_used: dict[str, int] = field(default_factory=lambda: dict.fromkeys(MODEL_TIERS, 0))
+    lines: int = 0            # Lines seen
+    decoded_lines: int = 0    # Lines handed to the JSON decoder
+    # Last skipped line that may carry a newer end_time; decoded on demand
+    _pending_tail: bytes | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def cache_tokens(self) -> int:
+        return self.cache_read_tokens + self.cache_creation_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.cache_tokens
+
+    def feed_line(self, line: bytes, decode: Callable = None) -> None:
+        """Fold one raw JSONL line into the totals."""
+        self.lines += 1
+        if USAGE_MARKER not in line and TOOL_USE_MARKER not in line:
+            # Timestamps still bound the session, so keep the first one and
+            # remember the latest candidate without decoding it yet
+            if TIMESTAMP_MARKER in line:
+                if self.start_time is None:
+                    self._fold_timestamp(self._decode(line, decode))
+                else:
+                    self._pending_tail = line
+            return
+
+        entry = self._decode(line, decode)
+        if entry is not None:
+            if entry.get("timestamp"):
+                self._pending_tail = None
+            self.fold(entry)
+
+    def feed(self, chunk: bytes, decode: Callable = None) -> None:
+        """Fold every line of a chunk of complete JSONL lines."""
+        for line in chunk.splitlines():
+            if line:
+                self.feed_line(line, decode)
+
+    def _decode(self, line: bytes, decode: Callable = None) -> dict | None:
+        self.decoded_lines += 1
+        try:
+            entry = (decode or loads)(line)
+        except DECODE_ERRORS:
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def _fold_timestamp(self, entry: dict | None) -> None:
+        timestamp = entry.get("timestamp") if entry else None
+        if timestamp:
+            if self.start_time is None:
+                self.start_time = timestamp
+            self.end_time = timestamp
+
+    def fold(self, entry: dict) -> None:
+        """Fold one decoded transcript entry into the totals."""
+        self._fold_timestamp(entry)
+
+        message = entry.get("message")
+        if not isinstance(message, dict):
+            return
+
+        usage = message.get("usage")
+        if usage and isinstance(usage, dict):
+            input_tokens = usage.get("input_tokens", 0)
+            cache_read = usage.get("cache_read_input_tokens", 0)
+            cache_creation = usage.get("cache_creation_input_tokens", 0)
+            self.input_tokens += input_tokens
+            self.output_tokens += usage.get("output_tokens", 0)
+            self.cache_read_tokens += cache_read
+            self.cache_creation_tokens += cache_creation
+
+            # Track most recent main chain entry for context length
+            timestamp = entry.get("timestamp")
+            if timestamp and not entry.get("isSidechain", False) and not entry.get("isApiErrorMessage", False):
+                if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+                    self.latest_timestamp = timestamp
+                    self.context_tokens = input_tokens + cache_read + cache_creation
+
+        content = message.get("content")
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "tool_use" and block.get("name") == "Task":
+                    self.agent_calls += 1
+                    params = block.get("input")
+                    model = params.get("model", "sonnet") if isinstance(params, dict) else "sonnet"
+                    if model in self.models_used:
+                        self.models_used[model] += 1
+
+    def finish(self) -> "TranscriptMetrics":
+        """Resolve end_time from the last skipped timestamped line, if any."""
+        if self._pending_tail is not None:
+            tail, self._pending_tail = self._pending_tail, None
+            self._fold_timestamp(self._decode(tail))
+        return self
+
+    def copy(self) -> "TranscriptMetrics":
+        clone = TranscriptMetrics(**self.to_state())
+        clone._pending_tail = self._pending_tail
+        return clone
+
+    def to_state(self) -> dict:
+        """JSON-serialisable totals (for checkpoints)."""
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
+            "context_tokens": self.context_tokens,
+            "latest_timestamp": self.latest_timestamp,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "agent_calls": self.agent_calls,
+            "models_used": dict(self.models_used),
+            "lines": self.lines,
+            "decoded_lines": self.decoded_lines,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict | None) -> "TranscriptMetrics | None":
+        """Rebuild totals saved by to_state(); None if missing or the layout changed."""
+        if not state:
+            return None
+        try:
+            return cls(**state)
+        except TypeError:
+            return None
+
+
+def scan_transcript(path: str | Path, offset: int = 0, metrics: TranscriptMetrics | None = None,
+                    chunk_bytes: int = SCAN_CHUNK_BYTES,
+                    decode: Callable = None) -> Iterator[tuple[int, TranscriptMetrics]]:
+    """Stream a transcript from offset, yielding (offset, metrics) every chunk_bytes.
+
+    Only complete lines are consumed, so the yielded offset is always a
+    safe resume point; a trailing partial line is left for the next scan.
+    The same metrics object is updated and yielded each time, and once
+    more at the end.
+    """
+    metrics = metrics if metrics is not None else TranscriptMetrics()
+    next_yield = offset + chunk_bytes
+    with open(path, "rb", buffering=READ_BUFFER_BYTES) as f:
+        f.seek(offset)
+        for line in f:
+            if line[-1:] != b"\n":
+                break
+            offset += len(line)
+            metrics.feed_line(line, decode)
+            if offset >= next_yield:
+                next_yield = offset + chunk_bytes
+                yield offset, metrics
+    yield offset, metrics
+
+
+def parse_transcript_file(path: str | Path, decode: Callable = None) -> TranscriptMetrics:
+    """Totals for a whole transcript, including a final unterminated line."""
+    metrics = TranscriptMetrics()
+    offset = 0
+    for offset, _ in scan_transcript(path, metrics=metrics, decode=decode):
+        pass
+    with open(path, "rb") as f:
+        f.seek(offset)
+        metrics.feed(f.read(), decode)
+    return metrics.finish()